@@ -0,0 +1,65 @@
+"""
+Times the engine on deep sequential-decision trees (one node per trading day)
+to show that every traversal scales linearly with depth.
+
+    python benchmarks/bench_deep_trees.py [max_depth]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.serialization import read_json, read_ndjson, write_json, write_ndjson
+from src.engine.simulation import exact_distribution
+from src.engine.sensitivity import sensitivity_analysis
+
+def trading_days(depth):
+    node = Outcome(name="Maturity", probability=0.5, value=1.0)
+    for day in range(depth):
+        node = StrategyNode(
+            name=f"Day {day}",
+            node_type="decision" if day % 2 else "chance",
+            probability=0.5,
+            children=[node, Outcome(name="Exit", probability=0.5, value=float(day % 7))],
+        )
+    return node
+
+def _json_round_trip(root):
+    out = io.StringIO()
+    write_json(root, out)
+    read_json(io.StringIO(out.getvalue()))
+
+def _ndjson_round_trip(root):
+    out = io.StringIO()
+    write_ndjson(root, out)
+    read_ndjson(io.StringIO(out.getvalue()))
+
+OPERATIONS = {
+    "compute_ev": compute_ev,
+    "exact_distribution": exact_distribution,
+    "sensitivity": sensitivity_analysis,
+    "json round trip": _json_round_trip,
+    "ndjson round trip": _ndjson_round_trip,
+}
+
+def main(max_depth=100_000):
+    depths = [max_depth // 8, max_depth // 4, max_depth // 2, max_depth]
+    print(f"{'operation':<20}" + "".join(f"{d:>12}" for d in depths) + f"{'us/node':>10}{'scaling':>9}")
+    trees = {depth: trading_days(depth) for depth in depths}
+    for name, operation in OPERATIONS.items():
+        timings = []
+        for depth in depths:
+            start = time.perf_counter()
+            operation(trees[depth])
+            timings.append(time.perf_counter() - start)
+        # Linear time keeps seconds-per-node flat: scaling ~1.0 from the smallest to the largest depth
+        per_node = [t / (2 * d + 1) for t, d in zip(timings, depths)]
+        scaling = per_node[-1] / per_node[0]
+        print(f"{name:<20}" + "".join(f"{t:>11.3f}s" for t in timings) + f"{per_node[-1] * 1e6:>10.2f}{scaling:>9.2f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
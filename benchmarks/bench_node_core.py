@@ -0,0 +1,45 @@
+"""
+Compares memory per node and construction throughput of the pydantic models
+with the __slots__ core nodes used by the engine.
+
+    python benchmarks/bench_node_core.py [count]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.core import CoreNode, CoreOutcome
+
+FACTORIES = {
+    "Outcome (pydantic)": lambda i: Outcome(name="Leaf", probability=0.5, value=float(i)),
+    "CoreOutcome": lambda i: CoreOutcome("Leaf", 0.5, float(i)),
+    "StrategyNode (pydantic)": lambda i: StrategyNode(name="Node", node_type="chance", probability=0.5),
+    "CoreNode": lambda i: CoreNode("Node", "chance", None, None, 0.5),
+}
+
+def measure(factory, count):
+    start = time.perf_counter()
+    nodes = [factory(i) for i in range(count)]
+    seconds = time.perf_counter() - start
+    del nodes
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Subtract the list holding the nodes (one pointer per node)
+    return (after - before) / len(nodes) - 8, count / seconds
+
+def main(count=200_000):
+    print(f"{'node':<26}{'bytes/node':>12}{'constructions/s':>18}")
+    for name, factory in FACTORIES.items():
+        size, rate = measure(factory, count)
+        print(f"{name:<26}{size:>12.0f}{rate / 1e6:>17.2f}M")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,55 @@
+"""
+Load generator for the navigator server: many simulated users run a full
+interview (two levels, one drill-down) concurrently and the server reports
+step latency percentiles.
+
+    python benchmarks/bench_server.py [sessions] [max_concurrency] [memory|sqlite]
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.server import NavigatorServer, MemoryCheckpointStore, SQLiteCheckpointStore
+
+def script(rng):
+    first = [f"Move {k}" for k in range(3)]
+    inputs = [f"Strategy {rng.randrange(10**6)}", "3"]
+    for name in first:
+        inputs += [name, "30", str(rng.randint(-500, 2000))]
+    inputs += [first[0], "2", "Up", "50", "900", "Down", "50", "-300", "finished"]
+    return inputs
+
+async def user(server, rng):
+    session_id, _ = await server.open_session()
+    for text in script(rng):
+        await server.send(session_id, text)
+        # Think time between keystrokes keeps many sessions open at once
+        await asyncio.sleep(rng.random() * 0.002)
+    await server.close_session(session_id)
+
+async def run(sessions, max_concurrency, store):
+    server = NavigatorServer(store=store, max_concurrency=max_concurrency)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(user(server, random.Random(rng.random())) for _ in range(sessions)))
+    seconds = time.perf_counter() - start
+    metrics = server.metrics()
+    print(
+        f"{sessions} sessions, {metrics['steps']} steps in {seconds:.2f}s ({metrics['steps'] / seconds:.0f} steps/s): "
+        f"p50 {metrics['p50_ms']:.2f} ms, p99 {metrics['p99_ms']:.2f} ms, max {metrics['max_ms']:.2f} ms"
+    )
+
+def main(sessions=200, max_concurrency=32, store="memory"):
+    asyncio.run(run(sessions, max_concurrency, SQLiteCheckpointStore() if store == "sqlite" else MemoryCheckpointStore()))
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 200,
+        int(args[1]) if len(args) > 1 else 32,
+        args[2] if len(args) > 2 else "memory",
+    )
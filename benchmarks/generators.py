@@ -0,0 +1,72 @@
+"""
+Seeded synthetic trees for benchmarks. The same (size, seed) always yields the
+same tree, so timings are comparable across runs and machines.
+
+Chance children carry probabilities that sum to 1; decision children carry
+probability 1.0. Every generator is iterative, so any depth works.
+"""
+import random
+
+from src.engine.models import StrategyNode, Outcome
+
+def _probabilities(rng, n):
+    weights = [rng.random() + 0.05 for _ in range(n)]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+def _leaf(rng, probability):
+    return Outcome(name=f"Outcome {rng.randrange(10**6)}", probability=probability, value=round(rng.uniform(-1000, 1000), 2))
+
+def wide(n_children, seed=0):
+    """One chance node with `n_children` outcomes."""
+    rng = random.Random(seed)
+    return StrategyNode(
+        name="Wide", node_type="chance", children=[_leaf(rng, p) for p in _probabilities(rng, n_children)]
+    )
+
+def deep(depth, seed=0):
+    """A spine of `depth` alternating chance/decision nodes, each with one exit outcome."""
+    rng = random.Random(seed)
+    node = _leaf(rng, 0.5)
+    for level in range(depth):
+        kind = "decision" if level % 2 else "chance"
+        p = rng.uniform(0.2, 0.8)
+        if kind == "chance":
+            node.probability = p
+        exit_outcome = _leaf(rng, 1.0 - p if kind == "chance" else 1.0)
+        node = StrategyNode(name=f"Level {level}", node_type=kind, probability=1.0, children=[node, exit_outcome])
+    return node
+
+def balanced(branching, depth, seed=0, node_type="chance"):
+    """A complete tree of `branching`**`depth` leaves, all internal nodes of `node_type`."""
+    return _complete(branching, depth, random.Random(seed), lambda level: node_type)
+
+def interleaved(branching, depth, seed=0):
+    """A complete tree whose levels alternate decision and chance nodes, starting with a decision."""
+    return _complete(branching, depth, random.Random(seed), lambda level: "decision" if level % 2 == 0 else "chance")
+
+def _complete(branching, depth, rng, kind_at):
+    root = StrategyNode(name="Root", node_type=kind_at(0))
+    stack = [(root, 0)]
+    while stack:
+        node, level = stack.pop()
+        if node.node_type == "chance":
+            probabilities = _probabilities(rng, branching)
+        else:
+            probabilities = [1.0] * branching
+        for k, p in enumerate(probabilities):
+            if level + 1 == depth:
+                node.children.append(_leaf(rng, p))
+            else:
+                child = StrategyNode(name=f"{node.name}.{k}", node_type=kind_at(level + 1), probability=p)
+                node.children.append(child)
+                stack.append((child, level + 1))
+    return root
+
+def count_nodes(root):
+    count, stack = 0, [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(getattr(node, "children", ()))
+    return count
@@ -0,0 +1,220 @@
+"""
+Benchmark suite: times the engine, presentation, graph and serialization on
+seeded synthetic trees, writes the results as JSON and compares them with a
+stored baseline.
+
+    python benchmarks/run_benchmarks.py [--output results.json]
+        [--baseline benchmarks/baseline.json] [--tolerance 0.50]
+        [--save-baseline] [--only PATTERN]
+
+Timings are divided by a fixed pure-Python calibration loop measured in the
+same run, so a baseline recorded on one machine is usable on another. The
+script exits with status 1 when any case is more than `tolerance` slower
+than its baseline.
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generators import wide, deep, balanced, interleaved, count_nodes
+from src.agents.graph import graph, format_recommendations
+from src.agents.server import initial_state
+from src.engine.calculator import compute_ev
+from src.engine.incremental import link_parents
+from src.engine.session import render_ascii_tree
+from src.engine.serialization import (
+    read_json, write_json, read_ndjson, write_ndjson, write_binary, load_compiled
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def calibrate():
+    """Seconds taken by a fixed pure-Python workload (best of 5)."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        total = 0
+        for i in range(300_000):
+            total += i * i % 7
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _json_round_trip(root):
+    out = io.StringIO()
+    write_json(root, out)
+    read_json(io.StringIO(out.getvalue()))
+
+def _ndjson_round_trip(root):
+    out = io.StringIO()
+    write_ndjson(root, out)
+    read_ndjson(io.StringIO(out.getvalue()))
+
+def _binary_round_trip(root):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree.gmt")
+        write_binary(root, path)
+        load_compiled(path, use_mmap=False)
+
+def _commit_state(root):
+    """A navigator state about to commit an outcome under the deepest-left node of `root`."""
+    link_parents(root)
+    compute_ev(root)
+    active = root
+    while active.children and hasattr(active.children[0], "children"):
+        active = active.children[0]
+    return {
+        **initial_state(), "root_node": root, "active_parent_node": active,
+        "interview_phase": "COLLECT_OUTCOMES", "next_step": "AWAITING_VALUE",
+        "target_count": 10**9, "pending_data": {"name": "Extra", "probability": 0.0},
+    }
+
+def _rankings_state(root):
+    link_parents(root)
+    compute_ev(root)
+    return {**initial_state(), "root_node": root, "active_parent_node": root, "interview_phase": "DECIDE_NEXT_STEP"}
+
+def cases():
+    """Yields (name, setup, operation): setup() builds the input once, operation(input) is timed."""
+    shapes = {
+        "wide-10k": lambda: wide(10_000, seed=1),
+        "deep-20k": lambda: deep(20_000, seed=2),
+        "balanced-8^5": lambda: balanced(8, 5, seed=3),
+        "interleaved-6^6": lambda: interleaved(6, 6, seed=4),
+    }
+    for shape, build in shapes.items():
+        yield f"compute_ev/{shape}", build, compute_ev
+
+    def evaluated_wide():
+        root = wide(10_000, seed=1)
+        compute_ev(root)
+        return root
+
+    yield "format_recommendations/wide-10k", evaluated_wide, format_recommendations
+    yield "render_ascii_tree/wide-10k", evaluated_wide, render_ascii_tree
+
+    yield "graph.invoke commit/interleaved-6^6", lambda: _commit_state(interleaved(6, 6, seed=4)), \
+        lambda state: graph.invoke({**state, "latest_input": "125"})
+    yield "graph.invoke rankings/wide-10k", lambda: _rankings_state(wide(10_000, seed=1)), \
+        lambda state: graph.invoke({**state, "latest_input": "not a child"})
+
+    for shape in ("balanced-8^5", "deep-20k"):
+        build = shapes[shape]
+        yield f"json round trip/{shape}", build, _json_round_trip
+        yield f"ndjson round trip/{shape}", build, _ndjson_round_trip
+        yield f"binary round trip/{shape}", build, _binary_round_trip
+
+def time_case(setup, operation, repeat=5, min_seconds=0.2):
+    """Best and median of at least `repeat` runs (more for fast cases), after one warm-up run."""
+    subject = setup()
+    operation(subject)
+    timings = []
+    gc.disable()
+    try:
+        while len(timings) < repeat or sum(timings) < min_seconds:
+            start = time.perf_counter()
+            operation(subject)
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    timings.sort()
+    nodes = count_nodes(subject.get("root_node", subject)) if isinstance(subject, dict) else count_nodes(subject)
+    return {"seconds": timings[0], "median": timings[len(timings) // 2], "nodes": nodes}
+
+def run(only=None, repeat=5):
+    calibration = calibrate()
+    results = {}
+    for name, setup, operation in cases():
+        if only and only not in name:
+            continue
+        results[name] = time_case(setup, operation, repeat)
+        print(f"  {name:<40}{results[name]['seconds'] * 1000:>10.2f} ms{results[name]['nodes']:>10} nodes", file=sys.stderr)
+    # Calibrate on both sides of the run so a frequency change mid-run does not skew every ratio
+    calibration = min(calibration, calibrate())
+    for result in results.values():
+        result["normalized"] = result["seconds"] / calibration
+    return {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "calibration": calibration},
+        "results": results,
+    }
+
+def compare(current, baseline, tolerance=0.50):
+    """Returns (report lines, names of regressed cases) for cases present in both runs."""
+    lines, regressions = [], []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            lines.append(f"  {name:<40}   (new)")
+            continue
+        ratio = result["normalized"] / reference["normalized"]
+        flag = ""
+        if ratio > 1.0 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        lines.append(f"  {name:<40}{ratio:>8.2f}x baseline{flag}")
+    return lines, regressions
+
+def retime(current, names, repeat, rounds=2):
+    """Times the named cases `rounds` more times, keeping each case's best result."""
+    calibration = current["machine"]["calibration"]
+    suspects = [case for case in cases() if case[0] in names]
+    for _ in range(rounds):
+        for name, setup, operation in suspects:
+            result = time_case(setup, operation, repeat)
+            if result["seconds"] < current["results"][name]["seconds"]:
+                result["normalized"] = result["seconds"] / calibration
+                current["results"][name] = result
+
+def _write(results, path):
+    if path:
+        with open(path, "w") as handle:
+            json.dump(results, handle, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", help="Write results JSON here.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.50, help="Allowed relative slowdown (0.5 = 1.5x baseline).")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline.")
+    parser.add_argument("--only", help="Run only cases whose name contains this text.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    current = run(args.only, args.repeat)
+    if args.save_baseline:
+        _write(current, args.output)
+        _write(current, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        _write(current, args.output)
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    lines, regressions = compare(current, baseline, args.tolerance)
+    if regressions:
+        # Re-time suspects before failing: a real regression survives, scheduler noise does not
+        print(f"Re-timing {len(regressions)} suspect case(s)...", file=sys.stderr)
+        retime(current, regressions, args.repeat)
+        lines, regressions = compare(current, baseline, args.tolerance)
+    _write(current, args.output)
+
+    print("\n".join(lines))
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSION: {len(regressions)} case(s) slower than baseline by more than "
+              f"{args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
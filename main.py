@@ -1,14 +1,15 @@
 import os
-from dotenv import load_dotenv
-from langsmith import traceable
-from src.engine.session import run_v01_session
+import sys
+from src.engine.tracing import traceable
 
-# 1. Manually load the .env file FIRST
-load_dotenv()
+# dotenv, langsmith and the LLM session are imported only when the interactive
+# demo runs, so subcommands (e.g. `python main.py eval tree.json`) start fast.
 
-# 2. Wrap the session so LangSmith sees the whole "story"
+# Wrap the session so LangSmith sees the whole "story"
 @traceable(name="GrandMaster Session v0.1")
 def start_demo():
+    from src.engine.session import run_v01_session
+
     # Optional: Verify it loaded (you can remove this after it works)
     if not os.getenv("LANGCHAIN_API_KEY"):
         print("⚠️ Warning: API Key not found in environment!")
@@ -16,9 +17,19 @@ def start_demo():
     run_v01_session()
 
 if __name__ == "__main__":
+    # Subcommands (e.g. `python main.py batch trees.ndjson`) skip the interactive session
+    if len(sys.argv) > 1:
+        from src.cli import main
+        sys.exit(main(sys.argv[1:]))
+
+    # 1. Manually load the .env file FIRST
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # 2. Run the traced session
     try:
         start_demo()
     except KeyboardInterrupt:
         print("\nSession ended.")
     except Exception as e:
-        print(f"An error occurred: {e}")
\ No newline at end of file
+        print(f"An error occurred: {e}")
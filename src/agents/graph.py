@@ -1,47 +1,36 @@
 from typing import List, Union, Optional, Dict, Any
-from langgraph.graph import StateGraph, END
 from src.agents.state import NavigatorState
-from src.engine.calculator import compute_ev
+from src.engine.instrumentation import timed
+from src.engine.incremental import link_child, refresh_ev
+from src.engine.input_handler import read_outcome_table
 from src.engine.models import StrategyNode, Outcome
+from src.engine import persistent
+from src.engine.persistent import FrozenNode, FrozenOutcome, History
+from src.engine.ranking import top_children, weighted_ev
+from src.engine.tree_index import TreeIndex, tree_index
 
 def format_recommendations(node: StrategyNode) -> str:
-    """Sorts children by weighted EV and generates a professional recommendation string."""
-    # We want children that are fully defined
-    children = [c for c in node.children if (isinstance(c, Outcome) or (isinstance(c, StrategyNode) and c.expected_value is not None))]
-    
-    def get_weighted_ev(child):
-        if isinstance(child, Outcome):
-            return child.probability * child.value
-        return child.probability * child.expected_value
-
-    def get_raw_value(child):
-        if isinstance(child, Outcome):
-            return child.value
-        return child.expected_value
-
-    sorted_children = sorted(
-        children, 
-        key=get_weighted_ev,
-        reverse=True
-    )
-    
-    if not sorted_children:
+    """Generates a professional recommendation string from the node's top three children by weighted EV."""
+    # The ranking index only holds fully defined children and keeps them ordered between prompts
+    top = top_children(node, 3)
+    if not top:
         return "No moves analyzed yet."
-        
+
     recommendations = []
-    top_n = min(len(sorted_children), 3)
     labels = ["optimal move", "second-best move", "third-best move"]
-    
-    for i in range(top_n):
-        child = sorted_children[i]
-        ev = get_weighted_ev(child)
-        val = get_raw_value(child)
+
+    for label, child in zip(labels, top):
+        ev = weighted_ev(child)
+        val = child.value if isinstance(child, Outcome) else child.expected_value
         prob = child.probability * 100
-        recommendations.append(f"{labels[i]} is [{child.name}] with an EV of [{ev:.2f}] ([{val:.2f}] at [{prob:.0f}]%)")
-        
+        recommendations.append(f"{label} is [{child.name}] with an EV of [{ev:.2f}] ([{val:.2f}] at [{prob:.0f}]%)")
+
     result = "The " + ", the ".join(recommendations) + "."
     return result
 
+# Nodes return only the keys they change; LangGraph merges them into the state.
+
+@timed("graph.prompt_user")
 def prompt_user(state: NavigatorState):
     """Generates the next prompt based on the interview phase."""
     phase = state['interview_phase']
@@ -50,7 +39,9 @@ def prompt_user(state: NavigatorState):
     if phase == 'START':
         msg = "Welcome, Architect. What is the name of this strategy?"
     elif phase == 'GET_COUNT':
-        msg = f"How many Outcomes are possible for '{state['active_parent_node'].name}'?"
+        msg = f"How many Outcomes are possible for '{state['active_parent_node'].name}'? (Or 'load <file.csv>' to import them)"
+        if state['pending_data'].get('error'):
+            msg = f"{state['pending_data']['error']}\n{msg}"
     elif phase == 'COLLECT_OUTCOMES':
         idx = state['current_index'] + 1
         budget = (1.0 - state['running_prob_total']) * 100
@@ -63,18 +54,18 @@ def prompt_user(state: NavigatorState):
             msg = f"What is the financial value/payoff of '{state['pending_data']['name']}'? (Enter 0 if you plan to drill deeper later)"
     elif phase == 'DECIDE_NEXT_STEP':
         summary = format_recommendations(state['root_node'])
-        msg = f"Current Rankings:\n{summary}\n\nWould you like to 'drill' deeper into one of these outcomes, or are we 'finished'?"
+        if state['pending_data'].get('error'):
+            summary = f"{state['pending_data']['error']}\n{summary}"
+        msg = f"Current Rankings:\n{summary}\n\nWould you like to 'drill' deeper into one of these outcomes, 'goto <path>' to jump anywhere (e.g. 'goto A/B'), 'undo'/'redo' the last change, or are we 'finished'?"
 
-    return {
-        **state,
-        "recommendation_summary": msg
-    }
+    return {"recommendation_summary": msg}
 
+@timed("graph.process_input")
 def process_input(state: NavigatorState):
     """Handles Guided Interview logic and state transitions."""
     user_input = state.get('latest_input')
     if user_input is None:
-        return state
+        return {}
 
     phase = state['interview_phase']
     
@@ -82,27 +73,33 @@ def process_input(state: NavigatorState):
         strategy_name = user_input.strip()
         root = StrategyNode(name=strategy_name, node_type="decision")
         return {
-            **state,
             "root_node": root,
+            "history": History(
+                FrozenNode(strategy_name, "decision"),
+                meta={"target_count": 0, "current_index": 0, "running_prob_total": 0.0}
+            ),
             "active_parent_node": root,
+            "current_node_path": [],
             "interview_phase": 'GET_COUNT',
             "latest_input": None
         }
 
     if phase == 'GET_COUNT':
+        if user_input.strip().lower().startswith('load '):
+            return load_outcomes(state, user_input.strip()[5:].strip())
         try:
             count = int(user_input.strip())
             return {
-                **state,
                 "target_count": count,
                 "current_index": 0,
                 "running_prob_total": 0.0,
+                "pending_data": {},
                 "interview_phase": 'COLLECT_OUTCOMES',
                 "next_step": 'AWAITING_NAME',
                 "latest_input": None
             }
         except ValueError:
-            return state
+            return {}
 
     if phase == 'COLLECT_OUTCOMES':
         step = state['next_step']
@@ -110,64 +107,172 @@ def process_input(state: NavigatorState):
         
         if step == 'AWAITING_NAME':
             new_pending['name'] = user_input.strip()
-            return {**state, "pending_data": new_pending, "next_step": 'AWAITING_PROB', "latest_input": None}
+            return {"pending_data": new_pending, "next_step": 'AWAITING_PROB', "latest_input": None}
             
         if step == 'AWAITING_PROB':
             try:
                 raw_val = user_input.strip().replace('%', '')
                 prob = float(raw_val) / 100.0
                 new_pending['probability'] = prob
-                return {**state, "pending_data": new_pending, "next_step": 'AWAITING_VALUE', "latest_input": None}
+                return {"pending_data": new_pending, "next_step": 'AWAITING_VALUE', "latest_input": None}
             except ValueError:
-                return state
+                return {}
 
         if step == 'AWAITING_VALUE':
             try:
                 val = float(user_input.strip())
                 new_pending['value'] = val
-                return {**state, "pending_data": new_pending, "next_step": 'COMMIT', "latest_input": None}
+                return {"pending_data": new_pending, "next_step": 'COMMIT', "latest_input": None}
             except ValueError:
-                return state
+                return {}
 
     if phase == 'DECIDE_NEXT_STEP':
         if user_input.lower() == 'finished':
-            return {**state, "interview_phase": 'COMPLETE', "latest_input": None}
+            return {"interview_phase": 'COMPLETE', "latest_input": None}
+
+        text = user_input.strip()
+        if text.lower() in ('undo', 'redo'):
+            return restore_version(state, text.lower())
+
+        index = tree_index(state['root_node'])
+        if text.lower().startswith('goto '):
+            # Direct jump to any node by path, e.g. "goto Long Bonds/Rally" ("goto /" for the root)
+            path = text[5:].strip()
+            try:
+                found_node = index.node(path)
+            except KeyError:
+                return {}
+            if isinstance(found_node, Outcome):
+                # Jumping onto a leaf would promote it and drop its value; drilling does that deliberately
+                error = f"'{path}' is an outcome worth {found_node.value:.2f}; 'goto' its parent and 'drill' into it by name instead."
+                return {"pending_data": {"error": error}, "latest_input": None}
         else:
-            found_node = None
-            for child in state['active_parent_node'].children:
-                if child.name == user_input:
-                    found_node = child
-                    break
-            
-            if found_node and isinstance(found_node, StrategyNode):
-                return {
-                    **state,
-                    "active_parent_node": found_node,
-                    "interview_phase": 'GET_COUNT',
-                    "latest_input": None
-                }
-            elif found_node and isinstance(found_node, Outcome):
-                new_node = StrategyNode(
-                    name=found_node.name,
-                    probability=found_node.probability,
-                    node_type="chance"
-                )
-                idx = state['active_parent_node'].children.index(found_node)
-                state['active_parent_node'].children[idx] = new_node
-                
-                return {
-                    **state,
-                    "active_parent_node": new_node,
-                    "interview_phase": 'GET_COUNT',
-                    "latest_input": None
-                }
-
-    return state
+            found_node = index.child(state['active_parent_node'], text)
+
+        if found_node is not None:
+            return drill_into(state, index, found_node)
+
+    return {}
+
+def drill_into(state: NavigatorState, index: TreeIndex, node: StrategyNode | Outcome):
+    """Makes `node` the active node, promoting an Outcome to a chance node in place first."""
+    if isinstance(node, Outcome):
+        new_node = StrategyNode(
+            name=node.name,
+            probability=node.probability,
+            node_type="chance"
+        )
+        index.replace(node, new_node)
+        refresh_ev(state['root_node'])
+        record_version(
+            state, new_node,
+            lambda root, focus: persistent.replace(root, focus, FrozenNode(new_node.name, "chance", (), new_node.probability)),
+            f"drill into '{new_node.name}'"
+        )
+        node = new_node
+    elif node is not state['root_node']:
+        link_child(index.parent_of(node), node)
 
+    return {
+        "active_parent_node": node,
+        "current_node_path": index.path_of(node),
+        "interview_phase": 'GET_COUNT',
+        "pending_data": {},
+        "latest_input": None
+    }
+
+# Interview counters that undo/redo restore along with the tree
+_COUNTERS = ("target_count", "current_index", "running_prob_total")
+
+def record_version(state: NavigatorState, node: StrategyNode, edit, label: str, **counters) -> None:
+    """
+    Mirrors an edit of the working tree into the session history:
+    `edit(frozen root, focus)` returns the next version, built by path copying.
+    `counters` are the values the edit leaves in the state; the others are
+    recorded as they are.
+    """
+    history = state.get('history')
+    if history is None:
+        return
+    focus = tree_index(state['root_node']).positions_of(node)
+    meta = {key: state[key] for key in _COUNTERS}
+    meta.update(counters)
+    history.commit(edit(history.current.root, focus), focus, label, meta)
+
+def restore_version(state: NavigatorState, direction: str):
+    """
+    Steps the history back or forward and patches the working tree to match
+    that version: only the subtrees that differ are rebuilt, and refresh_ev
+    recomputes just their ancestors. The interview counters recorded with the
+    version come back too.
+    """
+    history = state.get('history')
+    if history is None:
+        return {}
+    before = history.current.root
+    snapshot = history.undo() if direction == 'undo' else history.redo()
+    if snapshot is None:
+        return {}
+
+    root = state['root_node']
+    try:
+        persistent.patch(tree_index(root), before, snapshot.root)
+        refresh_ev(root)
+    except ValueError:
+        root = persistent.thaw(snapshot.root)
+    node = root
+    for position in snapshot.focus:
+        node = node.children[position]
+    return {
+        **(snapshot.meta or {}),
+        "root_node": root,
+        "active_parent_node": node,
+        "current_node_path": tree_index(root).path_of(node),
+        "interview_phase": 'DECIDE_NEXT_STEP',
+        "pending_data": {},
+        "next_step": 'AWAITING_INPUT',
+        "latest_input": None
+    }
+
+def load_outcomes(state: NavigatorState, path: str):
+    """
+    Bulk-imports a CSV/TSV of outcomes into the active node as a single commit.
+    Outcomes loaded next to existing children share what those leave of 100%.
+    """
+    parent = state['active_parent_node']
+    budget = 1.0 - sum(child.probability for child in parent.children)
+    try:
+        if budget < 1e-4:
+            raise ValueError(f"'{parent.name}' has no probability left to assign")
+        table = read_outcome_table(path, budget=budget)
+    except (OSError, ValueError) as e:
+        return {"pending_data": {"error": f"Could not load outcomes: {e}"}, "latest_input": None}
+
+    outcomes = table.to_outcomes()
+    tree_index(state['root_node']).attach_many(state['active_parent_node'], outcomes)
+    refresh_ev(state['root_node'])
+    frozen = [FrozenOutcome(o.name, o.probability, o.value) for o in outcomes]
+    record_version(
+        state, state['active_parent_node'],
+        lambda root, focus: persistent.extend(root, focus, frozen),
+        f"load {len(outcomes)} outcomes",
+        target_count=len(table), current_index=len(table), running_prob_total=1.0
+    )
+    return {
+        "target_count": len(table),
+        "current_index": len(table),
+        "running_prob_total": 1.0,
+        "interview_phase": 'DECIDE_NEXT_STEP',
+        "pending_data": {},
+        "next_step": 'AWAITING_INPUT',
+        "latest_input": None
+    }
+
+@timed("graph.update_tree")
 def update_tree(state: NavigatorState):
     """Commits outcomes and handles batch validation."""
     if state['interview_phase'] != 'COLLECT_OUTCOMES' or state['next_step'] != 'COMMIT':
-        return state
+        return {}
         
     new_pending = state['pending_data']
     
@@ -186,12 +291,18 @@ def update_tree(state: NavigatorState):
             new_child.probability = diff
             new_total = 1.0
 
-    state['active_parent_node'].children.append(new_child)
-    compute_ev(state['root_node'])
+    tree_index(state['root_node']).attach(state['active_parent_node'], new_child)
+    refresh_ev(state['root_node'])
+    frozen = FrozenOutcome(new_child.name, new_child.probability, new_child.value)
+    record_version(
+        state, state['active_parent_node'],
+        lambda root, focus: persistent.append(root, focus, frozen),
+        f"add '{new_child.name}'",
+        current_index=state['current_index'] + (0 if is_last else 1), running_prob_total=new_total
+    )
     
     if is_last:
         return {
-            **state,
             "running_prob_total": new_total,
             "interview_phase": 'DECIDE_NEXT_STEP',
             "pending_data": {},
@@ -199,19 +310,33 @@ def update_tree(state: NavigatorState):
         }
     else:
         return {
-            **state,
             "current_index": state['current_index'] + 1,
             "running_prob_total": new_total,
             "pending_data": {},
             "next_step": 'AWAITING_NAME'
         }
 
-workflow = StateGraph(NavigatorState)
-workflow.add_node("prompt_user", prompt_user)
-workflow.add_node("process_input", process_input)
-workflow.add_node("update_tree", update_tree)
-workflow.set_entry_point("process_input")
-workflow.add_edge("process_input", "update_tree")
-workflow.add_edge("update_tree", "prompt_user")
-workflow.add_edge("prompt_user", END)
-graph = workflow.compile()
+def build_graph():
+    """Compiles the navigator workflow (langgraph is imported here, on first use)."""
+    from langgraph.graph import StateGraph, END
+
+    workflow = StateGraph(NavigatorState)
+    workflow.add_node("prompt_user", prompt_user)
+    workflow.add_node("process_input", process_input)
+    workflow.add_node("update_tree", update_tree)
+    workflow.set_entry_point("process_input")
+    workflow.add_edge("process_input", "update_tree")
+    workflow.add_edge("update_tree", "prompt_user")
+    workflow.add_edge("prompt_user", END)
+    return workflow.compile()
+
+_graph = None
+
+def __getattr__(name):
+    # `from src.agents.graph import graph` compiles the workflow once, on first access
+    global _graph
+    if name == "graph":
+        if _graph is None:
+            _graph = build_graph()
+        return _graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,244 @@
+"""
+Asyncio service hosting many concurrent navigator interviews.
+
+Each session owns its own state and StrategyNode tree, steps of one session
+run one at a time in arrival order, and at most `max_concurrency` graph steps
+run at once across all sessions. Session state lives in a CheckpointStore
+between steps.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.agents.state import NavigatorState
+from src.engine.incremental import link_parents
+from src.engine.models import StrategyNode
+from src.engine.persistent import History, freeze
+from src.engine.serialization import read_json, write_json
+
+
+def initial_state() -> NavigatorState:
+    return {
+        "messages": [], "root_node": None, "current_node_path": [], "pending_data": {},
+        "next_step": "", "latest_input": None, "recommendation_summary": "",
+        "interview_phase": "START", "target_count": 0, "current_index": 0,
+        "running_prob_total": 0.0, "active_parent_node": None, "history": None,
+    }
+
+
+class CheckpointStore(ABC):
+    """Where session states live between steps."""
+
+    @abstractmethod
+    async def load(self, session_id: str) -> Optional[NavigatorState]:
+        ...
+
+    @abstractmethod
+    async def save(self, session_id: str, state: NavigatorState) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        ...
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Keeps live state objects in a dict; sessions never share a tree."""
+
+    def __init__(self):
+        self._states: Dict[str, NavigatorState] = {}
+
+    async def load(self, session_id: str) -> Optional[NavigatorState]:
+        return self._states.get(session_id)
+
+    async def save(self, session_id: str, state: NavigatorState) -> None:
+        self._states[session_id] = state
+
+    async def delete(self, session_id: str) -> None:
+        self._states.pop(session_id, None)
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    Stores each session as one JSON row, so sessions survive a restart.
+    The tree is embedded as a string written by write_json and read back with
+    read_json, so trees of any depth round-trip without recursion. The active
+    node is saved as its child-index path from the root. Undo history is not
+    stored; a restored session starts a new one.
+
+    Every save rewrites the whole row, so a step costs O(tree size) in
+    write_json plus the SQLite write even when it only touched one node. That
+    is fine for interview-sized trees; for large imported trees use
+    MemoryCheckpointStore, or save less often than every step.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, state TEXT NOT NULL)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    async def load(self, session_id: str) -> Optional[NavigatorState]:
+        row = await asyncio.to_thread(self._execute, "SELECT state FROM sessions WHERE id = ?", (session_id,))
+        return decode_state(row[0]) if row else None
+
+    async def save(self, session_id: str, state: NavigatorState) -> None:
+        await asyncio.to_thread(
+            self._execute, "INSERT OR REPLACE INTO sessions (id, state) VALUES (?, ?)", (session_id, encode_state(state))
+        )
+
+    async def delete(self, session_id: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def _execute(self, sql: str, params: tuple):
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+            self._conn.commit()
+            return row
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def encode_state(state: NavigatorState) -> str:
+    record = {k: v for k, v in state.items() if k not in ("root_node", "active_parent_node", "history")}
+    root = state["root_node"]
+    if root is not None:
+        out = io.StringIO()
+        write_json(root, out)
+        record["root_node"] = out.getvalue()
+    else:
+        record["root_node"] = None
+    record["active_path"] = _index_path(root, state["active_parent_node"])
+    return json.dumps(record)
+
+
+def decode_state(text: str) -> NavigatorState:
+    record = json.loads(text)
+    active_path = record.pop("active_path")
+    data = record["root_node"]
+    if data is None:
+        root = None
+    else:
+        root = read_json(io.StringIO(data))
+    active = None
+    if root is not None:
+        link_parents(root)
+        active = root
+        for index in active_path or []:
+            active = active.children[index]
+    record["root_node"] = root
+    record["active_parent_node"] = active
+    record["history"] = History(freeze(root)) if root is not None else None
+    return record
+
+
+def _index_path(root: Optional[StrategyNode], target: Optional[StrategyNode]) -> Optional[List[int]]:
+    if root is None or target is None:
+        return None
+    stack = [(root, [])]
+    while stack:
+        node, path = stack.pop()
+        if node is target:
+            return path
+        for i, child in enumerate(node.children):
+            if isinstance(child, StrategyNode):
+                stack.append((child, path + [i]))
+    return None
+
+
+class LatencyStats:
+    """Rolling window of step latencies in seconds."""
+
+    def __init__(self, window: int = 100_000):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self._samples, q)) if self._samples else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "steps": self.count,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": max(self._samples, default=0.0) * 1000,
+        }
+
+
+class NavigatorServer:
+    """
+    Runs navigator sessions concurrently on one event loop.
+
+    Attributes:
+        store: CheckpointStore holding session state between steps.
+        max_concurrency: Graph steps allowed to run at the same time.
+        latency: LatencyStats of every step, including queueing time.
+    """
+
+    def __init__(self, store: Optional[CheckpointStore] = None, max_concurrency: int = 64, graph=None):
+        if graph is None:
+            from src.agents.graph import graph
+        self.store = store if store is not None else MemoryCheckpointStore()
+        self.max_concurrency = max_concurrency
+        self.graph = graph
+        self.latency = LatencyStats()
+        # Created on the loop that serves the steps (see _limiter)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+
+    async def open_session(self, session_id: Optional[str] = None) -> tuple[str, str]:
+        """Creates a session and returns (session id, first prompt)."""
+        session_id = session_id or uuid.uuid4().hex
+        return session_id, await self._step(session_id, None, initial_state())
+
+    async def send(self, session_id: str, text: str) -> str:
+        """Feeds one user input to a session and returns the next prompt."""
+        return await self._step(session_id, text)
+
+    async def state(self, session_id: str) -> Optional[NavigatorState]:
+        return await self.store.load(session_id)
+
+    async def close_session(self, session_id: str) -> None:
+        await self.store.delete(session_id)
+        self._session_locks.pop(session_id, None)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.latency.summary(), "sessions": len(self._session_locks), "max_concurrency": self.max_concurrency}
+
+    async def _step(self, session_id: str, text: Optional[str], state: Optional[NavigatorState] = None) -> str:
+        start = time.perf_counter()
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            if state is None:
+                state = await self.store.load(session_id)
+                if state is None:
+                    raise KeyError(f"Unknown session '{session_id}'")
+            async with self._limiter():
+                state = await asyncio.to_thread(self.graph.invoke, {**state, "latest_input": text})
+            await self.store.save(session_id, state)
+        self.latency.record(time.perf_counter() - start)
+        return state["recommendation_summary"]
+
+    def _limiter(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
@@ -1,6 +1,7 @@
 from typing import TypedDict, List, Annotated, Dict, Any, Optional, Union
 import operator
 from src.engine.models import StrategyNode, Outcome
+from src.engine.persistent import History
 
 class NavigatorState(TypedDict):
     """
@@ -19,6 +20,7 @@ class NavigatorState(TypedDict):
         current_index: Index of the outcome being defined.
         running_prob_total: Sum of probabilities entered so far (0.0 to 1.0).
         active_parent_node: Reference to the node being built (StrategyNode).
+        history: Immutable versions of the tree, one per change, for undo/redo.
     """
     messages: Annotated[List[str], operator.add]
     root_node: StrategyNode
@@ -31,4 +33,5 @@ class NavigatorState(TypedDict):
     target_count: int
     current_index: int
     running_prob_total: float
-    active_parent_node: StrategyNode
\ No newline at end of file
+    active_parent_node: StrategyNode
+    history: Optional[History]
\ No newline at end of file
@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+def _run_batch(args) -> int:
+    from src.engine.batch import BatchStats, evaluate_batch
+
+    stats = BatchStats()
+    for result in evaluate_batch(
+        args.source, workers=args.workers, chunksize=args.chunksize, stats=stats, memo_size=args.memo_size
+    ):
+        record = {"index": result.index, "label": result.label, "expected_value": result.expected_value, "nodes": result.nodes}
+        if result.error:
+            record["error"] = result.error
+        sys.stdout.write(json.dumps(record) + "\n")
+    print(stats.summary(), file=sys.stderr)
+    return 1 if stats.errors else 0
+
+def _load_compiled_tree(source: str, fmt: str):
+    """Reads a tree in any serialized form straight into a CompiledTree (core nodes, no pydantic)."""
+    from src.engine.compiler import compile_tree
+    from src.engine.serialization import load_compiled, read_json, read_ndjson
+
+    if fmt == "auto":
+        lower = source.lower()
+        if lower.endswith((".ndjson", ".jsonl")):
+            fmt = "ndjson"
+        elif lower.endswith((".gmt", ".bin")):
+            fmt = "binary"
+        else:
+            fmt = "json"
+    if fmt == "binary":
+        return load_compiled(source)
+    reader = read_ndjson if fmt == "ndjson" else read_json
+    if source == "-":
+        return compile_tree(reader(sys.stdin, core=True))
+    with open(source, encoding="utf-8") as handle:
+        return compile_tree(reader(handle, core=True))
+
+def _run_eval(args) -> int:
+    from src.engine.compiler import backward_induction, best_children
+
+    try:
+        tree = _load_compiled_tree(args.file, args.format)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    ev = backward_induction(tree)
+    best = int(best_children(tree, ev)[0])
+    result = {
+        "name": tree.names[0] if tree.names is not None else None,
+        "expected_value": float(ev[0]),
+        "nodes": tree.size,
+        "best_move": tree.names[best] if best >= 0 and tree.names is not None else None,
+    }
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"{result['name']}: EV {result['expected_value']:.2f} ({result['nodes']} nodes)")
+        if result["best_move"] is not None:
+            print(f"Best move: {result['best_move']}")
+    return 0
+
+def _run_render(args) -> int:
+    from src.engine.compiler import backward_induction
+    from src.engine.render import render_tree
+
+    try:
+        tree = _load_compiled_tree(args.file, args.format)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    try:
+        render_tree(
+            tree, sys.stdout, max_depth=args.depth, top_k=args.top, min_probability=args.min_probability,
+            expected_values=backward_induction(tree),
+        )
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader (e.g. `head`) has seen enough. Point stdout at devnull so
+        # the flush at interpreter exit cannot fail again, and exit as if
+        # killed by SIGPIPE.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 128 + 13
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="grandmaster", description="GrandMaster decision tree tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="Score serialized trees and stream NDJSON results in input order.")
+    batch.add_argument("source", help="Directory of *.json trees, an NDJSON file, or '-' for stdin.")
+    batch.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    batch.add_argument("--chunksize", type=int, default=16, help="Trees sent to a worker per task.")
+    batch.add_argument(
+        "--memo-size", type=int, default=None,
+        help="Solved subtrees each worker remembers across trees (default: no memo).",
+    )
+    batch.set_defaults(handler=_run_batch)
+
+    evaluate = commands.add_parser("eval", help="Score one serialized tree without prompting.")
+    evaluate.add_argument("file", help="Tree as JSON, NDJSON records or the binary format; '-' reads stdin.")
+    evaluate.add_argument(
+        "--format", choices=["auto", "json", "ndjson", "binary"], default="auto",
+        help="Input format (default: from the file extension, JSON otherwise).",
+    )
+    evaluate.add_argument("--json", action="store_true", help="Print the result as one JSON object.")
+    evaluate.set_defaults(handler=_run_eval)
+
+    render = commands.add_parser("render", help="Print a serialized tree as text, streaming as it goes.")
+    render.add_argument("file", help="Tree as JSON, NDJSON records or the binary format; '-' reads stdin.")
+    render.add_argument(
+        "--format", choices=["auto", "json", "ndjson", "binary"], default="auto",
+        help="Input format (default: from the file extension, JSON otherwise).",
+    )
+    render.add_argument("--depth", type=int, default=None, help="Deepest level to draw (root is 0).")
+    render.add_argument("--top", type=int, default=None, help="Children per node, best weighted EV first.")
+    render.add_argument(
+        "--min-probability", type=float, default=0.0,
+        help="Fold chance branches less likely than this into one summary line.",
+    )
+    render.set_defaults(handler=_run_render)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
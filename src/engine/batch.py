@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+from src.engine.compiler import compile_dict, backward_induction
+from src.engine.memo import SubtreeMemo, compute_ev_shared
+
+
+@dataclass
+class BatchResult:
+    """EV of one serialized tree, in input order."""
+    index: int
+    label: str
+    expected_value: Optional[float]
+    nodes: int
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchStats:
+    """Throughput of a batch run, for sizing machines."""
+    trees: int = 0
+    nodes: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    workers: int = 1
+    memo_hits: int = 0
+    memo_misses: int = 0
+
+    @property
+    def trees_per_second(self) -> float:
+        return self.trees / self.seconds if self.seconds else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    @property
+    def memo_hit_rate(self) -> float:
+        lookups = self.memo_hits + self.memo_misses
+        return self.memo_hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        text = (
+            f"{self.trees} trees ({self.nodes} nodes, {self.errors} errors) in {self.seconds:.2f}s "
+            f"on {self.workers} worker(s): {self.trees_per_second:.1f} trees/s, {self.nodes_per_second:.0f} nodes/s"
+        )
+        if self.memo_hits or self.memo_misses:
+            text += f", subtree memo {self.memo_hits} hits / {self.memo_misses} misses ({self.memo_hit_rate:.0%})"
+        return text
+
+
+def iter_serialized_trees(source: str | os.PathLike) -> Iterator[Tuple[str, str]]:
+    """
+    Yields (label, JSON text) pairs from a directory of *.json files (one tree
+    per file, sorted by name), an NDJSON file (one tree per line) or "-" for
+    NDJSON on stdin. Blank lines are skipped.
+    """
+    if str(source) == "-":
+        yield from _iter_lines(sys.stdin, "stdin")
+        return
+
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(path.glob("*.json")):
+            yield file.name, file.read_text(encoding="utf-8")
+        return
+
+    with path.open(encoding="utf-8") as handle:
+        yield from _iter_lines(handle, path.name)
+
+
+def _iter_lines(handle, name: str) -> Iterator[Tuple[str, str]]:
+    for line_number, line in enumerate(handle, start=1):
+        if line.strip():
+            yield f"{name}:{line_number}", line
+
+
+# Per-process subtree memo, set by _init_worker when memoization is enabled
+_worker_memo: Optional[SubtreeMemo] = None
+
+
+def _init_worker(memo_size: Optional[int]) -> None:
+    global _worker_memo
+    _worker_memo = SubtreeMemo(memo_size) if memo_size else None
+
+
+def _evaluate_serialized(payload: str) -> Tuple[Optional[float], int, Optional[str], int, int]:
+    """
+    Worker entry point: parses plain JSON and solves it without pydantic
+    objects. Returns (EV, nodes, error, memo hits, memo misses).
+    """
+    memo = _worker_memo
+    try:
+        tree = compile_dict(json.loads(payload))
+        if memo is None:
+            return float(backward_induction(tree)[0]), tree.size, None, 0, 0
+        hits, misses = memo.hits, memo.misses
+        ev = compute_ev_shared(tree, memo)
+        return ev, tree.size, None, memo.hits - hits, memo.misses - misses
+    except Exception as e:
+        return None, 0, f"{type(e).__name__}: {e}", 0, 0
+
+
+class BatchEvaluator:
+    """
+    Evaluates serialized trees on a reusable process pool.
+
+    Workers receive the raw JSON text of each tree rather than pickled pydantic
+    objects, and results stream back in input order. Use as a context manager
+    so the pool is shared across several evaluate() calls.
+
+    With `memo_size` set, each worker keeps a SubtreeMemo of that many entries
+    for the lifetime of the pool, so sub-scenarios repeated across trees are
+    solved once per worker.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunksize: int = 16, memo_size: Optional[int] = None):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunksize = chunksize
+        self.memo_size = memo_size
+        self.stats = BatchStats(workers=self.workers)
+        self._pool = None
+
+    def __enter__(self) -> BatchEvaluator:
+        if self.workers > 1:
+            self._pool = Pool(self.workers, initializer=_init_worker, initargs=(self.memo_size,))
+        else:
+            _init_worker(self.memo_size)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        else:
+            _init_worker(None)
+
+    def evaluate(self, trees: Iterable[Tuple[str, str]]) -> Iterator[BatchResult]:
+        """Yields a BatchResult per (label, JSON text) pair, updating self.stats as it goes."""
+        labels = []
+
+        def payloads():
+            for label, payload in trees:
+                labels.append(label)
+                yield payload
+
+        if self._pool is not None:
+            outputs = self._pool.imap(_evaluate_serialized, payloads(), chunksize=self.chunksize)
+        else:
+            outputs = map(_evaluate_serialized, payloads())
+
+        start = time.perf_counter()
+        elapsed_before = self.stats.seconds
+        for index, (ev, nodes, error, hits, misses) in enumerate(outputs):
+            self.stats.trees += 1
+            self.stats.nodes += nodes
+            self.stats.errors += error is not None
+            self.stats.memo_hits += hits
+            self.stats.memo_misses += misses
+            self.stats.seconds = elapsed_before + time.perf_counter() - start
+            yield BatchResult(index=index, label=labels[index], expected_value=ev, nodes=nodes, error=error)
+
+
+def evaluate_batch(
+    source: str | os.PathLike,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    stats: Optional[BatchStats] = None,
+    memo_size: Optional[int] = None,
+) -> Iterator[BatchResult]:
+    """
+    Evaluates every tree in a directory, NDJSON file or stdin ("-").
+
+    Pass a BatchStats instance to receive the throughput figures of the run,
+    and `memo_size` to share solved subtrees across trees (see BatchEvaluator).
+    """
+    with BatchEvaluator(workers=workers, chunksize=chunksize, memo_size=memo_size) as evaluator:
+        if stats is not None:
+            evaluator.stats = stats
+            stats.workers = evaluator.workers
+        yield from evaluator.evaluate(iter_serialized_trees(source))
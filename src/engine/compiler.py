@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.core import CoreNode, OUTCOME_TYPES
+
+# Node type codes used in the compiled arrays
+OUTCOME = 0
+CHANCE = 1
+DECISION = 2
+
+# Node classes compiled as leaves worth their `value`; see register_leaf_type
+_leaf_types = OUTCOME_TYPES
+
+
+def register_leaf_type(cls):
+    """
+    Lets nodes of `cls` sit in a tree as leaves: compile_tree stores them as
+    outcomes paying their `value`, next to their `name` and `probability`.
+    Used by sub-models that solve themselves, such as Lattice.
+    """
+    global _leaf_types
+    _leaf_types = _leaf_types + (cls,)
+    return cls
+
+
+@dataclass
+class CompiledTree:
+    """
+    A StrategyNode tree flattened into contiguous arrays (breadth-first order).
+
+    Nodes of one level are stored contiguously and the children of every node
+    occupy a contiguous slice of the next level, so backward induction can run
+    one level at a time with segment reductions.
+
+    Attributes:
+        parent: Index of the parent node (-1 for the root).
+        node_type: OUTCOME, CHANCE or DECISION.
+        probability: Branch probability of each node.
+        payoff: Outcome value for leaves, 0.0 for strategy nodes.
+        level_offsets: Start index of every level, plus the total node count.
+        first_child: Index of the first child (-1 for nodes without children).
+        n_children: Number of children of each node.
+        names: Node names, in array order.
+        sources: The original node objects (None when not compiled from objects).
+    """
+    parent: np.ndarray
+    node_type: np.ndarray
+    probability: np.ndarray
+    payoff: np.ndarray
+    level_offsets: np.ndarray
+    first_child: np.ndarray
+    n_children: np.ndarray
+    names: Optional[List[str]] = None
+    sources: Optional[list] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.parent)
+
+    @property
+    def depth(self) -> int:
+        return len(self.level_offsets) - 1
+
+    def solve(self) -> np.ndarray:
+        return backward_induction(self)
+
+
+def compile_tree(root: StrategyNode | Outcome | CoreNode) -> CompiledTree:
+    """
+    Flattens a tree of models or core nodes into a CompiledTree using an
+    explicit breadth-first queue.
+
+    This walk visits every node object in Python (about 1 µs per node, so
+    roughly 1s per million nodes) and dominates compute_ev; the array solve
+    is some 50x faster. For repeated or very large solves, compile once and
+    reuse the CompiledTree, or load it with load_compiled, which creates no
+    node objects at all.
+    """
+    sources = [root]
+    parent = [-1]
+    names = [root.name]
+    probability = [root.probability]
+    node_type = []
+    payoff = []
+    first_child = []
+    n_children = []
+    level_offsets = [0]
+    leaf_types = _leaf_types
+
+    start = 0
+    while start < len(sources):
+        end = len(sources)
+        for i in range(start, end):
+            node = sources[i]
+            if isinstance(node, leaf_types):
+                node_type.append(OUTCOME)
+                payoff.append(node.value)
+                first_child.append(-1)
+                n_children.append(0)
+                continue
+
+            node_type.append(DECISION if node.node_type == "decision" else CHANCE)
+            payoff.append(0.0)
+            children = node.children
+            first_child.append(len(sources) if children else -1)
+            n_children.append(len(children))
+            for child in children:
+                sources.append(child)
+                parent.append(i)
+                names.append(child.name)
+                probability.append(child.probability)
+        level_offsets.append(end)
+        start = end
+
+    return CompiledTree(
+        parent=np.asarray(parent, dtype=np.int64),
+        node_type=np.asarray(node_type, dtype=np.int8),
+        probability=np.asarray(probability, dtype=np.float64),
+        payoff=np.asarray(payoff, dtype=np.float64),
+        level_offsets=np.asarray(level_offsets, dtype=np.int64),
+        first_child=np.asarray(first_child, dtype=np.int64),
+        n_children=np.asarray(n_children, dtype=np.int64),
+        names=names,
+        sources=sources,
+    )
+
+
+def compile_dict(root: dict) -> CompiledTree:
+    """
+    Flattens a tree given as plain dicts (the JSON form of StrategyNode/Outcome)
+    without building pydantic objects. A dict with a "value" and no "children"
+    is an Outcome.
+    """
+    sources = [root]
+    parent = [-1]
+    names = [root["name"]]
+    probability = [root.get("probability", 1.0)]
+    node_type = []
+    payoff = []
+    first_child = []
+    n_children = []
+    level_offsets = [0]
+
+    start = 0
+    while start < len(sources):
+        end = len(sources)
+        for i in range(start, end):
+            node = sources[i]
+            children = node.get("children")
+            if children is None and "value" in node:
+                node_type.append(OUTCOME)
+                payoff.append(node["value"])
+                first_child.append(-1)
+                n_children.append(0)
+                continue
+
+            node_type.append(DECISION if node.get("node_type") == "decision" else CHANCE)
+            payoff.append(0.0)
+            children = children or []
+            first_child.append(len(sources) if children else -1)
+            n_children.append(len(children))
+            for child in children:
+                sources.append(child)
+                parent.append(i)
+                names.append(child["name"])
+                probability.append(child.get("probability", 1.0))
+        level_offsets.append(end)
+        start = end
+
+    return CompiledTree(
+        parent=np.asarray(parent, dtype=np.int64),
+        node_type=np.asarray(node_type, dtype=np.int8),
+        probability=np.asarray(probability, dtype=np.float64),
+        payoff=np.asarray(payoff, dtype=np.float64),
+        level_offsets=np.asarray(level_offsets, dtype=np.int64),
+        first_child=np.asarray(first_child, dtype=np.int64),
+        n_children=np.asarray(n_children, dtype=np.int64),
+        names=names,
+    )
+
+
+# Below this average level width, per-level NumPy calls cost more than a
+# plain sweep over the nodes (deep, narrow trees such as one node per day).
+NARROW_LEVEL_WIDTH = 32
+
+
+def is_narrow(tree: CompiledTree) -> bool:
+    return tree.size < tree.depth * NARROW_LEVEL_WIDTH
+
+
+def backward_induction(tree: CompiledTree) -> np.ndarray:
+    """
+    Solves the tree from the deepest level up and returns the EV of every node.
+
+    Chance nodes take the probability-weighted sum of their children, decision
+    nodes take the maximum child EV. Nodes without children are worth 0.0.
+    """
+    if is_narrow(tree):
+        return _backward_induction_sweep(tree)
+
+    ev = tree.payoff.copy()
+    offsets = tree.level_offsets
+
+    for level in range(tree.depth - 2, -1, -1):
+        lo, hi = offsets[level], offsets[level + 1]
+        child_lo, child_hi = offsets[level + 1], offsets[level + 2]
+        if child_lo == child_hi:
+            continue
+
+        # Every node of the next level belongs to exactly one parent here, so
+        # the parents' first_child values split it into contiguous segments.
+        parents = lo + np.flatnonzero(tree.n_children[lo:hi])
+        starts = tree.first_child[parents] - child_lo
+        child_ev = ev[child_lo:child_hi]
+
+        sums = np.add.reduceat(tree.probability[child_lo:child_hi] * child_ev, starts)
+        maxima = np.maximum.reduceat(child_ev, starts)
+        ev[parents] = np.where(tree.node_type[parents] == DECISION, maxima, sums)
+
+    return ev
+
+
+def backward_induction_batch(tree: CompiledTree, probability: np.ndarray, payoff: np.ndarray) -> np.ndarray:
+    """
+    backward_induction for many parameter sets at once. `probability` and
+    `payoff` hold one column per set (shape (size, sets)); the result holds
+    the EV of every node under every set, in the same layout.
+    """
+    ev = np.where((tree.node_type == OUTCOME)[:, None], payoff, 0.0)
+    offsets = tree.level_offsets
+
+    for level in range(tree.depth - 2, -1, -1):
+        lo, hi = offsets[level], offsets[level + 1]
+        child_lo, child_hi = offsets[level + 1], offsets[level + 2]
+        if child_lo == child_hi:
+            continue
+
+        parents = lo + np.flatnonzero(tree.n_children[lo:hi])
+        starts = tree.first_child[parents] - child_lo
+        child_ev = ev[child_lo:child_hi]
+
+        sums = np.add.reduceat(probability[child_lo:child_hi] * child_ev, starts, axis=0)
+        maxima = np.maximum.reduceat(child_ev, starts, axis=0)
+        ev[parents] = np.where((tree.node_type[parents] == DECISION)[:, None], maxima, sums)
+
+    return ev
+
+
+def _backward_induction_sweep(tree: CompiledTree) -> np.ndarray:
+    """Scalar variant of backward_induction: one reverse pass in breadth-first order."""
+    ev = tree.payoff.tolist()
+    probability = tree.probability.tolist()
+    first_child = tree.first_child.tolist()
+    n_children = tree.n_children.tolist()
+    decision = (tree.node_type == DECISION).tolist()
+
+    for i in np.flatnonzero(tree.n_children)[::-1].tolist():
+        start = first_child[i]
+        end = start + n_children[i]
+        if decision[i]:
+            ev[i] = max(ev[start:end])
+        else:
+            total = 0.0
+            for j in range(start, end):
+                total += probability[j] * ev[j]
+            ev[i] = total
+    return np.asarray(ev, dtype=np.float64)
+
+
+def propagate_down(tree: CompiledTree, factor: np.ndarray, reset: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Top-down product along every root path: out[root] = 1 and
+    out[j] = out[parent[j]] * factor[j], restarting at 1.0 where reset[j].
+    """
+    out = np.ones(tree.size)
+    if tree.size < 2:
+        return out
+    if reset is None:
+        reset = np.zeros(tree.size, dtype=bool)
+
+    if is_narrow(tree):
+        values = out.tolist()
+        parent = tree.parent.tolist()
+        factor_list = factor.tolist()
+        reset_list = reset.tolist()
+        for j in range(1, tree.size):
+            if not reset_list[j]:
+                values[j] = values[parent[j]] * factor_list[j]
+        return np.asarray(values, dtype=np.float64)
+
+    offsets = tree.level_offsets
+    for level in range(1, tree.depth):
+        lo, hi = offsets[level], offsets[level + 1]
+        out[lo:hi] = np.where(reset[lo:hi], 1.0, out[tree.parent[lo:hi]] * factor[lo:hi])
+    return out
+
+
+def propagate_label(tree: CompiledTree, reset: np.ndarray) -> np.ndarray:
+    """
+    Labels every node with its nearest ancestor-or-self j where reset[j]
+    (-1 if there is none).
+    """
+    label = np.where(reset, np.arange(tree.size), -1)
+    if tree.size < 2:
+        return label
+
+    if is_narrow(tree):
+        values = label.tolist()
+        parent = tree.parent.tolist()
+        reset_list = reset.tolist()
+        for j in range(1, tree.size):
+            if not reset_list[j]:
+                values[j] = values[parent[j]]
+        return np.asarray(values, dtype=np.int64)
+
+    offsets = tree.level_offsets
+    for level in range(1, tree.depth):
+        lo, hi = offsets[level], offsets[level + 1]
+        label[lo:hi] = np.where(reset[lo:hi], label[lo:hi], label[tree.parent[lo:hi]])
+    return label
+
+
+def write_back(tree: CompiledTree, ev: np.ndarray) -> None:
+    """
+    Stores solved EVs on the source StrategyNodes (childless nodes stay unset)
+    and marks every StrategyNode clean for incremental recomputation.
+    """
+    if tree.sources is None:
+        return
+    sources = tree.sources
+    values = ev.tolist()
+    if not isinstance(sources[0], StrategyNode):
+        for i in np.flatnonzero(tree.n_children).tolist():
+            sources[i].expected_value = values[i]
+        return
+    # Plain dict writes: pydantic's __setattr__ costs more than the solve itself
+    n_children = tree.n_children.tolist()
+    for i in np.flatnonzero(tree.node_type != OUTCOME).tolist():
+        node = sources[i]
+        if n_children[i]:
+            node.__dict__["expected_value"] = values[i]
+            node.__pydantic_fields_set__.add("expected_value")
+        private = node.__pydantic_private__
+        private["_ev_dirty"] = False
+        private["_ranking"] = None
+
+
+def best_children(tree: CompiledTree, ev: np.ndarray) -> np.ndarray:
+    """
+    Returns the index of the child chosen by each decision node under the
+    solved EVs (first maximum on ties), and -1 for every other node.
+    """
+    best = np.full(tree.size, -1, dtype=np.int64)
+    if tree.size < 2:
+        return best
+    parent = tree.parent[1:]
+    candidates = 1 + np.flatnonzero(
+        (tree.node_type[parent] == DECISION) & (ev[1:] == ev[parent])
+    )
+    # Candidates are ordered by parent (breadth-first), so the first index per parent wins
+    parents, first = np.unique(tree.parent[candidates], return_index=True)
+    best[parents] = candidates[first]
+    return best
+
+
+def runner_up_ev(tree: CompiledTree, ev: np.ndarray, best: np.ndarray) -> np.ndarray:
+    """Best EV among each decision node's children other than the chosen one (NaN if none)."""
+    runner_up = np.full(tree.size, np.nan)
+    if tree.size < 2:
+        return runner_up
+    children = np.arange(1, tree.size)
+    parent = tree.parent[1:]
+    mask = (tree.node_type[parent] == DECISION) & (best[parent] != children)
+    if mask.any():
+        others = children[mask]
+        runner_up_max = np.full(tree.size, -np.inf)
+        np.maximum.at(runner_up_max, tree.parent[others], ev[others])
+        found = runner_up_max > -np.inf
+        runner_up[found] = runner_up_max[found]
+    return runner_up
@@ -0,0 +1,159 @@
+import os
+import weakref
+from typing import List, Optional
+
+from src.engine import instrumentation
+from src.engine.models import StrategyNode, Outcome
+from src.engine.compiler import compile_tree, backward_induction
+
+# When enabled, every refresh_ev() is verified against a full recompute.
+_CHECK_CONSISTENCY = os.getenv("GRANDMASTER_CHECK_EV", "") not in ("", "0")
+
+
+def enable_consistency_checks(enabled: bool = True) -> None:
+    """Turns full-recompute verification of incremental results on or off."""
+    global _CHECK_CONSISTENCY
+    _CHECK_CONSISTENCY = enabled
+
+
+def parent_of(node: StrategyNode) -> Optional[StrategyNode]:
+    """Returns the parent recorded by link_child/link_parents, if it is still alive."""
+    ref = node._parent_ref
+    return ref() if ref is not None else None
+
+
+def link_child(parent: StrategyNode, child: StrategyNode | Outcome) -> None:
+    """Records `parent` as the parent of `child` (Outcomes need no link)."""
+    if isinstance(child, StrategyNode):
+        child._parent_ref = weakref.ref(parent)
+
+
+def link_parents(root: StrategyNode) -> None:
+    """Links every StrategyNode of a tree built outside the navigator to its parent."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for child in node.children:
+            if isinstance(child, StrategyNode):
+                child._parent_ref = weakref.ref(node)
+                stack.append(child)
+
+
+def mark_dirty(node: StrategyNode) -> None:
+    """
+    Flags `node` and its ancestors for recomputation.
+
+    A dirty node always has dirty ancestors, so the walk stops at the first
+    ancestor that is already flagged.
+    """
+    node._ev_dirty = True
+    parent = parent_of(node)
+    while parent is not None and not parent._ev_dirty:
+        parent._ev_dirty = True
+        parent = parent_of(parent)
+
+
+def attach_child(parent: StrategyNode, child: StrategyNode | Outcome) -> None:
+    """Appends a child and flags the path to the root for recomputation."""
+    parent.children.append(child)
+    link_child(parent, child)
+    if parent._ranking is not None:
+        parent._ranking.add(child)
+    mark_dirty(parent)
+
+
+def attach_children(parent: StrategyNode, children: List[StrategyNode | Outcome]) -> None:
+    """Appends many children as one change: the path to the root is flagged once."""
+    parent.children.extend(children)
+    ranking = parent._ranking
+    for child in children:
+        link_child(parent, child)
+        if ranking is not None:
+            ranking.add(child)
+    mark_dirty(parent)
+
+
+def replace_child(parent: StrategyNode, index: int, child: StrategyNode | Outcome) -> None:
+    """Swaps the child at `index` (e.g. when an Outcome is drilled into) and flags the path."""
+    old = parent.children[index]
+    parent.children[index] = child
+    link_child(parent, child)
+    if parent._ranking is not None:
+        parent._ranking.replace(old, child)
+    mark_dirty(parent)
+
+
+def truncate_children(parent: StrategyNode, length: int) -> None:
+    """Drops the children from position `length` on (e.g. undoing appends) and flags the path."""
+    removed = parent.children[length:]
+    del parent.children[length:]
+    if parent._ranking is not None:
+        for child in reversed(removed):
+            parent._ranking.remove(child)
+    mark_dirty(parent)
+
+
+def _cached_ev(child: StrategyNode | Outcome) -> float:
+    if isinstance(child, Outcome):
+        return child.value
+    if not child.children:
+        return 0.0
+    return child.expected_value
+
+
+@instrumentation.timed("refresh_ev")
+def refresh_ev(root: StrategyNode) -> float:
+    """
+    Recomputes EVs for dirty nodes only, reusing the cached EV of clean subtrees.
+
+    After a single commit only the ancestors of the changed node are dirty, so
+    the cost is the total width along that path instead of the whole tree.
+    """
+    visited = 0
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not expanded:
+            if not node._ev_dirty:
+                continue
+            stack.append((node, True))
+            for child in node.children:
+                if isinstance(child, StrategyNode) and child._ev_dirty:
+                    stack.append((child, False))
+            continue
+
+        if node.children:
+            if node.node_type == "decision":
+                node.expected_value = max(_cached_ev(child) for child in node.children)
+            else:
+                node.expected_value = sum(child.probability * _cached_ev(child) for child in node.children)
+            # Children changed outside attach_child/replace_child invalidate the ranking
+            if node._ranking is not None and not node._ranking.matches(node.children):
+                node._ranking = None
+            # Re-rank the node among its siblings without re-sorting them
+            parent = parent_of(node)
+            if parent is not None and parent._ranking is not None:
+                parent._ranking.update(node)
+        node._ev_dirty = False
+        visited += 1
+
+    instrumentation.count("refresh_ev.nodes", visited)
+
+    if _CHECK_CONSISTENCY:
+        check_consistency(root)
+
+    return _cached_ev(root)
+
+
+def check_consistency(root: StrategyNode, tolerance: float = 1e-9) -> None:
+    """Raises AssertionError if any cached EV differs from a full recompute."""
+    tree = compile_tree(root)
+    ev = backward_induction(tree)
+    for i, node in enumerate(tree.sources):
+        if isinstance(node, Outcome) or not node.children:
+            continue
+        cached = node.expected_value
+        if node._ev_dirty or cached is None or abs(cached - ev[i]) > tolerance * max(1.0, abs(ev[i])):
+            raise AssertionError(
+                f"Incremental EV mismatch at '{node.name}': cached {cached}, full recompute {ev[i]}"
+            )
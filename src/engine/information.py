@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.compiler import (
+    CompiledTree, compile_tree, backward_induction, best_children, runner_up_ev, propagate_down, propagate_label,
+    CHANCE, DECISION,
+)
+from src.engine.sensitivity import node_path
+
+
+@dataclass
+class InformationValue:
+    """
+    Value of learning one chance node's outcome before its decision.
+
+    Attributes:
+        node: Index of the chance node in the compiled tree.
+        path: Slash-separated names from the root to the node.
+        decision: Path of the nearest decision node above, which the
+            information is revealed to.
+        evpi: Expected value of perfect information, in EV at that decision.
+        weight: d(root EV)/d(decision EV), the probability of reaching the
+            decision under the optimal policy.
+    """
+    node: int
+    path: str
+    decision: str
+    evpi: float
+    weight: float
+
+    @property
+    def root_evpi(self) -> float:
+        """Gain in root EV, at least; more if upstream decisions change too."""
+        return self.weight * self.evpi
+
+
+@dataclass
+class InformationReport:
+    """
+    EVPI of every chance node, from one solve of the tree.
+
+    Between a decision node and the chance nodes below it (down to the next
+    decision), the EV of the branch containing a chance node c is linear in
+    c's EV: branch EV = base + local * (EV(c) - EV of c's revealed outcome).
+    Every conditional branch value therefore comes from stored subtree EVs,
+    and the whole report costs O(nodes). Probability mass a chance node leaves
+    unassigned counts as an implicit outcome worth 0.0, as in compute_ev.
+    """
+    tree: CompiledTree
+    ev: np.ndarray
+    evpi: np.ndarray
+    weight: np.ndarray
+    decision_node: np.ndarray
+    branch: np.ndarray
+    local: np.ndarray
+    other: np.ndarray
+
+    @property
+    def root_ev(self) -> float:
+        return float(self.ev[0])
+
+    def path(self, node: int) -> str:
+        return node_path(self.tree, node)
+
+    def values(self) -> List[InformationValue]:
+        """Every chance node below a decision, ranked by root EV gain, then by EVPI."""
+        nodes = np.flatnonzero(~np.isnan(self.evpi))
+        order = np.lexsort((nodes, -self.evpi[nodes], -(self.weight[nodes] * self.evpi[nodes])))
+        return [
+            InformationValue(
+                node=i,
+                path=self.path(i),
+                decision=self.path(int(self.decision_node[i])),
+                evpi=float(self.evpi[i]),
+                weight=float(self.weight[i]),
+            )
+            for i in nodes[order].tolist()
+        ]
+
+    def evsi(self, node: int, likelihood: Sequence[Sequence[float]] | np.ndarray) -> float:
+        """
+        Expected value of sample information about a chance node: a signal is
+        observed before the decision with likelihood[k][s] = P(signal s |
+        child k). Rows follow the node's children; a chance node whose
+        probabilities sum below one needs one more row for the unassigned mass.
+        """
+        tree = self.tree
+        if np.isnan(self.evpi[node]):
+            raise ValueError(f"'{self.path(node)}' is not a chance node below a decision")
+        start = tree.first_child[node]
+        children = np.arange(start, start + tree.n_children[node])
+        prior = tree.probability[children]
+        values = self.ev[children]
+        residual = 1.0 - prior.sum()
+
+        table = np.asarray(likelihood, dtype=np.float64)
+        if table.ndim != 2 or table.shape[0] not in (len(children), len(children) + 1):
+            raise ValueError(f"Expected {len(children)} likelihood rows (one per child), got shape {table.shape}")
+        if table.shape[0] == len(children):
+            if residual > 1e-9:
+                raise ValueError(f"'{self.path(node)}' leaves {residual:.4g} probability unassigned; add a row for it")
+        else:
+            prior = np.append(prior, max(residual, 0.0))
+            values = np.append(values, 0.0)
+        if np.any(table < 0) or not np.allclose(table.sum(axis=1), 1.0):
+            raise ValueError("Each likelihood row must be a distribution over signals")
+
+        # joint[k, s] = P(child k, signal s); branch EV given s is linear in the posterior mean
+        joint = prior[:, None] * table
+        signal = joint.sum(axis=0)
+        mean = values @ joint
+        base = self.ev[self.branch[node]]
+        local = self.local[node]
+        shifted = signal * (base - local * self.ev[node]) + local * mean
+        gain = np.maximum(signal * self.other[node], shifted).sum() - self.ev[self.decision_node[node]]
+        return max(float(gain), 0.0)
+
+
+def value_of_information(tree: CompiledTree | StrategyNode | Outcome) -> InformationReport:
+    """Computes the EVPI of every chance node relative to its nearest decision ancestor."""
+    if not isinstance(tree, CompiledTree):
+        tree = compile_tree(tree)
+    ev = backward_induction(tree)
+    best = best_children(tree, ev)
+    n = tree.size
+    parent = tree.parent
+    safe_parent = np.maximum(parent, 0)
+
+    from_decision = tree.node_type[safe_parent] == DECISION
+    from_decision[0] = False
+    factor = np.where(from_decision, best[safe_parent] == np.arange(n), tree.probability)
+    weight_below = propagate_down(tree, factor)
+    local = propagate_down(tree, tree.probability, reset=from_decision)
+    branch = propagate_label(tree, from_decision)
+    decision_node = np.where(branch >= 0, parent[np.maximum(branch, 0)], -1)
+    decision_node[0] = -1
+
+    # Best EV at the decision without the branch that holds each node
+    d = np.maximum(decision_node, 0)
+    runner_up = np.nan_to_num(runner_up_ev(tree, ev, best), nan=-np.inf)
+    other = np.where(best[d] == branch, runner_up[d], ev[np.maximum(best[d], 0)])
+    base = ev[np.maximum(branch, 0)]
+
+    chance = (tree.node_type == CHANCE) & (tree.n_children > 0) & (decision_node >= 0)
+    children = 1 + np.flatnonzero(chance[parent[1:]])
+    c = parent[children]
+    revealed = tree.probability[children] * np.maximum(other[c], base[c] + local[c] * (ev[children] - ev[c]))
+    totals = np.bincount(c, weights=revealed, minlength=n)
+    assigned = np.bincount(c, weights=tree.probability[children], minlength=n)
+    residual = np.maximum(1.0 - assigned, 0.0) * np.maximum(other, base - local * ev)
+
+    evpi = np.full(n, np.nan)
+    evpi[chance] = np.maximum(totals[chance] + residual[chance] - ev[d[chance]], 0.0)
+    return InformationReport(
+        tree=tree,
+        ev=ev,
+        evpi=evpi,
+        weight=np.where(decision_node >= 0, weight_below[d], 0.0),
+        decision_node=decision_node,
+        branch=branch,
+        local=local,
+        other=other,
+    )
@@ -1,3 +1,12 @@
+import csv
+import os
+import sys
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import IO, List, Optional
+
+import numpy as np
+
 from src.engine.models import Outcome
 
 def get_outcomes_sequentially(num_outcomes: int):
@@ -24,4 +33,161 @@ def get_outcomes_sequentially(num_outcomes: int):
             probability=prob_percent / 100.0
         ))
     
-    return outcomes
\ No newline at end of file
+    return outcomes
+
+
+# ---------------------------------------------------------------------------
+# Bulk loading (CSV/TSV files or piped stdin)
+# ---------------------------------------------------------------------------
+
+_COLUMN_ALIASES = {
+    "name": ("name", "outcome", "label"),
+    "probability": ("probability", "prob", "p", "probability_percent", "percent"),
+    "value": ("value", "payoff"),
+}
+
+
+@dataclass
+class OutcomeTable:
+    """Validated outcomes as columns; probabilities are fractions that sum to 1."""
+    names: List[str]
+    probabilities: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def to_outcomes(self) -> List[Outcome]:
+        # Already validated column-wise, so skip per-object validation
+        return [
+            Outcome.model_construct(name=name, probability=p, value=v)
+            for name, p, v in zip(self.names, self.probabilities.tolist(), self.values.tolist())
+        ]
+
+
+def read_outcome_table(
+    source: str | os.PathLike | IO[str],
+    delimiter: Optional[str] = None,
+    percent: bool = False,
+    balance_last: bool = True,
+    chunk_size: int = 10_000,
+    tolerance: float = 1e-4,
+    budget: float = 1.0,
+) -> OutcomeTable:
+    """
+    Reads outcomes from a CSV/TSV file, an open text stream or "-" (stdin).
+
+    Columns are name, probability, value unless a header row names them
+    (payoff and percent are accepted). Probabilities are fractions, or
+    percentages when `percent` is set, the header says percent or the cell
+    ends in "%". Rows are parsed and range-checked a chunk at a time. As in
+    the interview, the last outcome absorbs whatever keeps the total from
+    being 100% when `balance_last` is set; otherwise the total must already
+    be 100%. `budget` replaces that 100% when the outcomes join siblings that
+    already hold part of the probability.
+    """
+    if source == "-":
+        return _read_table(sys.stdin, delimiter, percent, balance_last, chunk_size, tolerance, budget)
+    if isinstance(source, (str, os.PathLike)):
+        if delimiter is None and str(source).lower().endswith(".tsv"):
+            delimiter = "\t"
+        with open(source, newline="", encoding="utf-8") as handle:
+            return _read_table(handle, delimiter, percent, balance_last, chunk_size, tolerance, budget)
+    return _read_table(source, delimiter, percent, balance_last, chunk_size, tolerance, budget)
+
+
+def _read_table(stream, delimiter, percent, balance_last, chunk_size, tolerance, budget) -> OutcomeTable:
+    first = stream.readline()
+    if delimiter is None:
+        delimiter = "\t" if "\t" in first else ","
+    rows = csv.reader(chain([first], stream), delimiter=delimiter)
+
+    header = next(rows, None)
+    columns = _header_columns(header)
+    line = 1
+    if columns is None:
+        columns = (0, 1, 2)
+        rows = chain([header], rows) if header else rows
+        line = 0
+    elif "percent" in header[columns[1]].strip().lower():
+        percent = True
+
+    names: List[str] = []
+    probabilities, values = [], []
+    width = max(columns) + 1
+    while True:
+        chunk = [row for row in islice(rows, chunk_size)]
+        if not chunk:
+            break
+        chunk_lines = [line + 1 + k for k in range(len(chunk))]
+        line += len(chunk)
+        kept = [(n, row) for n, row in zip(chunk_lines, chunk) if any(cell.strip() for cell in row)]
+        if not kept:
+            continue
+        for n, row in kept:
+            if len(row) < width:
+                raise ValueError(f"line {n}: expected {width} columns, got {len(row)}")
+        chunk_lines = [n for n, _ in kept]
+        chunk = [row for _, row in kept]
+
+        name_col, prob_col, value_col = columns
+        names.extend(row[name_col].strip() for row in chunk)
+        raw_prob = [row[prob_col].strip() for row in chunk]
+        scale = np.where(np.char.endswith(np.asarray(raw_prob, dtype=str), "%") | percent, 0.01, 1.0)
+        prob = _parse_column([cell.rstrip("%") for cell in raw_prob], "probability", chunk_lines) * scale
+        value = _parse_column([row[value_col].strip() for row in chunk], "value", chunk_lines)
+
+        bad = np.flatnonzero(~((prob >= 0.0) & (prob <= 1.0)))
+        if bad.size:
+            k = int(bad[0])
+            raise ValueError(f"line {chunk_lines[k]}: probability {raw_prob[k]} is outside 0-100%")
+        bad = np.flatnonzero(~np.isfinite(value))
+        if bad.size:
+            raise ValueError(f"line {chunk_lines[int(bad[0])]}: value must be a finite number")
+        probabilities.append(prob)
+        values.append(value)
+
+    if not names:
+        raise ValueError("No outcomes found")
+    probability = np.concatenate(probabilities)
+    value = np.concatenate(values)
+
+    total = float(probability.sum())
+    if abs(total - budget) > tolerance:
+        if not balance_last:
+            raise ValueError(f"Probabilities sum to {total * 100:.4g}%, not {budget * 100:.4g}%")
+        remaining = budget - float(probability[:-1].sum())
+        if remaining < -tolerance:
+            raise ValueError(
+                f"The first {len(names) - 1} outcomes already sum to {(budget - remaining) * 100:.4g}% "
+                f"of the {budget * 100:.4g}% available; nothing is left for '{names[-1]}'"
+            )
+        probability[-1] = max(remaining, 0.0)
+    return OutcomeTable(names=names, probabilities=probability, values=value)
+
+
+def _header_columns(row: Optional[List[str]]) -> Optional[tuple]:
+    """Column indexes of (name, probability, value) if `row` is a header, else None."""
+    if not row:
+        return None
+    labels = [cell.strip().lower() for cell in row]
+    found = []
+    for field in ("name", "probability", "value"):
+        index = next((i for i, label in enumerate(labels) if label in _COLUMN_ALIASES[field]), None)
+        if index is None:
+            return None
+        found.append(index)
+    return tuple(found)
+
+
+def _parse_column(cells: List[str], field: str, lines: List[int]) -> np.ndarray:
+    try:
+        return np.asarray(cells, dtype=str).astype(np.float64)
+    except ValueError:
+        for n, cell in zip(lines, cells):
+            try:
+                float(cell)
+            except ValueError:
+                raise ValueError(f"line {n}: {field} {cell!r} is not a number") from None
+        raise
+
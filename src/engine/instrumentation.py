@@ -0,0 +1,167 @@
+"""
+Built-in timing and counting hooks for the engine and the navigator graph.
+
+Disabled by default; set GRANDMASTER_PROFILE=1 or call enable(). While
+disabled, instrumented functions cost one flag check per call. While enabled,
+every span is aggregated for stats() and kept as a Chrome trace event for
+export_chrome_trace() (open the file in chrome://tracing or Perfetto).
+
+    from src.engine import instrumentation
+    instrumentation.enable()
+    ...
+    print(instrumentation.format_stats())
+    instrumentation.export_chrome_trace("trace.json")
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+MAX_EVENTS = 1_000_000
+
+
+class _State:
+    enabled = os.getenv("GRANDMASTER_PROFILE", "") not in ("", "0")
+
+
+_lock = threading.Lock()
+_spans: Dict[str, List[float]] = {}  # name -> [count, total, max]
+_counters: Dict[str, float] = {}
+_events: List[Dict[str, Any]] = []
+_caches: Dict[str, "weakref.WeakSet"] = {}
+_epoch = time.perf_counter()
+
+
+def enable(enabled: bool = True) -> None:
+    _State.enabled = enabled
+
+
+def disable() -> None:
+    _State.enabled = False
+
+
+def is_enabled() -> bool:
+    return _State.enabled
+
+
+def reset() -> None:
+    """Clears recorded spans, counters and trace events (tracked caches stay tracked)."""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _events.clear()
+
+
+def record_span(name: str, start: float, end: float, args: Optional[Dict[str, Any]] = None) -> None:
+    """Records a finished span; `start` and `end` come from time.perf_counter()."""
+    duration = end - start
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            _spans[name] = [1, duration, duration]
+        else:
+            stats[0] += 1
+            stats[1] += duration
+            if duration > stats[2]:
+                stats[2] = duration
+        if len(_events) < MAX_EVENTS:
+            event = {
+                "name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                "ts": (start - _epoch) * 1e6, "dur": duration * 1e6,
+            }
+            if args:
+                event["args"] = args
+            _events.append(event)
+
+
+def count(name: str, amount: float = 1) -> None:
+    """Adds to a named counter (only while enabled)."""
+    if _State.enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + amount
+
+
+class span:
+    """Context manager timing a block while instrumentation is enabled."""
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, **args):
+        self.name = name
+        self.args = args
+        self.start = None
+
+    def __enter__(self) -> span:
+        if _State.enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.start is not None:
+            record_span(self.name, self.start, time.perf_counter(), self.args)
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of a function while instrumentation is enabled."""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _State.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record_span(name, start, time.perf_counter())
+        return wrapper
+    return decorate
+
+
+def track_cache(name: str, cache: Any) -> None:
+    """
+    Reports a cache's `hits` and `misses` attributes under `name` in stats().
+    Caches are held weakly; several instances under one name are summed.
+    """
+    with _lock:
+        _caches.setdefault(name, weakref.WeakSet()).add(cache)
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Aggregated spans (milliseconds), counters and cache hit rates."""
+    with _lock:
+        spans = {
+            name: {"count": int(n), "total_ms": total * 1000, "mean_ms": total / n * 1000, "max_ms": longest * 1000}
+            for name, (n, total, longest) in _spans.items()
+        }
+        counters = dict(_counters)
+        caches = {}
+        for name, instances in _caches.items():
+            hits = sum(cache.hits for cache in instances)
+            misses = sum(cache.misses for cache in instances)
+            caches[name] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+    return {"spans": spans, "counters": counters, "caches": caches}
+
+
+def format_stats() -> str:
+    data = stats()
+    lines = [f"{'span':<32}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"]
+    for name, s in sorted(data["spans"].items(), key=lambda item: -item[1]["total_ms"]):
+        lines.append(f"{name:<32}{s['count']:>8}{s['total_ms']:>12.2f}{s['mean_ms']:>10.3f}{s['max_ms']:>10.3f}")
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f"{name:<32}{value:>8g}")
+    for name, c in sorted(data["caches"].items()):
+        lines.append(f"{name:<32} {c['hits']} hits / {c['misses']} misses ({c['hit_rate']:.0%})")
+    return "\n".join(lines)
+
+
+def export_chrome_trace(path: str | os.PathLike) -> int:
+    """Writes the recorded spans in Chrome trace format and returns the event count."""
+    with _lock:
+        events = list(_events)
+    with open(path, "w") as handle:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": stats()}, handle)
+    return len(events)
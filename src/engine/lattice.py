@@ -0,0 +1,242 @@
+"""
+Recombining lattices: multi-period models whose paths merge into shared states.
+
+An up/down model over n periods written as a StrategyNode tree has 2^n paths,
+but only O(n^2) distinct states once paths that reach the same state are
+merged. A Lattice stores each state once, as a DAG, and solves it by dynamic
+programming from the last level back. Every state is solved once, however
+many parents share it. States follow the tree semantics: chance states take
+the probability-weighted sum of their successors, decision states take the
+best successor, outcome states are worth their payoff.
+
+States are grouped into levels, and every edge leads to a later level, so
+each level is solved with segment reductions, as in backward_induction.
+expand() unrolls the lattice into the equivalent StrategyNode tree, so small
+cases can be checked against compute_ev. A Lattice can also be a child in a
+CoreNode tree: compile_tree treats it as a leaf worth its solved root EV, so
+a multi-period model can follow a decision without being unrolled.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.compiler import OUTCOME, CHANCE, DECISION, register_leaf_type
+
+_TYPE_CODES = {"outcome": OUTCOME, "chance": CHANCE, "decision": DECISION}
+
+
+@register_leaf_type
+@dataclass
+class Lattice:
+    """
+    A solved-by-DP DAG of states, stored in level order with CSR edges.
+
+    Attributes:
+        names: State names.
+        node_type: OUTCOME, CHANCE or DECISION per state.
+        payoff: Payoff of outcome states, 0.0 otherwise.
+        level_offsets: Start index of every level, plus the state count.
+        edge_offsets: Edges of state i are edge_offsets[i]:edge_offsets[i + 1].
+        edge_target: Successor state of each edge.
+        edge_probability: Branch probability of each edge (1.0 below decisions).
+        probability: Branch probability of the lattice as a child in a tree.
+    """
+    names: List[str]
+    node_type: np.ndarray
+    payoff: np.ndarray
+    level_offsets: np.ndarray
+    edge_offsets: np.ndarray
+    edge_target: np.ndarray
+    edge_probability: np.ndarray
+    probability: float = 1.0
+
+    @property
+    def name(self) -> str:
+        return self.names[0]
+
+    @property
+    def value(self) -> float:
+        """The root EV, which is what the lattice is worth as a leaf of a tree."""
+        return float(self.solve()[0])
+
+    @property
+    def size(self) -> int:
+        return len(self.node_type)
+
+    @property
+    def depth(self) -> int:
+        return len(self.level_offsets) - 1
+
+    def solve(self) -> np.ndarray:
+        """EV of every state, from the last level back to the root (state 0)."""
+        ev = np.where(self.node_type == OUTCOME, self.payoff, 0.0)
+        counts = np.diff(self.edge_offsets)
+        offsets = self.level_offsets
+        for level in range(self.depth - 2, -1, -1):
+            lo, hi = offsets[level], offsets[level + 1]
+            states = lo + np.flatnonzero(counts[lo:hi])
+            if not states.size:
+                continue
+            e_lo, e_hi = self.edge_offsets[lo], self.edge_offsets[hi]
+            starts = self.edge_offsets[states] - e_lo
+            values = ev[self.edge_target[e_lo:e_hi]]
+
+            sums = np.add.reduceat(self.edge_probability[e_lo:e_hi] * values, starts)
+            maxima = np.maximum.reduceat(values, starts)
+            ev[states] = np.where(self.node_type[states] == DECISION, maxima, sums)
+        return ev
+
+    def policy(self, ev: Optional[np.ndarray] = None) -> np.ndarray:
+        """The successor chosen by each decision state (first maximum on ties), -1 elsewhere."""
+        if ev is None:
+            ev = self.solve()
+        best = np.full(self.size, -1, dtype=np.int64)
+        source = np.repeat(np.arange(self.size), np.diff(self.edge_offsets))
+        candidates = np.flatnonzero(
+            (self.node_type[source] == DECISION) & (ev[self.edge_target] == ev[source])
+        )
+        # Edges are ordered by source, so the first candidate per source wins
+        sources, first = np.unique(source[candidates], return_index=True)
+        best[sources] = self.edge_target[candidates[first]]
+        return best
+
+    def successors(self, state: int) -> List[Tuple[int, float]]:
+        start, end = self.edge_offsets[state], self.edge_offsets[state + 1]
+        return list(zip(self.edge_target[start:end].tolist(), self.edge_probability[start:end].tolist()))
+
+    def expand(self) -> StrategyNode | Outcome:
+        """
+        Unrolls the lattice into the equivalent tree, duplicating shared states
+        (exponential in the number of periods; meant for small cases).
+        """
+        def make(state: int, probability: float) -> StrategyNode | Outcome:
+            code = self.node_type[state]
+            if code == OUTCOME:
+                return Outcome(name=self.names[state], probability=probability, value=float(self.payoff[state]))
+            node_type = "decision" if code == DECISION else "chance"
+            return StrategyNode(name=self.names[state], node_type=node_type, probability=probability)
+
+        root = make(0, self.probability)
+        stack = [(0, root)]
+        while stack:
+            state, node = stack.pop()
+            if isinstance(node, Outcome):
+                continue
+            for target, probability in self.successors(state):
+                child = make(target, probability)
+                node.children.append(child)
+                stack.append((target, child))
+        return root
+
+
+class LatticeBuilder:
+    """
+    Collects states and edges in any order and packs them into a Lattice.
+    The first state added is the root.
+    """
+
+    def __init__(self):
+        self._states: List[Tuple[int, str, int, float]] = []
+        self._edges: Dict[int, List[Tuple[int, float]]] = {}
+
+    def add_state(self, level: int, name: str, node_type: str = "chance", payoff: float = 0.0) -> int:
+        if node_type not in _TYPE_CODES:
+            raise ValueError(f"Unknown node type '{node_type}' for state '{name}'")
+        self._states.append((level, name, _TYPE_CODES[node_type], float(payoff)))
+        return len(self._states) - 1
+
+    def add_edge(self, source: int, target: int, probability: float = 1.0) -> None:
+        if self._states[source][2] == OUTCOME:
+            raise ValueError(f"Outcome state '{self._states[source][1]}' cannot have successors")
+        if self._states[target][0] <= self._states[source][0]:
+            raise ValueError(
+                f"Edge from '{self._states[source][1]}' to '{self._states[target][1]}' must lead to a later level"
+            )
+        self._edges.setdefault(source, []).append((target, probability))
+
+    def build(self) -> Lattice:
+        if not self._states:
+            raise ValueError("A lattice needs at least one state")
+        levels = np.asarray([state[0] for state in self._states])
+        if np.any(levels[1:] <= levels[0]):
+            raise ValueError("The root must be alone on the first level")
+        # Stable sort keeps insertion order inside a level; new ids replace old ones
+        order = np.argsort(levels, kind="stable")
+        new_id = np.empty(len(order), dtype=np.int64)
+        new_id[order] = np.arange(len(order))
+
+        names, node_type, payoff, edge_offsets, edge_target, edge_probability = [], [], [], [0], [], []
+        for old in order.tolist():
+            _, name, code, value = self._states[old]
+            names.append(name)
+            node_type.append(code)
+            payoff.append(value)
+            for target, probability in self._edges.get(old, ()):
+                edge_target.append(new_id[target])
+                edge_probability.append(probability)
+            edge_offsets.append(len(edge_target))
+
+        sorted_levels = levels[order]
+        level_offsets = np.flatnonzero(np.diff(sorted_levels, prepend=sorted_levels[0] - 1))
+        return Lattice(
+            names=names,
+            node_type=np.asarray(node_type, dtype=np.int8),
+            payoff=np.asarray(payoff, dtype=np.float64),
+            level_offsets=np.append(level_offsets, len(order)).astype(np.int64),
+            edge_offsets=np.asarray(edge_offsets, dtype=np.int64),
+            edge_target=np.asarray(edge_target, dtype=np.int64),
+            edge_probability=np.asarray(edge_probability, dtype=np.float64),
+        )
+
+
+def binomial_lattice(
+    periods: int,
+    up_probability: float,
+    payoff: Callable[[int], float],
+    exercise: Optional[Callable[[int, int], Optional[float]]] = None,
+) -> Lattice:
+    """
+    A recombining up/down model over `periods` steps: O(periods^2) states.
+
+    `payoff(ups)` is the final payoff after `ups` up-moves. With `exercise`,
+    the state after `step` steps and `ups` up-moves becomes a decision
+    between stopping for `exercise(step, ups)` and holding for another step
+    (skipped where it returns None), as in early-exercise models.
+    """
+    if not 0.0 <= up_probability <= 1.0:
+        raise ValueError(f"up_probability {up_probability} is outside [0, 1]")
+    builder = LatticeBuilder()
+    # Each step spans two levels: the (optional) decision, then the hold state
+    previous: List[int] = []
+    for step in range(periods + 1):
+        current = []
+        for ups in range(step + 1):
+            label = f"Step {step}, {ups} up"
+            if step == periods:
+                current.append(builder.add_state(2 * step, label, "outcome", payoff(ups)))
+                continue
+            stop = exercise(step, ups) if exercise is not None else None
+            if stop is None:
+                current.append(builder.add_state(2 * step, label, "chance"))
+                continue
+            decision = builder.add_state(2 * step, label, "decision")
+            builder.add_edge(decision, builder.add_state(2 * step + 1, f"{label}: Exercise", "outcome", stop))
+            hold = builder.add_state(2 * step + 1, f"{label}: Hold", "chance")
+            builder.add_edge(decision, hold)
+            # Hold states carry the up/down edges; link them through the decision
+            current.append((decision, hold))
+        if previous:
+            for ups, state in enumerate(previous):
+                source = state[1] if isinstance(state, tuple) else state
+                builder.add_edge(source, _entry(current[ups + 1]), up_probability)
+                builder.add_edge(source, _entry(current[ups]), 1.0 - up_probability)
+        previous = current
+    return builder.build()
+
+
+def _entry(state) -> int:
+    return state[0] if isinstance(state, tuple) else state
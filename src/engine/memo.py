@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import hashlib
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.engine import instrumentation
+from src.engine.models import StrategyNode, Outcome
+from src.engine.core import CoreNode
+from src.engine.compiler import CompiledTree, compile_tree, write_back, DECISION
+
+
+class SubtreeMemo:
+    """
+    LRU table from structural subtree digests to their EV, shared across trees
+    (for example by every tree a batch worker evaluates).
+
+    Attributes:
+        max_entries: Entries kept before the least recently used is evicted
+            (None for no limit).
+        hits, misses, evictions: Lookup counters since creation or reset().
+    """
+
+    def __init__(self, max_entries: Optional[int] = 100_000):
+        self.max_entries = max_entries
+        self._table: OrderedDict[bytes, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        instrumentation.track_cache("subtree_memo", self)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def get(self, digest: bytes) -> Optional[float]:
+        value = self._table.get(digest)
+        if value is None:
+            self.misses += 1
+            return None
+        self._table.move_to_end(digest)
+        self.hits += 1
+        return value
+
+    def put(self, digest: bytes, value: float) -> None:
+        self._table[digest] = value
+        self._table.move_to_end(digest)
+        if self.max_entries is not None and len(self._table) > self.max_entries:
+            self._table.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._table),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def reset(self) -> None:
+        self._table.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+@dataclass
+class SharedTree:
+    """
+    A compiled tree canonicalized into a DAG of structurally unique subtrees.
+
+    Two subtrees are identical when they have the same node types, payoffs and
+    chance probabilities; names do not matter, and neither do the
+    probabilities under a decision node since they never enter the EV.
+
+    Attributes:
+        tree: The compiled tree.
+        canonical: Canonical subtree id of every node.
+        keys: Per canonical id, (node type, payoff) for childless nodes or
+            (node type, children) where children are canonical ids, paired
+            with their probabilities below chance nodes. Children always have
+            smaller ids than their parents.
+        digests: Per canonical id, a structural hash valid across trees.
+    """
+    tree: CompiledTree
+    canonical: np.ndarray
+    keys: List[tuple]
+    digests: List[bytes]
+
+    @property
+    def n_unique(self) -> int:
+        return len(self.keys)
+
+
+_PACK_DOUBLE = struct.Struct("<d").pack
+
+
+def canonicalize(tree: CompiledTree | StrategyNode | Outcome | CoreNode) -> SharedTree:
+    """Interns every subtree by structure, children first (reverse breadth-first order)."""
+    if not isinstance(tree, CompiledTree):
+        tree = compile_tree(tree)
+    node_type = tree.node_type.tolist()
+    payoff = tree.payoff.tolist()
+    probability = tree.probability.tolist()
+    first_child = tree.first_child.tolist()
+    n_children = tree.n_children.tolist()
+
+    canonical = [0] * tree.size
+    table: Dict[tuple, int] = {}
+    keys: List[tuple] = []
+    digests: List[bytes] = []
+    for i in range(tree.size - 1, -1, -1):
+        count = n_children[i]
+        if not count:
+            key = (node_type[i], payoff[i])
+        else:
+            start = first_child[i]
+            children = canonical[start:start + count]
+            if node_type[i] == DECISION:
+                key = (DECISION, tuple(children))
+            else:
+                key = (node_type[i], tuple(zip(probability[start:start + count], children)))
+        cid = table.get(key)
+        if cid is None:
+            cid = len(keys)
+            table[key] = cid
+            keys.append(key)
+            digests.append(_digest(key, digests))
+        canonical[i] = cid
+
+    return SharedTree(tree=tree, canonical=np.asarray(canonical, dtype=np.int64), keys=keys, digests=digests)
+
+
+def _digest(key: tuple, digests: List[bytes]) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    kind, body = key
+    h.update(bytes((kind,)))
+    if not isinstance(body, tuple):
+        h.update(_PACK_DOUBLE(body))
+    elif kind == DECISION:
+        h.update(b"D")
+        for child in body:
+            h.update(digests[child])
+    else:
+        h.update(b"C")
+        for prob, child in body:
+            h.update(_PACK_DOUBLE(prob))
+            h.update(digests[child])
+    return h.digest()
+
+
+def evaluate_shared(shared: SharedTree, memo: Optional[SubtreeMemo] = None) -> np.ndarray:
+    """
+    Evaluates each unique subtree once and returns the EV per canonical id
+    (NaN for subtrees that were never needed because an ancestor hit the memo).
+
+    Subtrees found in `memo` are not descended into; newly evaluated ones are
+    added to it.
+    """
+    keys = shared.keys
+    digests = shared.digests
+    ev = [None] * len(keys)
+    stack = [(int(shared.canonical[0]), False)]
+    while stack:
+        cid, expanded = stack.pop()
+        if ev[cid] is not None:
+            continue
+        kind, body = keys[cid]
+        if not isinstance(body, tuple):
+            ev[cid] = body
+            continue
+        if not expanded:
+            if memo is not None:
+                cached = memo.get(digests[cid])
+                if cached is not None:
+                    ev[cid] = cached
+                    continue
+            stack.append((cid, True))
+            if kind == DECISION:
+                stack.extend((child, False) for child in body if ev[child] is None)
+            else:
+                stack.extend((child, False) for _, child in body if ev[child] is None)
+            continue
+
+        if kind == DECISION:
+            value = max(ev[child] for child in body)
+        else:
+            value = 0.0
+            for prob, child in body:
+                value += prob * ev[child]
+        ev[cid] = value
+        if memo is not None:
+            memo.put(digests[cid], value)
+
+    return np.asarray([np.nan if v is None else v for v in ev], dtype=np.float64)
+
+
+def compute_ev_shared(
+    node: CompiledTree | StrategyNode | Outcome | CoreNode, memo: Optional[SubtreeMemo] = None
+) -> float:
+    """
+    compute_ev over the hash-consed DAG: repeated subtrees are evaluated once
+    per tree, and once per `memo` across trees. EVs are written back to the
+    source nodes like compute_ev does; subtrees below a memo hit are filled in
+    first, without further lookups.
+    """
+    shared = canonicalize(node)
+    ev = evaluate_shared(shared, memo)
+    if shared.tree.sources is not None:
+        _fill_skipped(shared, ev)
+        write_back(shared.tree, ev[shared.canonical])
+    return float(ev[shared.canonical[0]])
+
+
+def _fill_skipped(shared: SharedTree, ev: np.ndarray) -> None:
+    # Children have smaller canonical ids than their parents, so one ascending
+    # pass computes every skipped subtree after its children
+    for cid in np.flatnonzero(np.isnan(ev)).tolist():
+        kind, body = shared.keys[cid]
+        if not isinstance(body, tuple):
+            ev[cid] = body
+        elif kind == DECISION:
+            ev[cid] = max(ev[child] for child in body)
+        else:
+            ev[cid] = sum(prob * ev[child] for prob, child in body)
@@ -1,11 +1,27 @@
 from __future__ import annotations
+import weakref
+from copy import deepcopy
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, model_serializer
 
 class Outcome(BaseModel):
     name: str
     probability: float = Field(..., ge=0, le=1.0)
     value: float
+    # Named parameters that override probability/value when the tree is
+    # evaluated over a parameter grid (see src/engine/parametric.py)
+    probability_param: Optional[str] = None
+    value_param: Optional[str] = None
+
+    @model_serializer(mode="wrap")
+    def _omit_unset_params(self, handler):
+        # Plain outcomes keep their three-field JSON shape
+        data = handler(self)
+        if self.probability_param is None:
+            data.pop("probability_param", None)
+        if self.value_param is None:
+            data.pop("value_param", None)
+        return data
 
 class StrategyNode(BaseModel):
     name: str
@@ -13,4 +29,67 @@ class StrategyNode(BaseModel):
     # The | operator replaces Union
     children: List[StrategyNode | Outcome] = Field(default_factory=list)
     expected_value: Optional[float] = None
-    probability: float = 1.0  # Default for root or nested nodes
\ No newline at end of file
+    probability: float = 1.0  # Default for root or nested nodes
+
+    # Incremental EV bookkeeping (see src/engine/incremental.py)
+    _ev_dirty: bool = PrivateAttr(default=True)
+    _parent_ref: Optional[object] = PrivateAttr(default=None)
+    # Children ranked by weighted EV (see src/engine/ranking.py), built on first use
+    _ranking: Optional[object] = PrivateAttr(default=None)
+    # Path/id index of the tree under this node (see src/engine/tree_index.py)
+    _tree_index: Optional[object] = PrivateAttr(default=None)
+
+    # Parent links and the id-keyed indexes only make sense for the tree they
+    # were built on: copies and pickles drop them, then relink their children
+    def __getstate__(self):
+        state = super().__getstate__()
+        if state["__pydantic_private__"]:
+            state["__pydantic_private__"] = {
+                **state["__pydantic_private__"], "_parent_ref": None, "_ranking": None, "_tree_index": None
+            }
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        for child in self.children:
+            if isinstance(child, StrategyNode):
+                child._parent_ref = weakref.ref(self)
+
+    def __deepcopy__(self, memo=None):
+        node = type(self).__new__(type(self))
+        node.__setstate__(deepcopy(self.__getstate__(), memo))
+        return node
+
+    def __eq__(self, other):
+        # Compare fields only (the EV bookkeeping above is not part of a node's
+        # value), walking both trees with an explicit stack so depth is unbounded
+        if not isinstance(other, StrategyNode):
+            return NotImplemented
+        stack = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            if type(a) is not type(b):
+                return False
+            if isinstance(a, Outcome):
+                if a != b:
+                    return False
+                continue
+            if (a.name, a.node_type, a.expected_value, a.probability) != (b.name, b.node_type, b.expected_value, b.probability):
+                return False
+            if len(a.children) != len(b.children):
+                return False
+            stack.extend(zip(a.children, b.children))
+        return True
+
+# pydantic resolves every private attribute default one by one on each
+# construction, which costs more than validating the fields; nodes are built
+# in bulk by the readers and generators, so copy the defaults from one dict
+_PRIVATE_DEFAULTS = {name: attr.default for name, attr in StrategyNode.__private_attributes__.items()}
+
+def _init_private_attributes(self, context, /):
+    if getattr(self, "__pydantic_private__", None) is None:
+        object.__setattr__(self, "__pydantic_private__", _PRIVATE_DEFAULTS.copy())
+
+# Assigned after the class body: defined inside it, pydantic would wrap it
+# around its own per-attribute initialiser instead of replacing it
+StrategyNode.model_post_init = _init_private_attributes
@@ -0,0 +1,232 @@
+"""
+Strategic narratives for solved scenarios, generated asynchronously.
+
+NarrativeService puts three layers in front of the LLM:
+
+1. A persistent LRU cache with TTL, keyed on scenario, best outcome and the
+   EV rounded to cents, so re-running a scenario never repeats a call.
+2. Coalescing: concurrent requests for the same key share one in-flight call.
+3. A per-call timeout; failures come back as an "[AI Analysis Unavailable]"
+   message and are not cached.
+
+The backend is selected with GRANDMASTER_NARRATIVE_BACKEND ("openai", the
+default, or "stub" for deterministic offline text) and the cache file with
+GRANDMASTER_NARRATIVE_CACHE (default ~/.cache/grandmaster/narratives.json,
+"" to keep the cache in memory only).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.engine import instrumentation
+
+MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = (
+    "You are the GrandMaster, a cold, calculating military strategist. "
+    "Explain why a move is mathematically superior based on Expected Value."
+)
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "grandmaster" / "narratives.json"
+
+
+def user_prompt(scenario: str, best_outcome: str, ev: float) -> str:
+    return (
+        f"In the scenario '{scenario}', the most viable path is '{best_outcome}' with an EV of {ev}. "
+        "Provide a brief, 2-sentence strategic justification."
+    )
+
+
+def narrative_key(scenario: str, best_outcome: str, ev: float) -> str:
+    return json.dumps([scenario, best_outcome, round(float(ev), 2)], ensure_ascii=False)
+
+
+class NarrativeCache:
+    """
+    LRU cache of narratives with a time-to-live, optionally persisted as JSON.
+
+    Attributes:
+        path: JSON file the cache is loaded from and written through to (None
+            to keep it in memory).
+        max_entries: Entries kept before the least recently used is evicted.
+        ttl: Seconds an entry stays valid.
+    """
+
+    def __init__(self, path: Optional[str | os.PathLike] = None, max_entries: int = 1024, ttl: float = 7 * 24 * 3600):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        instrumentation.track_cache("narrative_cache", self)
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] > self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, text: str) -> None:
+        self._entries[key] = (time.time(), text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self.path is not None:
+            self.save()
+
+    def save(self) -> None:
+        """Writes the cache atomically (temporary file, then rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps([[k, t, text] for k, (t, text) in self._entries.items()], ensure_ascii=False))
+        os.replace(tmp, self.path)
+
+    def _load(self) -> None:
+        try:
+            records = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, created, text in records[-self.max_entries:]:
+            if now - created <= self.ttl:
+                self._entries[key] = (created, text)
+
+
+class StubBackend:
+    """Deterministic offline backend; `delay` simulates network latency."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def complete(self, scenario: str, best_outcome: str, ev: float) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return f"'{best_outcome}' carries the highest expected value in '{scenario}' ({ev:.2f}). Commit to it."
+
+
+class OpenAIBackend:
+    """Chat completions on one pooled AsyncOpenAI client, built on first use."""
+
+    def __init__(self, model: str = MODEL, timeout: float = 20.0):
+        self.model = model
+        self.timeout = timeout
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from dotenv import load_dotenv, find_dotenv
+            from openai import AsyncOpenAI
+            from langsmith.wrappers import wrap_openai
+
+            load_dotenv(find_dotenv())
+            self._client = wrap_openai(AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=self.timeout))
+        return self._client
+
+    async def complete(self, scenario: str, best_outcome: str, ev: float) -> str:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt(scenario, best_outcome, ev)},
+            ],
+        )
+        return response.choices[0].message.content
+
+
+class NarrativeService:
+    """Cached, coalesced, time-limited narrative generation over a backend."""
+
+    def __init__(self, backend=None, cache: Optional[NarrativeCache] = None, timeout: float = 20.0):
+        self.backend = backend if backend is not None else _default_backend()
+        self.cache = cache if cache is not None else NarrativeCache()
+        self.timeout = timeout
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def narrate(self, scenario: str, best_outcome: str, ev: float) -> str:
+        key = narrative_key(scenario, best_outcome, ev)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._call(key, scenario, best_outcome, ev))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def narrate_many(self, requests: Iterable[Tuple[str, str, float]]) -> List[str]:
+        """Narrates (scenario, best outcome, EV) triples concurrently, in order."""
+        return list(await asyncio.gather(*(self.narrate(*request) for request in requests)))
+
+    async def _call(self, key: str, scenario: str, best_outcome: str, ev: float) -> str:
+        try:
+            with instrumentation.span("narrative.request"):
+                text = await asyncio.wait_for(self.backend.complete(scenario, best_outcome, ev), self.timeout)
+        except asyncio.TimeoutError:
+            return f"[AI Analysis Unavailable: timed out after {self.timeout:g}s]"
+        except Exception as e:
+            return f"[AI Analysis Unavailable: {e}]"
+        self.cache.put(key, text)
+        return text
+
+    def narrate_sync(self, scenario: str, best_outcome: str, ev: float) -> str:
+        """Blocking wrapper for synchronous callers, run on a shared background loop."""
+        return asyncio.run_coroutine_threadsafe(self.narrate(scenario, best_outcome, ev), _background_loop()).result()
+
+
+def _default_backend():
+    if os.getenv("GRANDMASTER_NARRATIVE_BACKEND", "openai").lower() == "stub":
+        return StubBackend()
+    return OpenAIBackend()
+
+
+_service: Optional[NarrativeService] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    # One long-lived loop keeps the async client's connection pool usable across sync calls
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="grandmaster-narrative", daemon=True).start()
+    return _loop
+
+
+def get_service() -> NarrativeService:
+    """The process-wide service, configured from the environment on first use."""
+    global _service
+    with _lock:
+        if _service is None:
+            path = os.getenv("GRANDMASTER_NARRATIVE_CACHE", str(DEFAULT_CACHE_PATH))
+            _service = NarrativeService(cache=NarrativeCache(path or None))
+    return _service
+
+
+def set_service(service: Optional[NarrativeService]) -> None:
+    """Replaces the process-wide service (None to rebuild it from the environment)."""
+    global _service
+    with _lock:
+        _service = service
@@ -0,0 +1,172 @@
+"""
+Trees whose Outcome probabilities and payoffs reference named parameters.
+
+An Outcome with `probability_param="hit_rate"` or `value_param="rate_up"`
+takes that parameter's value instead of its own field during a parametric
+evaluation. The tree is compiled once. A whole parameter grid or sampled
+parameter matrix is then solved in batched backward-induction passes, one
+column per parameter row, returning the root EV and the chosen child of the
+root decision for every row.
+"""
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.compiler import CompiledTree, compile_tree, backward_induction_batch, OUTCOME, DECISION
+
+# Rows per pass are chosen so each (nodes x rows) matrix stays near this many elements
+BATCH_ELEMENTS = 1 << 22
+
+
+@dataclass
+class ParametricResult:
+    """
+    Solved parameter rows.
+
+    Attributes:
+        parameters: Parameter names, in column order of `values`.
+        values: Parameter matrix, one row per scenario.
+        ev: Root EV per row.
+        choice: Compiled index of the child chosen at `decision` per row
+            (-1 when the tree has no decision node).
+        decision: Compiled index of the reported decision node (-1 if none).
+        names: Node names of the compiled tree.
+    """
+    parameters: List[str]
+    values: np.ndarray
+    ev: np.ndarray
+    choice: np.ndarray
+    decision: int
+    names: List[str]
+
+    def __len__(self) -> int:
+        return len(self.ev)
+
+    @property
+    def choice_names(self) -> List[Optional[str]]:
+        return [self.names[i] if i >= 0 else None for i in self.choice.tolist()]
+
+    def row(self, i: int) -> Dict[str, float]:
+        return dict(zip(self.parameters, self.values[i].tolist()))
+
+    def best_row(self) -> int:
+        """The row with the highest root EV."""
+        return int(np.argmax(self.ev))
+
+
+@dataclass
+class ParametricTree:
+    """
+    A compiled tree plus the nodes whose probability or payoff is a parameter.
+
+    Attributes:
+        tree: The compiled tree, holding base probabilities and payoffs.
+        parameters: Parameter names in order of first appearance (breadth-first).
+        probability_nodes, probability_columns: Nodes whose probability is a
+            parameter, and that parameter's column.
+        value_nodes, value_columns: The same for Outcome payoffs.
+        decision: Decision node whose choice is reported: the root, or else
+            the shallowest decision node (-1 if there is none).
+    """
+    tree: CompiledTree
+    parameters: List[str]
+    probability_nodes: np.ndarray
+    probability_columns: np.ndarray
+    value_nodes: np.ndarray
+    value_columns: np.ndarray
+    decision: int
+
+    def matrix(self, rows: Mapping[str, Sequence[float] | float] | np.ndarray) -> np.ndarray:
+        """
+        Parameter rows as a (rows, parameters) matrix. Accepts such a matrix
+        directly or a mapping of parameter name to column (scalars broadcast).
+        """
+        if isinstance(rows, Mapping):
+            unknown = sorted(set(rows) - set(self.parameters))
+            missing = [name for name in self.parameters if name not in rows]
+            if unknown or missing:
+                raise ValueError(f"Parameter mismatch: unknown {unknown}, missing {missing}")
+            columns = np.broadcast_arrays(*(np.asarray(rows[name], dtype=np.float64) for name in self.parameters))
+            values = np.stack([np.ravel(column) for column in columns], axis=1) if columns else np.empty((1, 0))
+        else:
+            values = np.asarray(rows, dtype=np.float64)
+            if values.ndim == 1:
+                values = values[None, :]
+            if values.ndim != 2 or values.shape[1] != len(self.parameters):
+                raise ValueError(f"Expected a matrix with {len(self.parameters)} columns, got shape {values.shape}")
+
+        columns = np.unique(self.probability_columns)
+        outside = (values[:, columns] < 0) | (values[:, columns] > 1)
+        if outside.any():
+            name = self.parameters[columns[np.flatnonzero(outside.any(axis=0))[0]]]
+            raise ValueError(f"Probability parameter '{name}' has values outside [0, 1]")
+        return values
+
+    def evaluate(self, rows: Mapping[str, Sequence[float] | float] | np.ndarray) -> ParametricResult:
+        """Solves every parameter row, in batches of columns sized to the tree."""
+        values = self.matrix(rows)
+        tree = self.tree
+        n_rows = len(values)
+        ev = np.empty(n_rows)
+        choice = np.full(n_rows, -1, dtype=np.int64)
+        batch = max(1, BATCH_ELEMENTS // tree.size)
+
+        for start in range(0, n_rows, batch):
+            chunk = values[start:start + batch].T
+            probability = np.repeat(tree.probability[:, None], chunk.shape[1], axis=1)
+            payoff = np.repeat(tree.payoff[:, None], chunk.shape[1], axis=1)
+            probability[self.probability_nodes] = chunk[self.probability_columns]
+            payoff[self.value_nodes] = chunk[self.value_columns]
+
+            solved = backward_induction_batch(tree, probability, payoff)
+            ev[start:start + batch] = solved[0]
+            d = self.decision
+            if d >= 0 and tree.n_children[d]:
+                first = tree.first_child[d]
+                # First maximum on ties, as in best_children
+                choice[start:start + batch] = first + np.argmax(solved[first:first + tree.n_children[d]], axis=0)
+
+        return ParametricResult(
+            parameters=list(self.parameters), values=values, ev=ev, choice=choice,
+            decision=self.decision, names=tree.names,
+        )
+
+    def evaluate_grid(self, axes: Mapping[str, Sequence[float]]) -> ParametricResult:
+        return self.evaluate(parameter_grid(axes))
+
+
+def compile_parametric(root: StrategyNode | Outcome) -> ParametricTree:
+    """Compiles a tree once and records which Outcomes read which parameters."""
+    tree = compile_tree(root)
+    parameters: Dict[str, int] = {}
+    bindings = {"probability": ([], []), "value": ([], [])}
+    for i in np.flatnonzero(tree.node_type == OUTCOME).tolist():
+        node = tree.sources[i]
+        for kind, param in (("probability", node.probability_param), ("value", node.value_param)):
+            if param is not None:
+                nodes, columns = bindings[kind]
+                nodes.append(i)
+                columns.append(parameters.setdefault(param, len(parameters)))
+
+    decisions = np.flatnonzero(tree.node_type == DECISION)
+    return ParametricTree(
+        tree=tree,
+        parameters=list(parameters),
+        probability_nodes=np.asarray(bindings["probability"][0], dtype=np.int64),
+        probability_columns=np.asarray(bindings["probability"][1], dtype=np.int64),
+        value_nodes=np.asarray(bindings["value"][0], dtype=np.int64),
+        value_columns=np.asarray(bindings["value"][1], dtype=np.int64),
+        decision=int(decisions[0]) if decisions.size else -1,
+    )
+
+
+def parameter_grid(axes: Mapping[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+    """The Cartesian product of per-parameter values, as one column per parameter."""
+    names = list(axes)
+    rows = np.array(list(itertools.product(*(axes[name] for name in names))), dtype=np.float64)
+    return {name: rows[:, i] for i, name in enumerate(names)}
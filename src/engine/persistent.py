@@ -0,0 +1,287 @@
+"""
+Immutable, structurally shared strategy trees.
+
+FrozenNode and FrozenOutcome never change after construction: an edit builds
+new nodes along the path from the root to the edited node and reuses every
+other subtree as is (path copying). Keeping an old root therefore costs only
+the O(depth) nodes that a later edit replaced, which makes per-step
+snapshots, undo/redo and side-by-side scenario comparisons cheap.
+
+Each FrozenNode stores its expected value, computed from its children when it
+is built, so an edit re-evaluates only the copied path. Paths here are tuples
+of child positions from the root. patch() moves a mutable working tree from
+one version to another by rebuilding only the subtrees that differ.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from src.engine.models import StrategyNode, Outcome
+
+Path = Tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class FrozenOutcome:
+    name: str
+    probability: float
+    value: float
+
+    @property
+    def expected_value(self) -> float:
+        return self.value
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class FrozenNode:
+    """
+    Attributes:
+        name, node_type, probability: As on StrategyNode.
+        children: Tuple of FrozenNode/FrozenOutcome.
+        expected_value: EV by backward induction (None for a node without
+            children, which counts as 0.0 for its parent).
+    """
+    name: str
+    node_type: str = "chance"
+    children: Tuple[FrozenNode | FrozenOutcome, ...] = ()
+    probability: float = 1.0
+    expected_value: Optional[float] = field(default=None, init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "children", tuple(self.children))
+        object.__setattr__(self, "expected_value", _evaluate(self.node_type, self.children))
+
+
+def _evaluate(node_type: str, children: Sequence[FrozenNode | FrozenOutcome]) -> Optional[float]:
+    if not children:
+        return None
+    evs = [child.expected_value or 0.0 for child in children]
+    if node_type == "decision":
+        return max(evs)
+    total = 0.0
+    for child, ev in zip(children, evs):
+        total += child.probability * ev
+    return total
+
+
+def _rebuild(node: FrozenNode, children: Sequence[FrozenNode | FrozenOutcome]) -> FrozenNode:
+    return FrozenNode(node.name, node.node_type, tuple(children), node.probability)
+
+
+# -- conversion ------------------------------------------------------------
+
+def freeze(root: StrategyNode | Outcome) -> FrozenNode | FrozenOutcome:
+    """Converts a model tree into frozen nodes (iteratively, children first)."""
+    if isinstance(root, Outcome):
+        return FrozenOutcome(root.name, root.probability, root.value)
+    done: Dict[int, FrozenNode | FrozenOutcome] = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, Outcome):
+            done[id(node)] = FrozenOutcome(node.name, node.probability, node.value)
+        elif expanded:
+            done[id(node)] = FrozenNode(
+                node.name, node.node_type, tuple(done.pop(id(c)) for c in node.children), node.probability
+            )
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children)
+    return done[id(root)]
+
+
+def thaw(root: FrozenNode | FrozenOutcome) -> StrategyNode | Outcome:
+    """
+    Builds a mutable model tree from frozen nodes, with EVs filled in and
+    parents linked for incremental recomputation.
+    """
+    from src.engine.calculator import compute_ev
+    from src.engine.incremental import link_parents
+
+    if isinstance(root, FrozenOutcome):
+        return Outcome(name=root.name, probability=root.probability, value=root.value)
+
+    def copy(node: FrozenNode) -> StrategyNode:
+        return StrategyNode(name=node.name, node_type=node.node_type, probability=node.probability)
+
+    top = copy(root)
+    stack = [(root, top)]
+    while stack:
+        source, target = stack.pop()
+        for child in source.children:
+            if isinstance(child, FrozenOutcome):
+                target.children.append(Outcome(name=child.name, probability=child.probability, value=child.value))
+            else:
+                node = copy(child)
+                target.children.append(node)
+                stack.append((child, node))
+    link_parents(top)
+    compute_ev(top)
+    return top
+
+
+# -- path copying ------------------------------------------------------------
+
+def get(root: FrozenNode, path: Sequence[int]) -> FrozenNode | FrozenOutcome:
+    node = root
+    for position in path:
+        node = node.children[position]
+    return node
+
+
+def _ancestors(root: FrozenNode, path: Sequence[int]) -> List[FrozenNode]:
+    nodes = [root]
+    for position in path[:-1]:
+        nodes.append(nodes[-1].children[position])
+    return nodes
+
+
+def replace(root: FrozenNode, path: Sequence[int], new: FrozenNode | FrozenOutcome) -> FrozenNode | FrozenOutcome:
+    """A new root with the node at `path` swapped for `new`; everything else is shared."""
+    if not path:
+        return new
+    for parent, position in zip(reversed(_ancestors(root, path)), reversed(path)):
+        children = parent.children
+        new = _rebuild(parent, children[:position] + (new,) + children[position + 1:])
+    return new
+
+
+def extend(root: FrozenNode, path: Sequence[int], children: Iterable[FrozenNode | FrozenOutcome]) -> FrozenNode:
+    """A new root with `children` appended to the node at `path`."""
+    parent = get(root, path)
+    return replace(root, path, _rebuild(parent, parent.children + tuple(children)))
+
+
+def append(root: FrozenNode, path: Sequence[int], child: FrozenNode | FrozenOutcome) -> FrozenNode:
+    """A new root with `child` appended to the node at `path`."""
+    return extend(root, path, (child,))
+
+
+def diff(a: FrozenNode | FrozenOutcome, b: FrozenNode | FrozenOutcome) -> List[Path]:
+    """
+    Paths where two versions of a tree differ, at the shallowest level.
+    Shared subtrees are skipped without being visited, so comparing two
+    versions costs time proportional to what changed between them.
+    """
+    changed = []
+    stack = [(a, b, ())]
+    while stack:
+        x, y, path = stack.pop()
+        if x is y:
+            continue
+        if isinstance(x, FrozenOutcome) and isinstance(y, FrozenOutcome):
+            if (x.name, x.probability, x.value) != (y.name, y.probability, y.value):
+                changed.append(path)
+            continue
+        if (
+            isinstance(x, FrozenNode) and isinstance(y, FrozenNode)
+            and (x.name, x.node_type, x.probability) == (y.name, y.node_type, y.probability)
+        ):
+            common = min(len(x.children), len(y.children))
+            changed.extend(path + (i,) for i in range(common, max(len(x.children), len(y.children))))
+            stack.extend((x.children[i], y.children[i], path + (i,)) for i in range(common - 1, -1, -1))
+        else:
+            changed.append(path)
+    return changed
+
+
+# -- syncing a working tree ----------------------------------------------------
+
+def patch(index, before: FrozenNode, after: FrozenNode) -> List[Path]:
+    """
+    Edits the mutable tree behind `index` (a TreeIndex), which matches version
+    `before`, into version `after` and returns the changed paths. Only the
+    subtrees that differ are thawed; shared ones are never visited, and every
+    change flags its ancestors, so refresh_ev then recomputes just those paths.
+    Raises ValueError if the roots themselves differ.
+    """
+    changed = diff(before, after)
+    if () in changed:
+        raise ValueError("The versions have different roots")
+    for path in changed:
+        target = get(after, path[:-1])
+        live = index.root
+        for position in path[:-1]:
+            live = live.children[position]
+        position = path[-1]
+        if position >= len(target.children):
+            index.truncate(live, len(target.children))
+        elif position < len(live.children):
+            index.replace(live.children[position], thaw(target.children[position]))
+        else:
+            index.attach(live, thaw(target.children[position]))
+    return changed
+
+
+# -- history -----------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """
+    A version of the tree, with the path of the node that was being edited
+    and any caller state (`meta`) that has to come back with it.
+    """
+    root: FrozenNode
+    focus: Path = ()
+    label: str = ""
+    meta: Optional[Mapping[str, Any]] = None
+
+
+class History:
+    """
+    Linear undo/redo over tree versions. Committing after an undo discards
+    the redo branch; versions worth keeping can be tagged by name first.
+    """
+
+    def __init__(self, root: FrozenNode, max_versions: Optional[int] = None, meta: Optional[Mapping[str, Any]] = None):
+        self.max_versions = max_versions
+        self._done: List[Snapshot] = [Snapshot(root, meta=meta)]
+        self._undone: List[Snapshot] = []
+        self._tags: Dict[str, Snapshot] = {}
+
+    def __len__(self) -> int:
+        return len(self._done) + len(self._undone)
+
+    @property
+    def current(self) -> Snapshot:
+        return self._done[-1]
+
+    @property
+    def can_undo(self) -> bool:
+        return len(self._done) > 1
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._undone)
+
+    def commit(
+        self, root: FrozenNode, focus: Sequence[int] = (), label: str = "", meta: Optional[Mapping[str, Any]] = None
+    ) -> Snapshot:
+        snapshot = Snapshot(root, tuple(focus), label, meta)
+        self._done.append(snapshot)
+        self._undone.clear()
+        if self.max_versions is not None and len(self._done) > self.max_versions:
+            del self._done[0]
+        return snapshot
+
+    def undo(self) -> Optional[Snapshot]:
+        """Steps back one version and returns it (None if there is nothing to undo)."""
+        if not self.can_undo:
+            return None
+        self._undone.append(self._done.pop())
+        return self.current
+
+    def redo(self) -> Optional[Snapshot]:
+        if not self._undone:
+            return None
+        self._done.append(self._undone.pop())
+        return self.current
+
+    def tag(self, name: str) -> Snapshot:
+        """Remembers the current version under `name`, e.g. for scenario comparisons."""
+        self._tags[name] = self.current
+        return self.current
+
+    def tagged(self, name: str) -> Snapshot:
+        return self._tags[name]
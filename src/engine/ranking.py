@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from src.engine.models import StrategyNode, Outcome
+
+
+def weighted_ev(child: StrategyNode | Outcome) -> Optional[float]:
+    """probability * payoff (or EV); None for nodes that have not been evaluated yet."""
+    if isinstance(child, Outcome):
+        return child.probability * child.value
+    if child.expected_value is None:
+        return None
+    return child.probability * child.expected_value
+
+
+class RankingIndex:
+    """
+    Children of one node ordered by weighted EV, best first, ties in child order.
+
+    A binary heap with lazy invalidation: changing a child's EV pushes a new
+    entry and leaves the old one to be discarded when it surfaces, so updates
+    are O(log n) and top(k) is O(k log n). The heap is compacted once stale
+    entries outnumber live ones.
+    """
+
+    def __init__(self, children: List[StrategyNode | Outcome] = ()):
+        self._heap: List[Tuple[float, int, object]] = []
+        # id(child) -> (child, heap key or None while unevaluated, tie-break position)
+        self._entries: Dict[int, Tuple[object, Optional[float], int]] = {}
+        self._stale = 0
+        self._next_position = len(children)
+        self.n_children = len(children)
+        for position, child in enumerate(children):
+            ev = weighted_ev(child)
+            key = None if ev is None else -ev
+            self._entries[id(child)] = (child, key, position)
+            if key is not None:
+                self._heap.append((key, position, child))
+        heapq.heapify(self._heap)
+
+    def add(self, child: StrategyNode | Outcome) -> None:
+        """Registers a new last child."""
+        position = self._next_position
+        self._next_position += 1
+        self.n_children += 1
+        self._set(child, position)
+
+    def replace(self, old: StrategyNode | Outcome, new: StrategyNode | Outcome) -> None:
+        """Puts `new` in the place (and tie order) of `old`."""
+        entry = self._entries.pop(id(old), None)
+        if entry is None:
+            position = self._next_position
+            self._next_position += 1
+        else:
+            position = entry[2]
+            self._stale += entry[1] is not None
+        self._set(new, position)
+
+    def remove(self, child: StrategyNode | Outcome) -> None:
+        """Forgets a child; removing the last one frees its tie-break position."""
+        entry = self._entries.pop(id(child), None)
+        if entry is None:
+            return
+        self.n_children -= 1
+        self._stale += entry[1] is not None
+        if entry[2] == self._next_position - 1:
+            self._next_position -= 1
+
+    def update(self, child: StrategyNode | Outcome) -> None:
+        """Re-keys a child whose EV or probability changed."""
+        entry = self._entries.get(id(child))
+        if entry is not None and entry[0] is child:
+            position = entry[2]
+        else:
+            position = self._next_position
+            self._next_position += 1
+        self._set(child, position)
+
+    def top(self, k: int) -> List[StrategyNode | Outcome]:
+        """The k best children by weighted EV, without disturbing the index."""
+        result, popped = [], []
+        heap = self._heap
+        while heap and len(result) < k:
+            item = heapq.heappop(heap)
+            key, position, child = item
+            entry = self._entries.get(id(child))
+            if entry is None or entry[0] is not child or entry[1] != key or entry[2] != position:
+                self._stale -= 1
+                continue
+            popped.append(item)
+            result.append(child)
+        for item in popped:
+            heapq.heappush(heap, item)
+        return result
+
+    def matches(self, children: List[StrategyNode | Outcome]) -> bool:
+        """
+        True if the index holds exactly `children`, each in its own slot and
+        keyed by its current weighted EV. O(n); refresh_ev runs it on nodes it
+        recomputes anyway, to catch children swapped or edited in place.
+        """
+        if self.n_children != len(children):
+            return False
+        entries = self._entries
+        for position, child in enumerate(children):
+            entry = entries.get(id(child))
+            if entry is None or entry[0] is not child or entry[2] != position:
+                return False
+            ev = weighted_ev(child)
+            if entry[1] != (None if ev is None else -ev):
+                return False
+        return True
+
+    def _set(self, child: StrategyNode | Outcome, position: int) -> None:
+        ev = weighted_ev(child)
+        key = None if ev is None else -ev
+        previous = self._entries.get(id(child))
+        if previous is not None:
+            if previous[0] is child and previous[1] == key and previous[2] == position:
+                return
+            self._stale += previous[1] is not None
+        self._entries[id(child)] = (child, key, position)
+        if key is None:
+            return
+        heapq.heappush(self._heap, (key, position, child))
+        if self._stale > len(self._entries) + 64:
+            self._heap = [(k, p, c) for c, k, p in self._entries.values() if k is not None]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+
+def ranking_of(node: StrategyNode) -> RankingIndex:
+    """
+    The node's ranking index, built on first use. compute_ev drops it, and so
+    does refresh_ev when the children no longer match it (e.g. a child
+    replaced in place and the node marked dirty); it is also rebuilt if the
+    number of children changed.
+    """
+    index = node._ranking
+    if index is None or index.n_children != len(node.children):
+        index = RankingIndex(node.children)
+        node._ranking = index
+    return index
+
+
+def top_children(node: StrategyNode, k: int) -> List[StrategyNode | Outcome]:
+    """The k evaluated children with the highest weighted EV (ties in child order)."""
+    return ranking_of(node).top(k)
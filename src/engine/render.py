@@ -0,0 +1,225 @@
+"""
+Streaming text rendering of strategy trees.
+
+render_tree writes one line per node, depth first, to any text stream. Lines
+are buffered in small chunks, so the first lines appear at once and memory
+stays bounded by the tree depth and `top_k`, not by the output size. Views of
+huge trees can be cut down three ways:
+
+- max_depth: stop below this depth, noting how many children were not drawn;
+- top_k: draw only the k children with the highest weighted EV, best first;
+- min_probability: fold chance branches less likely than this into one line.
+
+Nodes that have not been evaluated show "n/a" instead of a made-up value. A
+CompiledTree is rendered straight from its arrays: node objects are created
+only for the nodes being drawn, never for the whole tree.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import sys
+from typing import IO, Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.core import CoreNode, CoreOutcome, OUTCOME_TYPES
+from src.engine.compiler import CompiledTree, OUTCOME, DECISION
+
+_WRITE_BUFFER = 1 << 16
+
+
+class _CompiledNode:
+    """A strategy node of a CompiledTree, read from its arrays when it is drawn."""
+    __slots__ = ("tree", "ev", "index", "name", "node_type", "probability", "expected_value", "n_children")
+
+    def __init__(self, tree: CompiledTree, ev: Optional[np.ndarray], index: int):
+        self.tree = tree
+        self.ev = ev
+        self.index = index
+        self.name = tree.names[index] if tree.names is not None else ""
+        self.node_type = "decision" if tree.node_type[index] == DECISION else "chance"
+        self.probability = float(tree.probability[index])
+        self.n_children = int(tree.n_children[index])
+        self.expected_value = float(ev[index]) if ev is not None and self.n_children else None
+
+    def iter_children(self) -> Iterator:
+        """The children in order, each created only when it is reached."""
+        start = int(self.tree.first_child[self.index])
+        for i in range(start, start + self.n_children):
+            yield _compiled_node(self.tree, self.ev, i)
+
+
+def _compiled_node(tree: CompiledTree, ev: Optional[np.ndarray], index: int):
+    if tree.node_type[index] == OUTCOME:
+        name = tree.names[index] if tree.names is not None else ""
+        return CoreOutcome(name, float(tree.probability[index]), float(tree.payoff[index]))
+    return _CompiledNode(tree, ev, index)
+
+
+def _n_children(node) -> int:
+    if isinstance(node, OUTCOME_TYPES):
+        return 0
+    return node.n_children if isinstance(node, _CompiledNode) else len(node.children)
+
+
+def _children(node) -> Iterator:
+    return node.iter_children() if isinstance(node, _CompiledNode) else iter(node.children)
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:.2f}"
+
+
+def _payoff(node) -> Optional[float]:
+    return node.value if isinstance(node, OUTCOME_TYPES) else node.expected_value
+
+
+def _weighted(node) -> Optional[float]:
+    payoff = _payoff(node)
+    return None if payoff is None else node.probability * payoff
+
+
+def _rank_key(node) -> float:
+    weighted = _weighted(node)
+    return -math.inf if weighted is None else weighted
+
+
+def describe(node, depth_limited: bool = False) -> str:
+    """One node as a line of text (without the tree connector)."""
+    # Runs once per drawn line, so the node is inspected once here rather
+    # than through _payoff/_weighted/_fmt
+    if isinstance(node, OUTCOME_TYPES):
+        payoff, kind, hidden = node.value, "", 0
+    else:
+        payoff, kind = node.expected_value, f" [{node.node_type}]"
+        hidden = _n_children(node) if depth_limited else 0
+    probability = node.probability
+    if payoff is None:
+        text = f"(P={probability:.2f}, Payoff=n/a) -> {node.name}{kind} | EV: n/a"
+    else:
+        text = f"(P={probability:.2f}, Payoff={payoff:.2f}) -> {node.name}{kind} | EV: {probability * payoff:.2f}"
+    if hidden:
+        text += f" [+{hidden} not shown]"
+    return text
+
+
+def _entries(node, top_k: Optional[int], min_probability: float) -> Iterator[Tuple[object, bool]]:
+    """
+    Yields (child or summary text, is_last) for the children to draw. With
+    top_k or min_probability, a first pass over the children picks those to
+    show and a second measures what is left out. Children are walked lazily
+    and matched by position, so at most top_k of them are held at a time.
+    """
+    decision = node.node_type == "decision"
+    collapse = min_probability > 0 and not decision
+
+    def kept(child) -> bool:
+        return not collapse or child.probability >= min_probability
+
+    if top_k is None and not collapse:
+        last = _n_children(node) - 1
+        for i, child in enumerate(_children(node)):
+            yield child, i == last
+        return
+
+    if top_k is not None:
+        candidates = ((i, child) for i, child in enumerate(_children(node)) if kept(child))
+        ranked = heapq.nlargest(top_k, candidates, key=lambda entry: _rank_key(entry[1]))
+        shown = [child for _, child in ranked]
+        shown_at = {i for i, _ in ranked}
+    else:
+        shown = None
+        shown_at = None
+
+    n_shown = n_low = n_ranked = 0
+    hidden_probability = 0.0
+    hidden_ev: Optional[float] = None
+    for i, child in enumerate(_children(node)):
+        if not kept(child):
+            n_low += 1
+        elif shown_at is not None and i not in shown_at:
+            n_ranked += 1
+        else:
+            n_shown += 1
+            continue
+        hidden_probability += child.probability
+        weighted = _weighted(child)
+        if weighted is not None:
+            if decision:
+                hidden_ev = weighted if hidden_ev is None else max(hidden_ev, weighted)
+            else:
+                hidden_ev = weighted if hidden_ev is None else hidden_ev + weighted
+
+    summary = None
+    if n_low or n_ranked:
+        parts = []
+        if n_low:
+            parts.append(f"{n_low} below P={min_probability:g}")
+        if n_ranked:
+            parts.append(f"{n_ranked} lower-ranked")
+        if decision:
+            detail = f"best EV {_fmt(hidden_ev)}"
+        else:
+            detail = f"P={hidden_probability:.2f}, EV contribution {_fmt(hidden_ev)}"
+        summary = f"… {' and '.join(parts)} hidden ({detail})"
+
+    visible = shown if shown is not None else (child for child in _children(node) if kept(child))
+    for i, child in enumerate(visible):
+        yield child, summary is None and i == n_shown - 1
+    if summary is not None:
+        yield summary, True
+
+
+def render_tree(
+    root: StrategyNode | Outcome | CoreNode | CompiledTree,
+    stream: Optional[IO[str]] = None,
+    max_depth: Optional[int] = None,
+    top_k: Optional[int] = None,
+    min_probability: float = 0.0,
+    expected_values: Optional[np.ndarray] = None,
+) -> int:
+    """
+    Writes the tree under `root` to `stream` (stdout by default) and returns
+    the number of lines written. The root is depth 0. For a CompiledTree,
+    `expected_values` holds the solved EV per node (e.g. from
+    backward_induction); without it, strategy nodes show "n/a".
+    """
+    stream = stream if stream is not None else sys.stdout
+    if isinstance(root, CompiledTree):
+        root = _compiled_node(root, expected_values, 0)
+    buffer = [f"Scenario: {root.name} | EV: {_fmt(_payoff(root))}\n"]
+    stream.write(buffer.pop())
+    lines = 1
+    pending = 0
+
+    stack = []
+    if (max_depth is None or max_depth > 0) and _n_children(root):
+        stack.append((_entries(root, top_k, min_probability), ""))
+    while stack:
+        entries, prefix = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+        item, last = entry
+        connector = "└── " if last else "├── "
+        if isinstance(item, str):
+            text = f"{prefix}{connector}{item}\n"
+        else:
+            depth = len(stack)
+            expand = (max_depth is None or depth < max_depth) and _n_children(item) > 0
+            text = f"{prefix}{connector}{describe(item, depth_limited=not expand)}\n"
+            if expand:
+                stack.append((_entries(item, top_k, min_probability), prefix + ("    " if last else "│   ")))
+        buffer.append(text)
+        pending += len(text)
+        lines += 1
+        if pending >= _WRITE_BUFFER:
+            stream.write("".join(buffer))
+            buffer.clear()
+            pending = 0
+    if buffer:
+        stream.write("".join(buffer))
+    return lines
@@ -0,0 +1,320 @@
+"""
+Branch-and-bound evaluation of trees too large to build before solving.
+
+A LazyNode produces its children on demand from a callback (a generator
+function works) and may declare bounds on its own expected value. The solver
+walks the tree depth-first with an explicit stack and expands a subtree only
+when its bounds say it can still change the answer:
+
+- A decision node visits children in order of decreasing upper bound and
+  skips every child whose upper bound cannot beat the best child found so far
+  or the lower bound of a sibling.
+- A chance node stops once the children evaluated so far plus the upper
+  bounds of the rest cannot reach what its decision ancestor already has
+  (Star1 pruning for expectimax trees). Its value is then only an upper bound,
+  which the ancestor discards.
+
+Only subtrees that provably cannot change the root EV or a chosen child are
+skipped, so the result matches exhaustive evaluation. Outcomes are their own
+exact bounds; StrategyNode, CoreNode and LazyNode without declared bounds are
+unbounded and always expanded.
+"""
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from src.engine import instrumentation
+from src.engine.core import CoreNode, CoreOutcome, OUTCOME_TYPES
+
+INF = math.inf
+
+
+class LazyNode:
+    """
+    A strategy node whose children are generated when the solver reaches it.
+
+    Attributes:
+        name: Node name.
+        expand: Callable returning the children (Outcomes, CoreOutcomes,
+            StrategyNodes, CoreNodes or further LazyNodes). It is called each
+            time the node is expanded, so it should be deterministic.
+        node_type: "chance" or "decision".
+        probability: Branch probability, as on StrategyNode.
+        lower, upper: Bounds on the node's expected value.
+        expected_value: Set by the solver when the node was solved exactly.
+    """
+    __slots__ = ("name", "expand", "node_type", "probability", "lower", "upper", "expected_value")
+
+    def __init__(
+        self,
+        name: str,
+        expand: Callable[[], Iterable],
+        node_type: str = "chance",
+        probability: float = 1.0,
+        lower: float = -INF,
+        upper: float = INF,
+    ):
+        if lower > upper:
+            raise ValueError(f"LazyNode '{name}' has lower bound {lower} above upper bound {upper}")
+        self.name = name
+        self.expand = expand
+        self.node_type = node_type
+        self.probability = probability
+        self.lower = lower
+        self.upper = upper
+        self.expected_value: Optional[float] = None
+
+    @property
+    def children(self) -> list:
+        return list(self.expand())
+
+    def __repr__(self) -> str:
+        return f"LazyNode(name={self.name!r}, node_type={self.node_type!r}, bounds=[{self.lower}, {self.upper}])"
+
+
+@dataclass
+class SearchResult:
+    """
+    Outcome of a branch-and-bound solve.
+
+    Attributes:
+        value: Expected value of the root.
+        choice: Best child of the root when it is a decision node, else None.
+        expanded: Strategy nodes whose children were generated.
+        leaves: Outcomes evaluated.
+        pruned: Child subtrees skipped without being expanded.
+    """
+    value: float
+    choice: object = None
+    expanded: int = 0
+    leaves: int = 0
+    pruned: int = 0
+
+    def summary(self) -> str:
+        return f"EV {self.value:.4f}: {self.expanded} nodes expanded, {self.leaves} outcomes, {self.pruned} subtrees pruned"
+
+
+def bounds_of(node) -> Tuple[float, float]:
+    if isinstance(node, OUTCOME_TYPES):
+        return node.value, node.value
+    if isinstance(node, LazyNode):
+        return node.lower, node.upper
+    return -INF, INF
+
+
+def _slack(magnitude: float) -> float:
+    # Keeps pruning decisions on the safe side of rounding in the bound arithmetic
+    return 1e-9 * max(1.0, magnitude)
+
+
+class _Decision:
+    __slots__ = ("node", "children", "bounds", "alpha", "order", "cursor", "floor",
+                 "best", "best_index", "ceiling", "pending", "stats")
+
+    def __init__(self, node, children: list, alpha: float, stats: SearchResult):
+        self.node = node
+        self.children = children
+        self.bounds = [bounds_of(child) for child in children]
+        self.alpha = alpha
+        self.order = sorted(range(len(children)), key=lambda i: (-self.bounds[i][1], i))
+        self.cursor = 0
+        self.floor = max((lo for lo, _ in self.bounds), default=-INF)
+        self.best = -INF
+        self.best_index = -1
+        # Upper bound over children that were skipped or failed low
+        self.ceiling = -INF
+        self.pending = (-1, -INF)
+        self.stats = stats
+
+    def _threshold(self, i: int) -> float:
+        # A child must exceed this to matter; earlier children win ties, as in best_children
+        best = self.best
+        if self.best_index >= 0 and i < self.best_index:
+            best = math.nextafter(best, -INF)
+        return max(self.alpha, best)
+
+    def next_child(self):
+        while self.cursor < len(self.order):
+            i = self.order[self.cursor]
+            self.cursor += 1
+            child = self.children[i]
+            hi = self.bounds[i][1]
+            threshold = self._threshold(i)
+            if hi <= threshold or hi < self.floor:
+                self.ceiling = max(self.ceiling, hi)
+                self.stats.pruned += 1
+                continue
+            if isinstance(child, OUTCOME_TYPES):
+                self.stats.leaves += 1
+                self._take(i, child.value, True, threshold)
+                continue
+            self.pending = (i, threshold)
+            return child, threshold
+        return None
+
+    def receive(self, value: float, exact: bool) -> None:
+        i, threshold = self.pending
+        self._take(i, value, exact, threshold)
+
+    def _take(self, i: int, value: float, exact: bool, threshold: float) -> None:
+        if exact and value > threshold:
+            self.best, self.best_index = value, i
+        else:
+            self.ceiling = max(self.ceiling, value)
+
+    def result(self) -> Tuple[float, bool]:
+        if not self.children:
+            return 0.0, True
+        if self.best_index >= 0:
+            return self.best, True
+        return self.ceiling, False
+
+    @property
+    def choice(self):
+        return self.children[self.best_index] if self.best_index >= 0 else None
+
+
+class _Chance:
+    __slots__ = ("node", "children", "alpha", "rest", "cursor", "total", "bound", "pending", "stats")
+
+    def __init__(self, node, children: list, alpha: float, stats: SearchResult):
+        self.node = node
+        self.children = children
+        self.alpha = alpha
+        # rest[i]: sum of probability * upper bound over the children after i
+        rest = [0.0] * len(children)
+        acc = 0.0
+        for i in range(len(children) - 1, 0, -1):
+            child = children[i]
+            if child.probability:
+                acc += child.probability * bounds_of(child)[1]
+            rest[i - 1] = acc
+        self.rest = rest
+        self.cursor = 0
+        self.total = 0.0
+        self.bound: Optional[float] = None
+        self.pending = 0.0
+        self.stats = stats
+
+    def _cut(self, i: int) -> None:
+        partial = self.total + self.rest[i]
+        if partial <= self.alpha - _slack(abs(self.alpha) + abs(self.total) + abs(self.rest[i])):
+            self._stop(partial)
+
+    def _stop(self, bound: float) -> None:
+        self.bound = bound
+        # Children after the cut are never looked at
+        self.stats.pruned += sum(1 for child in self.children[self.cursor:] if not isinstance(child, OUTCOME_TYPES))
+
+    def next_child(self):
+        while self.bound is None and self.cursor < len(self.children):
+            i = self.cursor
+            self.cursor += 1
+            child = self.children[i]
+            p = child.probability
+            if isinstance(child, OUTCOME_TYPES):
+                self.stats.leaves += 1
+                self.total += p * child.value
+            elif not p:
+                self.stats.pruned += 1
+                continue
+            else:
+                alpha = -INF
+                if self.alpha > -INF and self.rest[i] < INF:
+                    slack = _slack(abs(self.alpha) + abs(self.total) + abs(self.rest[i]))
+                    alpha = (self.alpha - slack - self.total - self.rest[i]) / p
+                self.pending = p
+                return child, alpha
+            self._cut(i)
+        return None
+
+    def receive(self, value: float, exact: bool) -> None:
+        p = self.pending
+        i = self.cursor - 1
+        if exact:
+            self.total += p * value
+            self._cut(i)
+        else:
+            self._stop(self.total + p * value + self.rest[i])
+
+    def result(self) -> Tuple[float, bool]:
+        if self.bound is not None:
+            return self.bound, False
+        return self.total, True
+
+    choice = None
+
+
+def _open(node, alpha: float, stats: SearchResult):
+    stats.expanded += 1
+    children = node.children
+    frame = _Decision if node.node_type == "decision" else _Chance
+    return frame(node, children, alpha, stats)
+
+
+def branch_and_bound(root) -> SearchResult:
+    """
+    Solves a tree of LazyNodes (mixed freely with eager nodes and outcomes)
+    depth-first with an explicit stack, expanding only what the bounds require.
+    """
+    if isinstance(root, OUTCOME_TYPES):
+        return SearchResult(value=root.value, leaves=1)
+
+    profiling = instrumentation.is_enabled()
+    if profiling:
+        start = time.perf_counter()
+
+    stats = SearchResult(value=0.0)
+    root_frame = _open(root, -INF, stats)
+    stack = [root_frame]
+    result: Optional[Tuple[float, bool]] = None
+    while stack:
+        frame = stack[-1]
+        if result is not None:
+            frame.receive(*result)
+            result = None
+        step = frame.next_child()
+        if step is None:
+            stack.pop()
+            result = frame.result()
+            if result[1] and isinstance(frame.node, LazyNode):
+                frame.node.expected_value = result[0]
+            continue
+        child, alpha = step
+        stack.append(_open(child, alpha, stats))
+
+    # The root has no ancestor to cut against, so its value is always exact
+    stats.value = result[0]
+    stats.choice = root_frame.choice
+
+    if profiling:
+        instrumentation.record_span("branch_and_bound", start, time.perf_counter(),
+                                    {"expanded": stats.expanded, "pruned": stats.pruned})
+        instrumentation.count("branch_and_bound.expanded", stats.expanded)
+        instrumentation.count("branch_and_bound.pruned", stats.pruned)
+    return stats
+
+
+def materialize(root) -> CoreNode | CoreOutcome:
+    """Expands every LazyNode into a full CoreNode tree, for exhaustive evaluation."""
+    if isinstance(root, OUTCOME_TYPES):
+        return CoreOutcome(root.name, root.probability, root.value)
+
+    def copy(node) -> CoreNode:
+        return CoreNode(node.name, node.node_type, None, None, node.probability)
+
+    top = copy(root)
+    stack: List[Tuple[object, CoreNode]] = [(root, top)]
+    while stack:
+        source, target = stack.pop()
+        for child in source.children:
+            if isinstance(child, OUTCOME_TYPES):
+                target.children.append(CoreOutcome(child.name, child.probability, child.value))
+            else:
+                node = copy(child)
+                target.children.append(node)
+                stack.append((child, node))
+    return top
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.compiler import (
+    CompiledTree, compile_tree, backward_induction, best_children, runner_up_ev, propagate_down, propagate_label,
+    OUTCOME, DECISION,
+)
+
+
+@dataclass
+class ParameterSensitivity:
+    """
+    Sensitivity of the root EV to one Outcome.value or branch probability.
+
+    Attributes:
+        node: Index of the node in the compiled tree.
+        path: Slash-separated names from the root to the node.
+        kind: "value" or "probability".
+        base: Current parameter value.
+        gradient: d(root EV) / d(parameter).
+        decision: Path of the nearest decision node above, if any.
+        break_even: Parameter value at which that decision switches branch,
+            or None if no change of this parameter alone can flip it.
+    """
+    node: int
+    path: str
+    kind: str
+    base: float
+    gradient: float
+    decision: Optional[str]
+    break_even: Optional[float]
+
+
+@dataclass
+class TornadoBar:
+    path: str
+    kind: str
+    low: float
+    high: float
+
+    @property
+    def spread(self) -> float:
+        return abs(self.high - self.low)
+
+
+@dataclass
+class SensitivityReport:
+    """
+    Gradients and break-even points for every parameter, from one reverse sweep.
+
+    EV is piecewise linear in payoffs and multilinear in probabilities, so the
+    gradients are exact while no decision node changes its chosen branch; the
+    break-even values mark where that stops holding.
+    """
+    tree: CompiledTree
+    ev: np.ndarray
+    value_gradient: np.ndarray
+    probability_gradient: np.ndarray
+    value_break_even: np.ndarray
+    probability_break_even: np.ndarray
+    decision_node: np.ndarray
+
+    @property
+    def root_ev(self) -> float:
+        return float(self.ev[0])
+
+    def path(self, node: int) -> str:
+        return node_path(self.tree, node)
+
+    def parameters(self) -> Iterator[ParameterSensitivity]:
+        """Yields every payoff, then every probability that affects the root EV."""
+        tree = self.tree
+        for kind, nodes, base, gradient, break_even in (
+            ("value", np.flatnonzero(tree.node_type == OUTCOME), tree.payoff, self.value_gradient, self.value_break_even),
+            ("probability", _probability_nodes(tree), tree.probability, self.probability_gradient, self.probability_break_even),
+        ):
+            for i in nodes.tolist():
+                decision = int(self.decision_node[i])
+                threshold = break_even[i]
+                yield ParameterSensitivity(
+                    node=i,
+                    path=self.path(i),
+                    kind=kind,
+                    base=float(base[i]),
+                    gradient=float(gradient[i]),
+                    decision=self.path(decision) if decision >= 0 else None,
+                    break_even=None if np.isnan(threshold) else float(threshold),
+                )
+
+    def tornado(self, swing: float = 0.10, probability_swing: float = 0.05, top: Optional[int] = 10) -> List[TornadoBar]:
+        """
+        Ranks parameters by the root EV range they produce when payoffs move by
+        +/-`swing` (relative) and probabilities by +/-`probability_swing`
+        (absolute, kept within [0, 1]), using the linearization.
+        """
+        tree = self.tree
+        values = np.flatnonzero(tree.node_type == OUTCOME)
+        probs = _probability_nodes(tree)
+        nodes = np.concatenate([values, probs])
+        gradient = np.concatenate([self.value_gradient[values], self.probability_gradient[probs]])
+        p = tree.probability[probs]
+        down = np.concatenate([np.abs(tree.payoff[values]) * swing, np.minimum(probability_swing, p)])
+        up = np.concatenate([np.abs(tree.payoff[values]) * swing, np.minimum(probability_swing, 1.0 - p)])
+        low = self.root_ev - gradient * down
+        high = self.root_ev + gradient * up
+        order = np.argsort(-np.abs(high - low), kind="stable")
+        if top is not None:
+            order = order[:top]
+        return [
+            TornadoBar(
+                path=self.path(int(nodes[k])),
+                kind="value" if k < len(values) else "probability",
+                low=float(min(low[k], high[k])),
+                high=float(max(low[k], high[k])),
+            )
+            for k in order.tolist()
+        ]
+
+
+def node_path(tree: CompiledTree, node: int) -> str:
+    """Slash-separated names from the root to a compiled node."""
+    names = []
+    while node >= 0:
+        names.append(tree.names[node])
+        node = int(tree.parent[node])
+    return "/".join(reversed(names))
+
+
+def _probability_nodes(tree: CompiledTree) -> np.ndarray:
+    """Nodes whose probability enters the EV: children of chance nodes."""
+    nodes = np.arange(1, tree.size)
+    return nodes[tree.node_type[tree.parent[1:]] != DECISION]
+
+
+def sensitivity_analysis(tree: CompiledTree | StrategyNode | Outcome) -> SensitivityReport:
+    """Computes d(root EV)/d(parameter) and break-even values for all parameters in one top-down sweep."""
+    if not isinstance(tree, CompiledTree):
+        tree = compile_tree(tree)
+    ev = backward_induction(tree)
+    best = best_children(tree, ev)
+    n = tree.size
+    parent = tree.parent
+
+    # adjoint: d(root EV)/d(node EV). local: d(EV of the branch leaving the
+    # nearest decision node)/d(node EV). branch: that branch's node index.
+    from_decision = tree.node_type[np.maximum(parent, 0)] == DECISION
+    from_decision[0] = False
+    factor = np.where(from_decision, best[np.maximum(parent, 0)] == np.arange(n), tree.probability)
+    adjoint = propagate_down(tree, factor)
+    local = propagate_down(tree, tree.probability, reset=from_decision)
+    branch = propagate_label(tree, from_decision)
+
+    probability_gradient = np.zeros(n)
+    local_probability_gradient = np.zeros(n)
+    chance_children = _probability_nodes(tree)
+    cp = parent[chance_children]
+    probability_gradient[chance_children] = adjoint[cp] * ev[chance_children]
+    local_probability_gradient[chance_children] = local[cp] * ev[chance_children]
+
+    is_leaf = tree.node_type == OUTCOME
+    value_gradient = np.where(is_leaf, adjoint, 0.0)
+    local_value_gradient = np.where(is_leaf, local, 0.0)
+
+    # Break-even: the branch EV must reach the runner-up (if it is the chosen
+    # branch) or the chosen branch's EV (otherwise).
+    decision_node = np.where(branch >= 0, parent[np.maximum(branch, 0)], -1)
+    decision_node[0] = -1
+    runner_up = runner_up_ev(tree, ev, best)
+    has_decision = decision_node >= 0
+    d = np.maximum(decision_node, 0)
+    target = np.where(best[d] == branch, runner_up[d], ev[np.maximum(best[d], 0)])
+    gap = np.where(has_decision, target - ev[np.maximum(branch, 0)], np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value_break_even = np.where(is_leaf & (local_value_gradient != 0), tree.payoff + gap / local_value_gradient, np.nan)
+        probability_break_even = np.where(
+            local_probability_gradient != 0, tree.probability + gap / local_probability_gradient, np.nan
+        )
+    probability_break_even[(probability_break_even < 0) | (probability_break_even > 1)] = np.nan
+    value_break_even[~np.isfinite(value_break_even)] = np.nan
+    probability_break_even[~np.isfinite(probability_break_even)] = np.nan
+
+    return SensitivityReport(
+        tree=tree,
+        ev=ev,
+        value_gradient=value_gradient,
+        probability_gradient=probability_gradient,
+        value_break_even=value_break_even,
+        probability_break_even=probability_break_even,
+        decision_node=decision_node,
+    )
+
+
+def format_tornado(bars: List[TornadoBar], base: float, width: int = 30) -> str:
+    """Renders a text tornado diagram around the base root EV."""
+    if not bars:
+        return "No parameters affect the expected value."
+    reach = max(max(abs(bar.low - base), abs(bar.high - base)) for bar in bars) or 1.0
+    label_width = max(len(f"{bar.path} ({bar.kind})") for bar in bars)
+    lines = [f"Tornado: base EV {base:.2f}"]
+    for bar in bars:
+        left = round(width * (base - bar.low) / reach)
+        right = round(width * (bar.high - base) / reach)
+        label = f"{bar.path} ({bar.kind})".ljust(label_width)
+        lines.append(f"  {label} {' ' * (width - left)}{'█' * left}|{'█' * right}{' ' * (width - right)} [{bar.low:.2f}, {bar.high:.2f}]")
+    return "\n".join(lines)
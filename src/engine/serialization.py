@@ -0,0 +1,532 @@
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import re
+import struct
+from typing import IO, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.core import CoreNode, CoreOutcome, OUTCOME_TYPES, check_node, check_outcome
+from src.engine.compiler import CompiledTree, compile_tree, OUTCOME, DECISION
+
+# Flush the output buffer once this many characters are pending
+_WRITE_BUFFER = 1 << 16
+_READ_CHUNK = 1 << 16
+
+
+# ---------------------------------------------------------------------------
+# Nested JSON (same shape as StrategyNode.model_dump_json)
+# ---------------------------------------------------------------------------
+
+_encode_string = json.encoder.encode_basestring  # what json.dumps(..., ensure_ascii=False) uses
+
+
+def _encode_number(x: Optional[float]) -> str:
+    if x is None:
+        return "null"
+    return repr(float(x)) if math.isfinite(x) else json.dumps(x)
+
+
+def _model_outcome(name, probability, value, **params) -> Outcome:
+    # Unset parameter references are left to their defaults rather than
+    # passed as None, which would have pydantic validate two more fields
+    return Outcome(name=name, probability=probability, value=value, **params)
+
+
+_PARAM_FIELDS = ("probability_param", "value_param")
+
+
+def _outcome_params(node) -> dict:
+    """The parameter references set on an Outcome (none for CoreOutcome)."""
+    if isinstance(node, CoreOutcome) or (node.probability_param is None and node.value_param is None):
+        return {}
+    return {key: getattr(node, key) for key in _PARAM_FIELDS if getattr(node, key) is not None}
+
+
+def _field_params(fields: dict) -> dict:
+    """The parameter references in an outcome's JSON fields or NDJSON record."""
+    if "probability_param" not in fields and "value_param" not in fields:
+        return {}
+    return {key: fields[key] for key in _PARAM_FIELDS if fields.get(key) is not None}
+
+
+def _model_node(name, node_type="chance", probability=1.0, expected_value=None) -> StrategyNode:
+    return StrategyNode(name=name, node_type=node_type, probability=probability, expected_value=expected_value)
+
+
+def _factories(core: bool):
+    """Node constructors for the readers: validated models, or checked core nodes."""
+    return (check_outcome, check_node) if core else (_model_outcome, _model_node)
+
+
+def write_json(root: StrategyNode | Outcome | CoreNode, stream: IO[str]) -> None:
+    """Writes a tree as nested JSON incrementally, without building the document in memory."""
+    buffer: List[str] = []
+    pending = 0
+    string, number = _encode_string, _encode_number
+    # Items are either literal text or a node still to be opened
+    stack: list = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            text = item
+        elif isinstance(item, OUTCOME_TYPES):
+            text = f'{{"name":{string(item.name)},"probability":{number(item.probability)},"value":{number(item.value)}'
+            for key, param in _outcome_params(item).items():
+                text += f',"{key}":{string(param)}'
+            text += "}"
+        else:
+            text = f'{{"name":{string(item.name)},"node_type":{string(item.node_type)},"children":['
+            stack.append(f'],"expected_value":{number(item.expected_value)},"probability":{number(item.probability)}}}')
+            children = item.children
+            for i in range(len(children) - 1, -1, -1):
+                stack.append(children[i])
+                if i:
+                    stack.append(",")
+        buffer.append(text)
+        pending += len(text)
+        if pending >= _WRITE_BUFFER:
+            stream.write("".join(buffer))
+            buffer.clear()
+            pending = 0
+    stream.write("".join(buffer))
+
+
+_STRING = r'"(?:[^"\\]|\\.)*"'
+_SCALAR = r'(?:' + _STRING + r'|[^{}\[\]",\s]+)'
+_PAIR = r'\s*' + _STRING + r'\s*:\s*' + _SCALAR + r'\s*'
+_TOKEN = re.compile(
+    r'\s*(?:'
+    # An object holding only scalars (e.g. an Outcome) is one token
+    r'(?P<flat>\{(?:' + _PAIR + r',?)*\s*\})'
+    # Scalars up to an array-valued key, e.g. a StrategyNode up to "children":[
+    r'|(?P<head>\{(?P<head_pairs>(?:' + _PAIR + r',)*)\s*(?P<head_key>' + _STRING + r')\s*:\s*\[)'
+    # The end of an array followed by the remaining scalars of its object
+    r'|(?P<tail>\](?P<tail_pairs>(?:\s*,' + _PAIR + r')*)\s*\})'
+    r'|(?P<punct>[{}\[\]:,])|(?P<string>' + _STRING + r')'
+    r'|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|(?P<literal>true|false|null|NaN|-?Infinity))'
+)
+_LITERALS = {"true": True, "false": False, "null": None, "NaN": float("nan"), "Infinity": float("inf"), "-Infinity": float("-inf")}
+
+
+# Tokens ending this close to the end of the buffer may continue in the next
+# chunk (e.g. "1e" + "+5"), so they are left for the next pass
+_TOKEN_MARGIN = 64
+
+
+def _iter_tokens(stream: IO[str], chunk_size: int = _READ_CHUNK) -> Iterator[Tuple[str, object]]:
+    """Tokenizes JSON from a text stream chunk by chunk."""
+    buffer = ""
+    eof = False
+    while not eof:
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+        limit = len(buffer) + 1 if eof else len(buffer) - _TOKEN_MARGIN
+        pos = 0
+        # scanner.match() only matches contiguously, so it stops at an
+        # unterminated string or anything that is not JSON
+        for match in iter(_TOKEN.scanner(buffer).match, None):
+            if match.end() >= limit:
+                break
+            pos = match.end()
+            kind = match.lastgroup
+            text = match.group(kind)
+            if kind == "punct":
+                yield text, None
+            elif kind == "flat":
+                yield "object", json.loads(text)
+            elif kind == "head":
+                pairs = match.group("head_pairs").strip().rstrip(",")
+                yield "head", (json.loads("{" + pairs + "}"), json.loads(match.group("head_key")))
+            elif kind == "tail":
+                pairs = match.group("tail_pairs").strip()[1:]
+                yield "tail", json.loads("{" + pairs + "}")
+            elif kind == "string":
+                yield "value", text[1:-1] if "\\" not in text else json.loads(text)
+            elif kind == "number":
+                yield "value", float(text) if ("." in text or "e" in text or "E" in text) else int(text)
+            else:
+                yield "value", _LITERALS[text]
+        buffer = buffer[pos:]
+
+    if buffer.strip():
+        raise ValueError(f"Invalid JSON near: {buffer[:40]!r}")
+
+
+_MODEL_TYPES = (StrategyNode, Outcome)
+_CORE_TYPES = (CoreNode, CoreOutcome)
+
+
+def node_from_fields(fields: dict, core: bool = False) -> StrategyNode | Outcome | CoreNode:
+    """
+    Validates one node from its JSON fields. `children` must already hold
+    validated nodes; they are attached without re-validating the subtree.
+    Raises ValueError on anything that is not a well-formed node.
+    """
+    make_outcome, make_node = _factories(core)
+    if not isinstance(fields, dict) or not isinstance(fields.get("name"), str):
+        raise ValueError(f"Expected a node object with a name, got {fields!r:.80}")
+    name = fields["name"]
+    children = fields.get("children")
+    if children is None and "value" in fields:
+        if "probability" not in fields:
+            raise ValueError(f"Outcome '{name}' has no probability")
+        # Core outcomes carry no parameter references
+        params = None if core else _field_params(fields)
+        if params:
+            return make_outcome(name, fields["probability"], fields["value"], **params)
+        return make_outcome(name, fields["probability"], fields["value"])
+    scalars = {k: v for k, v in fields.items() if k in ("name", "node_type", "expected_value", "probability")}
+    node = make_node(**scalars)
+    if children is not None:
+        node_types = _CORE_TYPES if core else _MODEL_TYPES
+        if not isinstance(children, list) or not all(isinstance(child, node_types) for child in children):
+            raise ValueError(f"Children of '{name}' must be a list of nodes")
+        if children:
+            node.children = children
+    return node
+
+
+def validate_tree(data: dict, core: bool = False) -> StrategyNode | Outcome | CoreNode:
+    """
+    Validates a tree given as plain dicts node by node, children before
+    parents, instead of pydantic's recursive validation of the nested model.
+    """
+    # Post-order over the dicts: each frame is (fields, validated children)
+    stack = [(data, [])]
+    result = None
+    while stack:
+        fields, built = stack[-1]
+        children = fields.get("children") if isinstance(fields, dict) else None
+        if children is not None and not isinstance(children, list):
+            raise ValueError(f"Children of {fields.get('name')!r} must be a list of nodes")
+        if children and len(built) < len(children):
+            stack.append((children[len(built)], []))
+            continue
+        stack.pop()
+        node = node_from_fields({**fields, "children": built} if children is not None else fields, core)
+        if stack:
+            stack[-1][1].append(node)
+        else:
+            result = node
+    return result
+
+
+# What read_json accepts next
+_VALUE, _VALUE_OR_CLOSE, _KEY, _KEY_OR_CLOSE, _COLON, _COMMA_OR_CLOSE, _END = range(7)
+# States in which a value, a key, "}" or "]" may come next (checked per token)
+_VALUE_STATES = frozenset((_VALUE, _VALUE_OR_CLOSE))
+_KEY_STATES = frozenset((_KEY, _KEY_OR_CLOSE))
+_OBJECT_CLOSE_STATES = frozenset((_KEY_OR_CLOSE, _COMMA_OR_CLOSE))
+_ARRAY_CLOSE_STATES = frozenset((_VALUE_OR_CLOSE, _COMMA_OR_CLOSE))
+
+
+def _unexpected(kind: str, value: object) -> ValueError:
+    token = repr(value) if kind in ("value", "object") else {"head": "{", "tail": "]"}.get(kind, kind)
+    return ValueError(f"Invalid JSON: unexpected {token:.40}")
+
+
+def read_json(stream: IO[str], chunk_size: int = _READ_CHUNK, core: bool = False) -> StrategyNode | Outcome | CoreNode:
+    """
+    Reads a nested JSON tree from a text stream using an explicit stack.
+
+    Only the open objects along the current path are held as dicts; every
+    closed object becomes a validated node straight away (a core node if
+    `core` is set). Malformed JSON and invalid nodes raise ValueError.
+    """
+    # Each frame: [container, pending key] where container is a dict or list
+    stack: list = []
+    result = None
+    expect = _VALUE
+    for kind, value in _iter_tokens(stream, chunk_size):
+        # Flat objects (outcomes) and commas are most of the tokens, so they are checked first
+        if kind == "object":
+            if expect not in _VALUE_STATES:
+                raise _unexpected(kind, value)
+            value = node_from_fields(value, core)
+        elif kind == ",":
+            if expect != _COMMA_OR_CLOSE:
+                raise _unexpected(kind, value)
+            expect = _KEY if isinstance(stack[-1][0], dict) else _VALUE
+            continue
+        elif kind == "value" and expect in _KEY_STATES:
+            if not isinstance(value, str):
+                raise _unexpected(kind, value)
+            stack[-1][1] = value
+            expect = _COLON
+            continue
+        elif kind == ":":
+            if expect != _COLON:
+                raise _unexpected(kind, value)
+            expect = _VALUE
+            continue
+        elif kind in ("{", "head", "["):
+            if expect not in _VALUE_STATES:
+                raise _unexpected(kind, value)
+            if kind == "{":
+                stack.append([{}, None])
+                expect = _KEY_OR_CLOSE
+            else:
+                if kind == "head":
+                    stack.append(list(value))
+                stack.append([[], None])
+                expect = _VALUE_OR_CLOSE
+            continue
+        elif kind == "}":
+            if expect not in _OBJECT_CLOSE_STATES or not isinstance(stack[-1][0], dict):
+                raise _unexpected(kind, value)
+            value = node_from_fields(stack.pop()[0], core)
+        elif kind in ("]", "tail"):
+            if expect not in _ARRAY_CLOSE_STATES or not isinstance(stack[-1][0], list):
+                raise _unexpected(kind, value)
+            items = stack.pop()[0]
+            if kind == "]":
+                value = items
+            else:
+                if not stack or not isinstance(stack[-1][0], dict):
+                    raise _unexpected(kind, value)
+                fields, key = stack.pop()
+                fields[key] = items
+                fields.update(value)
+                value = node_from_fields(fields, core)
+        elif expect not in _VALUE_STATES:
+            raise _unexpected(kind, value)
+
+        if not stack:
+            result = value
+            expect = _END
+            continue
+        container, key = stack[-1]
+        if isinstance(container, dict):
+            container[key] = value
+        else:
+            container.append(value)
+        expect = _COMMA_OR_CLOSE
+
+    if expect != _END:
+        raise ValueError("JSON document is empty or truncated")
+    if not isinstance(result, (StrategyNode, CoreNode) + OUTCOME_TYPES):
+        raise ValueError("JSON document does not contain a tree")
+    return result
+
+
+# ---------------------------------------------------------------------------
+# NDJSON: one node record per line, in depth-first pre-order
+# ---------------------------------------------------------------------------
+
+def write_ndjson(root: StrategyNode | Outcome | CoreNode, stream: IO[str]) -> int:
+    """
+    Writes one JSON record per node: id, parent id, name, kind, probability and
+    value (Outcomes) or expected_value (StrategyNodes). Returns the node count.
+    """
+    buffer: List[str] = []
+    next_id = 0
+    stack = [(root, -1)]
+    while stack:
+        node, parent = stack.pop()
+        record = {"id": next_id, "parent": parent, "name": node.name}
+        if isinstance(node, OUTCOME_TYPES):
+            record.update(kind="outcome", probability=node.probability, value=node.value, **_outcome_params(node))
+        else:
+            record.update(kind=node.node_type, probability=node.probability, expected_value=node.expected_value)
+            for child in reversed(node.children):
+                stack.append((child, next_id))
+        buffer.append(json.dumps(record))
+        next_id += 1
+        if len(buffer) >= 1024:
+            stream.write("\n".join(buffer) + "\n")
+            buffer.clear()
+    if buffer:
+        stream.write("\n".join(buffer) + "\n")
+    return next_id
+
+
+_NDJSON_FIELDS = ("id", "parent", "name", "kind", "probability")
+
+
+def read_ndjson(stream: IO[str], core: bool = False) -> StrategyNode | Outcome | CoreNode:
+    """
+    Rebuilds a tree from pre-order NDJSON records, one line at a time. Only
+    the ancestors of the current record are kept on the stack.
+    """
+    make_outcome, make_node = _factories(core)
+    root = None
+    stack: list = []
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+            # Missing fields surface as KeyError below, so complete records pay for no check
+            node_id, parent, kind = record["id"], record["parent"], record["kind"]
+            if kind == "outcome":
+                params = None if core else _field_params(record)
+                if params:
+                    node = make_outcome(record["name"], record["probability"], record["value"], **params)
+                else:
+                    node = make_outcome(record["name"], record["probability"], record["value"])
+            else:
+                node = make_node(record["name"], kind, record["probability"], record.get("expected_value"))
+            while stack and stack[-1][0] != parent:
+                stack.pop()
+            if stack:
+                stack[-1][1].children.append(node)
+            elif root is None:
+                root = node
+            else:
+                raise ValueError(f"record {node_id} references unknown parent {parent}")
+        except KeyError:
+            required = _NDJSON_FIELDS + (("value",) if record.get("kind") == "outcome" else ())
+            missing = ", ".join(key for key in required if key not in record)
+            raise ValueError(f"NDJSON line {number}: missing {missing}") from None
+        except ValueError as error:
+            raise ValueError(f"NDJSON line {number}: {error}") from None
+        if not isinstance(node, OUTCOME_TYPES):
+            stack.append((node_id, node))
+    if root is None:
+        raise ValueError("NDJSON stream contains no nodes")
+    return root
+
+
+# ---------------------------------------------------------------------------
+# Columnar binary format (memory-mappable CompiledTree)
+# ---------------------------------------------------------------------------
+
+_MAGIC = b"GMTREE01"
+_HEADER = struct.Struct("<8sQQQ")  # magic, nodes, level offsets, name bytes
+_INT_COLUMNS = ("parent", "first_child", "n_children")
+_FLOAT_COLUMNS = ("probability", "payoff")
+
+
+class NameTable(Sequence[str]):
+    """Node names decoded on access from a UTF-8 blob and an offsets array."""
+
+    def __init__(self, blob, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def save_compiled(tree: CompiledTree, path: str | os.PathLike) -> None:
+    """
+    Writes a CompiledTree as one file of 8-byte aligned columns:
+    header, int64 columns, float64 columns, level offsets, node types, name
+    offsets and the UTF-8 name blob.
+    """
+    names = tree.names if tree.names is not None else [""] * tree.size
+    name_offsets = np.zeros(tree.size + 1, dtype=np.int64)
+    with open(path, "wb") as out:
+        encoded_total = 0
+        encoded = []
+        for i, name in enumerate(names):
+            data = name.encode("utf-8")
+            encoded.append(data)
+            encoded_total += len(data)
+            name_offsets[i + 1] = encoded_total
+
+        out.write(_HEADER.pack(_MAGIC, tree.size, len(tree.level_offsets), encoded_total))
+        for column in _INT_COLUMNS:
+            out.write(np.ascontiguousarray(getattr(tree, column), dtype="<i8").tobytes())
+        for column in _FLOAT_COLUMNS:
+            out.write(np.ascontiguousarray(getattr(tree, column), dtype="<f8").tobytes())
+        out.write(np.ascontiguousarray(tree.level_offsets, dtype="<i8").tobytes())
+        node_type = np.ascontiguousarray(tree.node_type, dtype="<i1").tobytes()
+        out.write(node_type + _padding(len(node_type)))
+        out.write(name_offsets.astype("<i8").tobytes())
+        for data in encoded:
+            out.write(data)
+
+
+def load_compiled(path: str | os.PathLike, use_mmap: bool = True) -> CompiledTree:
+    """
+    Opens a file written by save_compiled. With use_mmap the columns are views
+    into a read-only memory map, so the tree can be evaluated without loading
+    it or creating any node objects.
+    """
+    with open(path, "rb") as handle:
+        if use_mmap:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = handle.read()
+
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f"{path} is not a GrandMaster binary tree")
+    magic, n, n_offsets, name_bytes = _HEADER.unpack_from(buffer, 0)
+    if magic != _MAGIC:
+        raise ValueError(f"{path} is not a GrandMaster binary tree")
+
+    offset = _HEADER.size
+    columns = {}
+
+    def take(dtype: str, count: int) -> np.ndarray:
+        nonlocal offset
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes + len(_padding(array.nbytes))
+        return array
+
+    for column in _INT_COLUMNS:
+        columns[column] = take("<i8", n)
+    for column in _FLOAT_COLUMNS:
+        columns[column] = take("<f8", n)
+    columns["level_offsets"] = take("<i8", n_offsets)
+    columns["node_type"] = take("<i1", n)
+    name_offsets = take("<i8", n + 1)
+    blob = memoryview(buffer)[offset:offset + name_bytes]
+
+    return CompiledTree(names=NameTable(blob, name_offsets), **columns)
+
+
+def write_binary(root: StrategyNode | Outcome | CoreNode, path: str | os.PathLike) -> None:
+    save_compiled(compile_tree(root), path)
+
+
+def tree_from_compiled(
+    tree: CompiledTree, expected_values: Optional[np.ndarray] = None, core: bool = False
+) -> StrategyNode | Outcome | CoreNode:
+    """Materializes model (or core) nodes from compiled arrays, children before parents."""
+    make_outcome, make_node = _factories(core)
+    names = tree.names
+    node_type = tree.node_type.tolist()
+    probability = tree.probability.tolist()
+    payoff = tree.payoff.tolist()
+    first_child = tree.first_child.tolist()
+    n_children = tree.n_children.tolist()
+    evs = expected_values.tolist() if expected_values is not None else None
+
+    nodes: list = [None] * tree.size
+    for i in range(tree.size - 1, -1, -1):
+        if node_type[i] == OUTCOME:
+            nodes[i] = make_outcome(names[i], probability[i], payoff[i])
+            continue
+        node = make_node(
+            names[i],
+            "decision" if node_type[i] == DECISION else "chance",
+            probability[i],
+            evs[i] if evs is not None and n_children[i] else None,
+        )
+        if n_children[i]:
+            node.children = nodes[first_child[i]:first_child[i] + n_children[i]]
+        nodes[i] = node
+    return nodes[0]
@@ -1,73 +1,28 @@
-import os
-from openai import OpenAI
-from langsmith import traceable
-from langsmith.wrappers import wrap_openai
-from dotenv import load_dotenv, find_dotenv # Imported find_dotenv
+import io
 
-from src.engine.input_handler import get_outcomes_sequentially
-from src.engine.models import StrategyNode, Outcome
+from src.engine.input_handler import get_outcomes_sequentially, read_outcome_table
+from src.engine.models import StrategyNode
 from src.engine.calculator import compute_ev
+from src.engine.narrative import get_service
+from src.engine.ranking import top_children, weighted_ev
+from src.engine.render import render_tree
+from src.engine.tracing import traceable
 
-def get_client():
-    """
-    Hunts for the .env file in the directory tree and forces a reload.
-    """
-    # 1. This finds the .env file even if you are in a subfolder
-    dotenv_path = find_dotenv()
-    load_dotenv(dotenv_path) 
-    
-    api_key = os.getenv("OPENAI_API_KEY")
-    
-    # DEBUG: Help confirm if the key is actually loading
-    if not api_key:
-        print(f"❌ DEBUG: find_dotenv() found: '{dotenv_path}'")
-        print("❌ DEBUG: OPENAI_API_KEY is still missing from that file!")
-    else:
-        print(f"✅ DEBUG: Success! Loaded from {dotenv_path}")
-
-    # We pass the api_key explicitly to the client for robustness
-    return wrap_openai(OpenAI(api_key=api_key))
-
-def render_ascii_tree(node: StrategyNode):
-    """Generates the ASCII visualization with calculated EV per branch."""
-    lines = []
-    lines.append(f"\nScenario: {node.name}")
-    
+def render_ascii_tree(node: StrategyNode, max_depth: int = 1):
+    """Generates the ASCII visualization with calculated EV per branch (one level by default)."""
     if not node.children:
         return "No outcomes to display."
 
-    for i, child in enumerate(node.children):
-        is_last = (i == len(node.children) - 1)
-        connector = "└── " if is_last else "├── "
-        
-        # Pull value based on whether it's a leaf node or branch
-        val = child.value if isinstance(child, Outcome) else getattr(child, 'expected_value', 0)
-        branch_ev = child.probability * val
-        prob_display = f"P={child.probability:.2f}"
-        
-        lines.append(f"  {connector}({prob_display}, Payoff={val}) -> {child.name} | EV: {branch_ev:.1f}")
-
-    return "\n".join(lines)
+    out = io.StringIO()
+    out.write("\n")
+    render_tree(node, out, max_depth=max_depth)
+    return out.getvalue().rstrip("\n")
 
 @traceable(name="Narrative Generator")
 def get_ai_narrative(scenario, best_outcome, ev):
-    """Calls GPT-4o-mini to explain the mathematical result in strategic terms."""
+    """Explains the mathematical result in strategic terms (cached; see src.engine.narrative)."""
     try:
-        client = get_client() # Client is created only when needed
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "You are the GrandMaster, a cold, calculating military strategist. Explain why a move is mathematically superior based on Expected Value."
-                },
-                {
-                    "role": "user", 
-                    "content": f"In the scenario '{scenario}', the most viable path is '{best_outcome}' with an EV of {ev}. Provide a brief, 2-sentence strategic justification."
-                }
-            ]
-        )
-        return response.choices[0].message.content
+        return get_service().narrate_sync(scenario, best_outcome, ev)
     except Exception as e:
         return f"[AI Analysis Unavailable: {e}]"
 
@@ -77,14 +32,22 @@ def run_v01_session():
     print("="*40)
     
     scenario_name = input("What is this scenario called? ")
-    try:
-        num_outcomes = int(input("How many outcomes are possible? "))
-    except ValueError:
-        print("Error: Please enter a whole number.")
-        return
+    answer = input("How many outcomes are possible? (Or 'load <file.csv>' to import them) ").strip()
 
-    # 1. Collect Outcomes via sequential input flow
-    outcomes = get_outcomes_sequentially(num_outcomes)
+    # 1. Collect Outcomes from a file, or via sequential input flow
+    if answer.lower().startswith("load "):
+        try:
+            outcomes = read_outcome_table(answer[5:].strip()).to_outcomes()
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+    else:
+        try:
+            num_outcomes = int(answer)
+        except ValueError:
+            print("Error: Please enter a whole number.")
+            return
+        outcomes = get_outcomes_sequentially(num_outcomes)
     
     # 2. Initialize the model
     root_node = StrategyNode(
@@ -97,8 +60,8 @@ def run_v01_session():
     compute_ev(root_node)
     
     # 4. Identify the best outcome
-    best_outcome = max(root_node.children, key=lambda c: c.probability * (c.value if isinstance(c, Outcome) else c.expected_value))
-    best_contribution = best_outcome.probability * (best_outcome.value if isinstance(best_outcome, Outcome) else best_outcome.expected_value)
+    best_outcome = top_children(root_node, 1)[0]
+    best_contribution = weighted_ev(best_outcome)
 
     # 5. Output Visuals
     print("\n--- VISUAL MODEL ---")
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.compiler import CompiledTree, compile_tree, backward_induction, best_children, propagate_down, DECISION
+
+# Trees up to this many nodes get the exact distribution from payoff_distribution()
+EXACT_NODE_LIMIT = 100_000
+
+
+@dataclass
+class PayoffDistribution:
+    """
+    Discrete distribution of the terminal payoff under the optimal policy.
+
+    Attributes:
+        values: Distinct payoffs, sorted ascending.
+        probabilities: Probability mass of each payoff.
+        n_samples: Number of simulated paths, or None for the exact distribution.
+    """
+    values: np.ndarray
+    probabilities: np.ndarray
+    n_samples: Optional[int] = None
+
+    @classmethod
+    def from_atoms(cls, payoffs: np.ndarray, weights: np.ndarray, n_samples: Optional[int] = None) -> PayoffDistribution:
+        """Aggregates (payoff, weight) pairs into a normalized distribution."""
+        keep = weights > 0
+        values, inverse = np.unique(payoffs[keep], return_inverse=True)
+        mass = np.bincount(inverse, weights=weights[keep], minlength=len(values))
+        return cls(values=values, probabilities=mass / mass.sum(), n_samples=n_samples)
+
+    @property
+    def mean(self) -> float:
+        return float(self.values @ self.probabilities)
+
+    @property
+    def std(self) -> float:
+        centered = self.values - self.mean
+        return float(np.sqrt((centered * centered) @ self.probabilities))
+
+    @property
+    def probability_of_loss(self) -> float:
+        return float(self.probabilities[self.values < 0].sum())
+
+    def quantile(self, q: float) -> float:
+        """Lower quantile: the smallest payoff whose cumulative probability reaches q."""
+        cdf = np.cumsum(self.probabilities)
+        idx = int(np.searchsorted(cdf, q - 1e-12, side="left"))
+        return float(self.values[min(idx, len(self.values) - 1)])
+
+    def percentile(self, p: float) -> float:
+        return self.quantile(p / 100.0)
+
+    def value_at_risk(self, confidence: float = 0.95) -> float:
+        """Loss (as a positive number) not exceeded with the given confidence."""
+        return -self.quantile(1.0 - confidence)
+
+    def conditional_value_at_risk(self, confidence: float = 0.95) -> float:
+        """Expected loss over the worst (1 - confidence) of outcomes, splitting atoms at the cut."""
+        tail = 1.0 - confidence
+        if tail <= 0:
+            return -float(self.values[0])
+        taken = np.minimum(self.probabilities, np.maximum(tail - (np.cumsum(self.probabilities) - self.probabilities), 0.0))
+        return -float(self.values @ taken) / tail
+
+    def summary(self, confidence: float = 0.95) -> Dict[str, float]:
+        return {
+            "mean": self.mean,
+            "std": self.std,
+            "p05": self.percentile(5),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "value_at_risk": self.value_at_risk(confidence),
+            "conditional_value_at_risk": self.conditional_value_at_risk(confidence),
+            "probability_of_loss": self.probability_of_loss,
+        }
+
+
+def _as_compiled(tree: CompiledTree | StrategyNode | Outcome) -> CompiledTree:
+    return tree if isinstance(tree, CompiledTree) else compile_tree(tree)
+
+
+def _branch_weights(tree: CompiledTree) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns each node's probability normalized within its parent's children
+    (1.0 below decision nodes, which follow the policy instead) and the
+    unassigned mass of every chance node.
+
+    Children of a chance node whose probabilities sum to less than one leave the
+    remainder as an implicit 0.0 payoff, matching compute_ev's weighted sum.
+    Sums above one are normalized.
+    """
+    totals = np.bincount(tree.parent[1:], weights=tree.probability[1:], minlength=tree.size)
+    scale = np.maximum(totals, 1.0)
+    weights = np.ones(tree.size)
+    weights[1:] = tree.probability[1:] / scale[tree.parent[1:]]
+    weights[1:][tree.node_type[tree.parent[1:]] == DECISION] = 1.0
+    residual = np.where((tree.node_type != DECISION) & (tree.n_children > 0), np.maximum(1.0 - totals, 0.0), 0.0)
+    return weights, residual
+
+
+def exact_distribution(tree: CompiledTree | StrategyNode | Outcome) -> PayoffDistribution:
+    """Computes the exact payoff distribution by pushing reach probabilities down the tree."""
+    tree = _as_compiled(tree)
+    ev = backward_induction(tree)
+    best = best_children(tree, ev)
+    weights, residual = _branch_weights(tree)
+
+    parent = np.maximum(tree.parent, 0)
+    follow = np.where(tree.node_type[parent] == DECISION, best[parent] == np.arange(tree.size), 1.0)
+    reach = propagate_down(tree, weights * follow)
+
+    terminal = tree.n_children == 0
+    payoffs = np.concatenate([tree.payoff[terminal], [0.0]])
+    mass = np.concatenate([reach[terminal], [float(reach @ residual)]])
+    return PayoffDistribution.from_atoms(payoffs, mass)
+
+
+class _Sampler:
+    """Draws root-to-leaf paths under the optimal policy in vectorized batches."""
+
+    def __init__(self, tree: CompiledTree):
+        self.tree = tree
+        self.best = best_children(tree, backward_induction(tree))
+        weights, _ = _branch_weights(tree)
+
+        # Cumulative weights inside each sibling segment, offset by the parent's
+        # index so one global searchsorted finds the sampled child of any node.
+        cumulative = np.cumsum(weights)
+        segment_base = np.zeros(tree.size)
+        has_children = tree.n_children > 0
+        starts = tree.first_child[has_children]
+        segment_base[has_children] = cumulative[starts] - weights[starts]
+        keys = np.full(tree.size, -1.0)
+        keys[1:] = tree.parent[1:] + np.minimum(cumulative[1:] - segment_base[tree.parent[1:]], 1.0)
+        self.keys = keys
+
+    def terminals(self, n_paths: int, rng: np.random.Generator) -> np.ndarray:
+        """Returns the terminal node of each path, or -1 for unassigned probability mass."""
+        tree = self.tree
+        current = np.zeros(n_paths, dtype=np.int64)
+        active = np.flatnonzero(tree.n_children[current] > 0)
+        while active.size:
+            nodes = current[active]
+            nxt = self.best[nodes]
+            chance = tree.node_type[nodes] != DECISION
+            if chance.any():
+                chance_nodes = nodes[chance]
+                picked = np.searchsorted(self.keys, chance_nodes + rng.random(chance_nodes.size), side="right")
+                end = tree.first_child[chance_nodes] + tree.n_children[chance_nodes]
+                nxt[chance] = np.where(picked < end, picked, -1)
+            current[active] = nxt
+            active = active[nxt >= 0]
+            active = active[tree.n_children[current[active]] > 0]
+        return current
+
+
+def iter_sample_chunks(
+    tree: CompiledTree | StrategyNode | Outcome,
+    n_paths: int,
+    seed: int = 0,
+    chunk_size: int = 1_000_000,
+) -> Iterator[np.ndarray]:
+    """Streams simulated payoffs in chunks of at most `chunk_size` paths."""
+    tree = _as_compiled(tree)
+    sampler = _Sampler(tree)
+    rng = np.random.default_rng(seed)
+    payoff = np.append(tree.payoff, 0.0)  # index -1 maps to the unassigned-mass payoff
+    remaining = n_paths
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield payoff[sampler.terminals(size, rng)]
+        remaining -= size
+
+
+def simulate(
+    tree: CompiledTree | StrategyNode | Outcome,
+    n_paths: int = 1_000_000,
+    seed: int = 0,
+    chunk_size: int = 1_000_000,
+) -> PayoffDistribution:
+    """
+    Monte Carlo payoff distribution under the optimal policy.
+
+    Paths are drawn in chunks and only per-terminal hit counts are kept, so
+    memory is bounded by the chunk size and the tree size, not by n_paths.
+    """
+    tree = _as_compiled(tree)
+    sampler = _Sampler(tree)
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(tree.size + 1, dtype=np.int64)
+    remaining = n_paths
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        terminals = sampler.terminals(size, rng)
+        terminals[terminals < 0] = tree.size  # last slot holds the unassigned-mass payoff
+        counts += np.bincount(terminals, minlength=tree.size + 1)
+        remaining -= size
+    payoffs = np.append(tree.payoff, 0.0)
+    return PayoffDistribution.from_atoms(payoffs, counts.astype(np.float64), n_samples=n_paths)
+
+
+def payoff_distribution(
+    tree: CompiledTree | StrategyNode | Outcome,
+    n_paths: int = 1_000_000,
+    seed: int = 0,
+    exact_node_limit: int = EXACT_NODE_LIMIT,
+) -> PayoffDistribution:
+    """Exact distribution for small trees, Monte Carlo estimate for larger ones."""
+    tree = _as_compiled(tree)
+    if tree.size <= exact_node_limit:
+        return exact_distribution(tree)
+    return simulate(tree, n_paths=n_paths, seed=seed)
@@ -0,0 +1,20 @@
+import functools
+
+
+def traceable(name: str):
+    """
+    langsmith.traceable, deferred: langsmith is imported on the first call of
+    the decorated function rather than when its module is loaded.
+    """
+    def decorate(fn):
+        traced = None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            nonlocal traced
+            if traced is None:
+                from langsmith import traceable as langsmith_traceable
+                traced = langsmith_traceable(name=name)(fn)
+            return traced(*args, **kwargs)
+        return wrapper
+    return decorate
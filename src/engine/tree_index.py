@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.engine.models import StrategyNode, Outcome
+from src.engine.incremental import attach_child, attach_children, replace_child, truncate_children
+
+
+Path = Tuple[str, ...]
+
+
+class TreeIndex:
+    """
+    Path and id lookup for one StrategyNode tree.
+
+    Every node has a path (child names below the root, so the root is ()) and
+    an integer id that survives promotion of an Outcome to a StrategyNode.
+    Lookups, parent queries and replacements are O(1). Changes made through
+    attach/attach_many/replace/truncate keep the index current; a parent whose children
+    were changed some other way is re-indexed when it is next looked up.
+    Where siblings share a name, the first one owns the path.
+    """
+
+    def __init__(self, root: StrategyNode):
+        self.root = root
+        self._by_path: Dict[Path, StrategyNode | Outcome] = {}
+        self._by_id: Dict[int, StrategyNode | Outcome] = {}
+        # id(node) -> [node, parent, position, path, node id]
+        self._entries: Dict[int, list] = {}
+        # id(parent) -> number of children indexed
+        self._indexed: Dict[int, int] = {}
+        self._next_id = 0
+        self._register(root, None, -1, ())
+        self._register_subtree(root)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- lookups ---------------------------------------------------------
+
+    def node(self, path: Sequence[str] | str) -> StrategyNode | Outcome:
+        """The node at `path` (a sequence of names or "A/B/C"); raises KeyError."""
+        path = _as_path(path)
+        node = self._by_path.get(path)
+        if node is not None and self._is_current(node):
+            return node
+        # Missing or stale: resolve the path one level at a time
+        node = self.root
+        for name in path:
+            node = self.child(node, name) if isinstance(node, StrategyNode) else None
+            if node is None:
+                raise KeyError(f"No node at path '{'/'.join(path)}'")
+        return node
+
+    def child(self, parent: StrategyNode, name: str) -> Optional[StrategyNode | Outcome]:
+        """The first child of `parent` called `name`, or None."""
+        if self._indexed.get(id(parent)) != len(parent.children):
+            self._reindex_children(parent)
+        entry = self._entries.get(id(parent))
+        if entry is None:
+            return None
+        node = self._by_path.get(entry[3] + (name,))
+        if node is not None and not self._is_current(node):
+            self._reindex_children(parent)
+            node = self._by_path.get(entry[3] + (name,))
+        return node
+
+    def by_id(self, node_id: int) -> StrategyNode | Outcome:
+        return self._by_id[node_id]
+
+    def id_of(self, node: StrategyNode | Outcome) -> int:
+        return self._entry(node)[4]
+
+    def path_of(self, node: StrategyNode | Outcome) -> List[str]:
+        return list(self._entry(node)[3])
+
+    def positions_of(self, node: StrategyNode | Outcome) -> List[int]:
+        """Child positions from the root down to `node`, in O(depth)."""
+        positions = []
+        entry = self._entry(node)
+        while entry[1] is not None:
+            positions.append(entry[2])
+            entry = self._entry(entry[1])
+        return positions[::-1]
+
+    def parent_of(self, node: StrategyNode | Outcome) -> Optional[StrategyNode]:
+        return self._entry(node)[1]
+
+    def position_of(self, node: StrategyNode | Outcome) -> int:
+        return self._entry(node)[2]
+
+    # -- changes ---------------------------------------------------------
+
+    def attach(self, parent: StrategyNode, child: StrategyNode | Outcome) -> None:
+        """attach_child, keeping the index current."""
+        attach_child(parent, child)
+        self._register_child(parent, child, len(parent.children) - 1)
+
+    def attach_many(self, parent: StrategyNode, children: List[StrategyNode | Outcome]) -> None:
+        """attach_children, keeping the index current."""
+        start = len(parent.children)
+        attach_children(parent, children)
+        for position, child in enumerate(children, start):
+            self._register_child(parent, child, position)
+
+    def replace(self, old: StrategyNode | Outcome, new: StrategyNode | Outcome) -> None:
+        """
+        Puts `new` where `old` is (e.g. an Outcome promoted to a StrategyNode)
+        in O(1); `new` takes over the path and id of `old`.
+        """
+        _, parent, position, path, node_id = self._entry(old)
+        if parent is None:
+            raise ValueError("The root cannot be replaced")
+        replace_child(parent, position, new)
+        self._unregister_subtree(old)
+        self._register(new, parent, position, path, node_id)
+        self._register_subtree(new)
+
+    def truncate(self, parent: StrategyNode, length: int) -> None:
+        """truncate_children, keeping the index current."""
+        removed = parent.children[length:]
+        truncate_children(parent, length)
+        for child in removed:
+            self._unregister_subtree(child)
+        self._indexed[id(parent)] = len(parent.children)
+
+    # -- internals -------------------------------------------------------
+
+    def _entry(self, node: StrategyNode | Outcome) -> list:
+        entry = self._entries.get(id(node))
+        if entry is None or entry[0] is not node or not self._is_current(node):
+            raise KeyError(f"'{node.name}' is not in this tree")
+        return entry
+
+    def _is_current(self, node: StrategyNode | Outcome) -> bool:
+        """True if the node is still in the slot the index recorded for it."""
+        entry = self._entries.get(id(node))
+        if entry is None or entry[0] is not node:
+            return False
+        parent, position = entry[1], entry[2]
+        if parent is None:
+            return node is self.root
+        children = parent.children
+        return position < len(children) and children[position] is node
+
+    def _register(self, node, parent, position, path, node_id=None) -> None:
+        if node_id is None:
+            node_id = self._next_id
+            self._next_id += 1
+        self._entries[id(node)] = [node, parent, position, path, node_id]
+        self._by_id[node_id] = node
+        owner = self._by_path.get(path)
+        if owner is None or not self._is_current(owner):
+            self._by_path[path] = node
+
+    def _register_child(self, parent, child, position) -> None:
+        self._register(child, parent, position, self._entries[id(parent)][3] + (child.name,))
+        self._indexed[id(parent)] = len(parent.children)
+        if isinstance(child, StrategyNode):
+            self._register_subtree(child)
+
+    def _register_subtree(self, top) -> None:
+        stack = [top] if isinstance(top, StrategyNode) else []
+        while stack:
+            node = stack.pop()
+            path = self._entries[id(node)][3]
+            for position, child in enumerate(node.children):
+                self._register(child, node, position, path + (child.name,))
+                if isinstance(child, StrategyNode):
+                    stack.append(child)
+            self._indexed[id(node)] = len(node.children)
+
+    def _unregister_subtree(self, top) -> None:
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            entry = self._entries.pop(id(node), None)
+            if entry is None:
+                continue
+            if self._by_path.get(entry[3]) is node:
+                del self._by_path[entry[3]]
+            if self._by_id.get(entry[4]) is node:
+                del self._by_id[entry[4]]
+            if isinstance(node, StrategyNode):
+                self._indexed.pop(id(node), None)
+                stack.extend(node.children)
+
+    def _reindex_children(self, parent: StrategyNode) -> None:
+        """Re-registers the children of a parent changed outside the index."""
+        entry = self._entries.get(id(parent))
+        if entry is None:
+            return
+        path = entry[3]
+        for position, child in enumerate(parent.children):
+            known = self._entries.get(id(child))
+            if known is not None and known[0] is child and known[1] is parent:
+                known[2] = position
+                continue
+            self._register(child, parent, position, path + (child.name,))
+            if isinstance(child, StrategyNode):
+                self._register_subtree(child)
+        # The first sibling with a name owns its path
+        for child in reversed(parent.children):
+            self._by_path[path + (child.name,)] = child
+        self._indexed[id(parent)] = len(parent.children)
+
+
+def _as_path(path: Sequence[str] | str) -> Path:
+    if isinstance(path, str):
+        return tuple(name for name in path.split("/") if name)
+    return tuple(path)
+
+
+def tree_index(root: StrategyNode) -> TreeIndex:
+    """The index of the tree under `root`, built on first use and kept on the root."""
+    index = root._tree_index
+    if index is None:
+        index = TreeIndex(root)
+        root._tree_index = index
+    return index
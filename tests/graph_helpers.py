@@ -0,0 +1,13 @@
+"""Drives the navigator graph one input at a time, for the graph-level tests."""
+from src.agents.graph import graph
+
+def new_state():
+    return {
+        "messages": [], "root_node": None, "current_node_path": [], "pending_data": {},
+        "next_step": "", "latest_input": None, "recommendation_summary": "",
+        "interview_phase": "START", "target_count": 0, "current_index": 0,
+        "running_prob_total": 0.0, "active_parent_node": None,
+    }
+
+def send(state, text):
+    return graph.invoke({**state, "latest_input": text})
@@ -0,0 +1,33 @@
+"""Trees shared by the engine test modules."""
+from src.engine.models import StrategyNode, Outcome
+
+def reference_ev(node):
+    """The original recursive definition, used as an oracle."""
+    if isinstance(node, Outcome):
+        return node.value
+    if not node.children:
+        return 0.0
+    child_evs = [reference_ev(child) for child in node.children]
+    if node.node_type == "decision":
+        return max(child_evs)
+    return sum(child.probability * ev for child, ev in zip(node.children, child_evs))
+
+def random_tree(rng, depth):
+    if depth == 0 or rng.random() < 0.2:
+        if rng.random() < 0.1:
+            return StrategyNode(name="Empty", probability=rng.random())
+        return Outcome(name="Leaf", probability=rng.random(), value=rng.uniform(-50, 50))
+    return StrategyNode(
+        name="Node",
+        node_type=rng.choice(["chance", "decision"]),
+        probability=rng.random(),
+        children=[random_tree(rng, depth - 1) for _ in range(rng.randint(1, 4))]
+    )
+
+def bond_tree():
+    long_bonds = StrategyNode(name="Long Bonds", probability=1.0, children=[
+        Outcome(name="Rally", probability=0.6, value=2000.0),
+        Outcome(name="Selloff", probability=0.4, value=-500.0),
+    ])
+    cash = Outcome(name="Cash", probability=1.0, value=500.0)
+    return StrategyNode(name="Bond Strategy", node_type="decision", children=[long_bonds, cash])
@@ -0,0 +1,53 @@
+import json
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.batch import BatchEvaluator, BatchStats, evaluate_batch, iter_serialized_trees
+from src.cli import main
+
+def scenario(i):
+    return StrategyNode(name=f"Scenario {i}", node_type="decision", children=[
+        StrategyNode(name="Long", probability=1.0, children=[
+            Outcome(name="Up", probability=0.5, value=10.0 * i),
+            Outcome(name="Down", probability=0.5, value=-4.0),
+        ]),
+        Outcome(name="Cash", probability=1.0, value=1.0),
+    ])
+
+@pytest.fixture
+def ndjson_file(tmp_path):
+    path = tmp_path / "trees.ndjson"
+    lines = [scenario(i).model_dump_json() for i in range(20)]
+    lines.insert(5, "{not json")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+def test_results_stream_in_input_order(ndjson_file):
+    stats = BatchStats()
+    results = list(evaluate_batch(ndjson_file, workers=2, chunksize=3, stats=stats))
+    assert [r.index for r in results] == list(range(21))
+    assert results[5].error is not None and results[5].expected_value is None
+
+    expected = [compute_ev(scenario(i)) for i in range(20)]
+    scored = [r.expected_value for r in results if r.error is None]
+    assert scored == pytest.approx(expected)
+    assert stats.trees == 21 and stats.errors == 1 and stats.nodes == 20 * 5
+    assert stats.trees_per_second > 0
+
+def test_directory_source_and_pool_reuse(tmp_path):
+    for i in range(3):
+        (tmp_path / f"tree_{i}.json").write_text(scenario(i).model_dump_json())
+    trees = [(f"t{i}", scenario(i).model_dump_json()) for i in range(4)]
+    with BatchEvaluator(workers=2) as evaluator:
+        first = [r.expected_value for r in evaluator.evaluate(trees)]
+        second = [r.label for r in evaluator.evaluate(iter_serialized_trees(tmp_path))]
+    assert first == pytest.approx([compute_ev(scenario(i)) for i in range(4)])
+    assert second == ["tree_0.json", "tree_1.json", "tree_2.json"]
+    assert evaluator.stats.trees == 7
+
+def test_cli_batch_subcommand(ndjson_file, capsys):
+    assert main(["batch", str(ndjson_file), "--workers", "1"]) == 1
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert len(records) == 21 and "error" in records[5]
+    assert "21 trees" in err
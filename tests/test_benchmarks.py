@@ -0,0 +1,21 @@
+from src.engine.calculator import compute_ev
+from benchmarks.generators import wide, deep, balanced, interleaved, count_nodes
+from benchmarks.run_benchmarks import compare
+
+def test_generators_are_seeded_and_sized():
+    assert wide(50, seed=3) == wide(50, seed=3)
+    assert wide(50, seed=3) != wide(50, seed=4)
+    assert count_nodes(deep(1000)) == 2001
+    assert count_nodes(balanced(3, 4)) == sum(3 ** k for k in range(5))
+    root = interleaved(3, 4, seed=1)
+    assert root.node_type == "decision" and root.children[0].node_type == "chance"
+    # Chance probabilities are normalized, so every EV stays within the payoff range
+    for tree in (wide(200), deep(500), balanced(4, 4), root):
+        assert -1000 <= compute_ev(tree) <= 1000
+
+def test_compare_flags_slowdowns_beyond_tolerance():
+    baseline = {"results": {"a": {"normalized": 1.0}, "b": {"normalized": 1.0}}}
+    current = {"results": {"a": {"normalized": 1.2}, "b": {"normalized": 2.0}, "c": {"normalized": 5.0}}}
+    lines, regressions = compare(current, baseline, tolerance=0.5)
+    assert regressions == ["b"]
+    assert any("REGRESSION" in line for line in lines) and any("(new)" in line for line in lines)
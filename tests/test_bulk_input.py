@@ -0,0 +1,61 @@
+import io
+import pytest
+from src.engine.input_handler import read_outcome_table
+from src.engine.incremental import enable_consistency_checks
+from tests.graph_helpers import new_state, send
+
+def test_header_percent_and_chunking(tmp_path):
+    path = tmp_path / "pricing.tsv"
+    rows = "".join(f"Strike {i}\t{i % 50}\t{100 / 4000}%\n" for i in range(4000))
+    path.write_text("name\tpayoff\tprobability\n" + rows)
+    table = read_outcome_table(path, chunk_size=512)
+    assert len(table) == 4000 and table.names[-1] == "Strike 3999"
+    assert table.probabilities.sum() == pytest.approx(1.0)
+    assert table.values[:3].tolist() == [0.0, 1.0, 2.0]
+
+def test_last_outcome_is_balanced_like_the_interview():
+    table = read_outcome_table(io.StringIO("Rally,0.5,300\nFlat,0.2,0\nSelloff,0.1,-200\n"))
+    assert table.probabilities.tolist() == pytest.approx([0.5, 0.2, 0.3])
+    with pytest.raises(ValueError, match="sum to 80%"):
+        read_outcome_table(io.StringIO("Rally,0.5,300\nFlat,0.2,0\nSelloff,0.1,-200\n"), balance_last=False)
+    # Joining siblings that already hold 40%, the file shares the remaining 60%
+    table = read_outcome_table(io.StringIO("Rally,0.3,300\nSelloff,0.1,-200\n"), budget=0.6)
+    assert table.probabilities.tolist() == pytest.approx([0.3, 0.3])
+    with pytest.raises(ValueError, match="80% of the 60% available"):
+        read_outcome_table(io.StringIO("Rally,0.5,300\nFlat,0.3,0\nSelloff,0,-200\n"), budget=0.6)
+
+@pytest.mark.parametrize("text, message", [
+    ("A,0.5,10\nB,abc,3\n", "line 2: probability 'abc' is not a number"),
+    ("A,150%,10\nB,0,3\n", "line 1: probability 150% is outside"),
+    ("A,0.9,10\nB,0.3,3\nC,0,1\n", "already sum to 120%"),
+    ("A,0.5\n", "line 1: expected 3 columns"),
+    ("\n\n", "No outcomes"),
+])
+def test_invalid_rows_are_reported(text, message):
+    with pytest.raises(ValueError, match=message):
+        read_outcome_table(io.StringIO(text))
+
+def test_navigator_load_command(tmp_path):
+    enable_consistency_checks(True)
+    try:
+        path = tmp_path / "moves.csv"
+        path.write_text("name,probability,value\nLong,60%,2000\nCash,40%,500\n")
+        state = send(new_state(), "Bond Strategy")
+        state = send(state, "load /does/not/exist.csv")
+        assert state["interview_phase"] == "GET_COUNT"
+        assert state["recommendation_summary"].startswith("Could not load outcomes")
+
+        state = send(state, f"load {path}")
+        root = state["root_node"]
+        assert state["interview_phase"] == "DECIDE_NEXT_STEP"
+        assert [c.name for c in root.children] == ["Long", "Cash"]
+        assert root.expected_value == pytest.approx(2000.0)
+        assert "optimal move is [Long]" in state["recommendation_summary"]
+
+        # The root's probability is all assigned, so a second file cannot join it
+        state = send(state, "goto /")
+        state = send(state, f"load {path}")
+        assert state["recommendation_summary"].startswith("Could not load outcomes: 'Bond Strategy' has no probability left")
+        assert len(state["root_node"].children) == 2
+    finally:
+        enable_consistency_checks(False)
@@ -0,0 +1,29 @@
+import pytest
+from src.cli import main
+
+MALFORMED = {
+    "missing-colon.json": '{"name" "x","probability":0.5,"value":1}',
+    "bad-child.json": '{"name":"x","children":[1]}',
+    "empty-object.json": '{}',
+    "truncated.json": '{"name":"x","children":[}',
+    "bad-number.json": '{"name":"x","children":[{"name":"a","probability":[],"value":1}]}',
+    "missing-field.ndjson": '{"id":0,"parent":-1,"kind":"chance","probability":1}\n',
+    "not-a-record.ndjson": '[1, 2]\n',
+    "bad-parent.ndjson": '{"id":0,"parent":-1,"name":"r","kind":"chance","probability":1}\n'
+                         '{"id":1,"parent":7,"name":"o","kind":"outcome","probability":1,"value":2}\n',
+    "short.gmt": "GM",
+}
+
+@pytest.mark.parametrize("command", ["eval", "render"])
+@pytest.mark.parametrize("filename", sorted(MALFORMED))
+def test_malformed_input_is_reported_without_traceback(tmp_path, capsys, command, filename):
+    path = tmp_path / filename
+    path.write_text(MALFORMED[filename])
+    assert main([command, str(path)]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.startswith("error: ")
+
+def test_missing_file_is_reported(tmp_path, capsys):
+    assert main(["eval", str(tmp_path / "absent.json")]) == 1
+    assert capsys.readouterr().err.startswith("error: ")
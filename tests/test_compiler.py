@@ -0,0 +1,49 @@
+import random
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.compiler import compile_tree, backward_induction, OUTCOME, CHANCE, DECISION
+from tests.helpers import reference_ev, random_tree
+
+def test_compiled_layout():
+    """Children of each node are contiguous and levels are delimited by offsets."""
+    root = StrategyNode(name="Root", node_type="decision", children=[
+        StrategyNode(name="Hedge", node_type="chance", probability=0.5, children=[
+            Outcome(name="Up", probability=0.6, value=10.0),
+            Outcome(name="Down", probability=0.4, value=-5.0),
+        ]),
+        Outcome(name="Cash", probability=0.5, value=1.0),
+    ])
+    tree = compile_tree(root)
+    assert tree.names == ["Root", "Hedge", "Cash", "Up", "Down"]
+    assert tree.parent.tolist() == [-1, 0, 0, 1, 1]
+    assert tree.node_type.tolist() == [DECISION, CHANCE, OUTCOME, OUTCOME, OUTCOME]
+    assert tree.level_offsets.tolist() == [0, 1, 3, 5]
+    assert tree.first_child.tolist() == [1, 3, -1, -1, -1]
+    assert backward_induction(tree)[:2].tolist() == pytest.approx([4.0, 4.0])
+
+def test_matches_recursive_definition():
+    rng = random.Random(7)
+    for _ in range(100):
+        root = random_tree(rng, 6)
+        assert compute_ev(root) == pytest.approx(reference_ev(root))
+
+def test_expected_values_written_back():
+    empty = StrategyNode(name="Drill Later", probability=0.5)
+    risky = StrategyNode(name="Risky", probability=0.5, children=[
+        Outcome(name="Win", probability=0.5, value=30.0),
+        Outcome(name="Lose", probability=0.5, value=-10.0),
+    ])
+    root = StrategyNode(name="Root", node_type="decision", children=[empty, risky])
+    assert compute_ev(root) == 10.0
+    assert risky.expected_value == 10.0
+    # Unexpanded nodes count as 0.0 but keep no cached value, as before
+    assert empty.expected_value is None
+
+def test_deep_binary_tree_is_linear():
+    """A 16-level tree would need ~2^32 calls with the old double recursion."""
+    def build(levels):
+        if levels == 0:
+            return Outcome(name="Leaf", probability=0.5, value=1.0)
+        return StrategyNode(name="Split", probability=0.5, children=[build(levels - 1), build(levels - 1)])
+    assert compute_ev(build(16)) == pytest.approx(1.0)
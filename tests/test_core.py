@@ -0,0 +1,45 @@
+import io
+import pytest
+from src.engine.calculator import compute_ev
+from src.engine.core import CoreNode, CoreOutcome, to_core, to_model
+from src.engine.serialization import read_json, read_ndjson, validate_tree, write_json, write_ndjson
+from src.engine.simulation import exact_distribution
+from tests.helpers import bond_tree
+
+def test_engine_runs_on_core_nodes():
+    core = to_core(bond_tree())
+    assert isinstance(core, CoreNode) and isinstance(core.children[1], CoreOutcome)
+    assert compute_ev(core) == pytest.approx(1000.0)
+    assert core.children[0].expected_value == pytest.approx(1000.0)
+    assert exact_distribution(core).mean == pytest.approx(1000.0)
+
+def test_model_round_trip():
+    model = bond_tree()
+    compute_ev(model)
+    core = to_core(model)
+    assert to_model(core) == model
+
+def test_readers_build_core_nodes():
+    model = bond_tree()
+    compute_ev(model)
+    text, records = io.StringIO(), io.StringIO()
+    write_json(model, text)
+    write_ndjson(model, records)
+
+    from_json = read_json(io.StringIO(text.getvalue()), core=True)
+    from_ndjson = read_ndjson(io.StringIO(records.getvalue()), core=True)
+    for core in (from_json, from_ndjson):
+        assert isinstance(core, CoreNode)
+        assert to_model(core) == model
+
+    # Core trees serialize exactly like the models they came from
+    again = io.StringIO()
+    write_json(from_json, again)
+    assert again.getvalue() == text.getvalue()
+
+def test_boundary_validation_still_applies():
+    bad = {"name": "Root", "children": [{"name": "Impossible", "probability": 1.5, "value": 1.0}]}
+    with pytest.raises(ValueError, match="outside"):
+        validate_tree(bad, core=True)
+    with pytest.raises(ValueError):
+        validate_tree(bad)
@@ -0,0 +1,84 @@
+import io
+import pytest
+from src.engine import compiler
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.compiler import compile_tree, backward_induction
+from src.engine.incremental import link_parents, mark_dirty, refresh_ev
+from src.engine.serialization import (
+    load_compiled, read_json, read_ndjson, save_compiled, validate_tree, write_json, write_ndjson
+)
+from src.engine.simulation import exact_distribution
+from src.engine.sensitivity import sensitivity_analysis
+from src.agents.graph import format_recommendations
+
+DEPTH = 100_000
+
+def trading_days(depth):
+    """One node per day: hold (continue) or exit, alternating chance and decision nodes."""
+    node = Outcome(name="Maturity", probability=0.5, value=1.0)
+    expected = 1.0
+    for day in range(depth):
+        exit_value = float(day % 7)
+        if day % 2:
+            node = StrategyNode(name=f"Day {day}", node_type="decision", probability=0.5, children=[
+                node, Outcome(name="Exit", probability=0.5, value=exit_value)])
+            expected = max(expected, exit_value)
+        else:
+            node = StrategyNode(name=f"Day {day}", node_type="chance", probability=0.5, children=[
+                node, Outcome(name="Exit", probability=0.5, value=exit_value)])
+            expected = 0.5 * expected + 0.5 * exit_value
+    return node, expected
+
+@pytest.fixture(scope="module")
+def deep():
+    return trading_days(DEPTH)
+
+def test_ev_and_incremental_refresh(deep):
+    root, expected = deep
+    assert compute_ev(root) == pytest.approx(expected)
+
+    link_parents(root)
+    bottom = root
+    while isinstance(bottom.children[0], StrategyNode):
+        bottom = bottom.children[0]
+    bottom.children[0] = Outcome(name="Maturity", probability=0.5, value=1000.0)
+    mark_dirty(bottom)
+    assert refresh_ev(root) == pytest.approx(compute_ev(root))
+    bottom.children[0] = Outcome(name="Maturity", probability=0.5, value=1.0)
+    compute_ev(root)
+
+def test_sweep_and_level_solvers_agree(deep, monkeypatch):
+    tree = compile_tree(deep[0])
+    sweep = backward_induction(tree)
+    monkeypatch.setattr(compiler, "NARROW_LEVEL_WIDTH", 0)
+    assert backward_induction(tree).tolist() == pytest.approx(sweep.tolist())
+
+def test_serialization_round_trips(deep, tmp_path):
+    root = deep[0]
+    text = io.StringIO()
+    write_json(root, text)
+    assert read_json(io.StringIO(text.getvalue())) == root
+
+    records = io.StringIO()
+    write_ndjson(root, records)
+    assert read_ndjson(io.StringIO(records.getvalue())) == root
+
+    save_compiled(compile_tree(root), tmp_path / "deep.gmt")
+    assert backward_induction(load_compiled(tmp_path / "deep.gmt"))[0] == pytest.approx(deep[1])
+
+def test_validation_without_recursion(deep):
+    data = {"name": "Maturity", "probability": 0.5, "value": 1.0}
+    for day in range(DEPTH):
+        data = {"name": f"Day {day}", "children": [data, {"name": "Exit", "probability": 0.5, "value": 0.0}]}
+    root = validate_tree(data)
+    assert isinstance(root, StrategyNode) and root.name == f"Day {DEPTH - 1}"
+    with pytest.raises(ValueError):
+        data["children"][1]["probability"] = 2.0
+        validate_tree(data)
+
+def test_analysis_and_rendering(deep):
+    root, expected = deep
+    assert exact_distribution(root).mean == pytest.approx(expected)
+    assert sensitivity_analysis(root).root_ev == pytest.approx(expected)
+    assert format_recommendations(root).startswith("The optimal move is")
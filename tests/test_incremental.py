@@ -0,0 +1,87 @@
+import pickle
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.incremental import (
+    attach_child, check_consistency, enable_consistency_checks, link_parents, mark_dirty, refresh_ev
+)
+from tests.graph_helpers import new_state, send
+
+@pytest.fixture(autouse=True)
+def consistency_checks():
+    enable_consistency_checks(True)
+    yield
+    enable_consistency_checks(False)
+
+def test_interview_matches_full_recompute():
+    """Every commit and drill-down goes through refresh_ev with verification enabled."""
+    state = new_state()
+    for text in ["Bond Strategy", "2",
+                 "Long Bonds", "60", "2000",
+                 "Cash", "40", "500",
+                 "Long Bonds", "2",
+                 "Rally", "50", "3000",
+                 "Selloff", "50", "-1000"]:
+        state = send(state, text)
+
+    root = state["root_node"]
+    assert state["interview_phase"] == "DECIDE_NEXT_STEP"
+    assert root.children[0].expected_value == pytest.approx(1000.0)
+    assert root.expected_value == pytest.approx(1000.0)
+    check_consistency(root)
+
+def test_refresh_only_visits_dirty_path():
+    clean = StrategyNode(name="Clean", probability=0.5, children=[Outcome(name="A", probability=1.0, value=10.0)])
+    active = StrategyNode(name="Active", probability=0.5)
+    root = StrategyNode(name="Root", node_type="decision", children=[clean, active])
+    link_parents(root)
+    enable_consistency_checks(False)
+    compute_ev(root)
+
+    # A stale value on a clean subtree is trusted, proving it is not revisited
+    clean.expected_value = 99.0
+    attach_child(active, Outcome(name="B", probability=1.0, value=20.0))
+    assert refresh_ev(root) == 99.0
+    with pytest.raises(AssertionError, match="EV mismatch"):
+        check_consistency(root)
+
+def test_mark_dirty_propagates_to_root():
+    leaf_parent = StrategyNode(name="Deep", children=[Outcome(name="X", probability=1.0, value=4.0)])
+    middle = StrategyNode(name="Middle", children=[leaf_parent])
+    root = StrategyNode(name="Root", children=[middle])
+    link_parents(root)
+    compute_ev(root)
+    assert not root._ev_dirty
+
+    leaf_parent.children[0] = Outcome(name="X", probability=1.0, value=8.0)
+    mark_dirty(leaf_parent)
+    assert root._ev_dirty and middle._ev_dirty
+    assert refresh_ev(root) == 8.0
+
+def test_deep_copy_relinks_to_the_copy():
+    inner = StrategyNode(name="Inner", children=[Outcome(name="A", probability=1.0, value=1.0)])
+    root = StrategyNode(name="Root", children=[inner])
+    link_parents(root)
+    compute_ev(root)
+
+    copy = root.model_copy(deep=True)
+    attach_child(copy.children[0], Outcome(name="B", probability=0.5, value=100.0))
+    assert not root._ev_dirty and copy._ev_dirty
+    assert refresh_ev(copy) == 51.0
+    assert refresh_ev(root) == 1.0
+
+def test_pickled_navigator_tree_keeps_incremental_links():
+    state = new_state()
+    for text in ["Bond Strategy", "2",
+                 "Long Bonds", "60", "2000",
+                 "Cash", "40", "500",
+                 "Long Bonds", "1",
+                 "Rally", "100", "3000"]:
+        state = send(state, text)
+
+    root = pickle.loads(pickle.dumps(state["root_node"]))
+    assert root == state["root_node"]
+    bonds = root.children[0]
+    attach_child(bonds, Outcome(name="Default", probability=0.0, value=-5000.0))
+    assert root._ev_dirty
+    assert refresh_ev(root) == pytest.approx(3000.0)
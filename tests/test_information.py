@@ -0,0 +1,100 @@
+import random
+import numpy as np
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.compiler import compile_tree, CHANCE
+from src.engine.information import value_of_information
+from tests.helpers import bond_tree, reference_ev, random_tree
+
+def test_bond_example():
+    """Perfect and imperfect information about the bond market in the shared example."""
+    report = value_of_information(bond_tree())
+    [value] = report.values()
+    assert value.path == "Bond Strategy/Long Bonds"
+    assert value.decision == "Bond Strategy"
+    # Knowing a selloff is coming moves the money to Cash: 0.4 * (500 - -500)
+    assert value.evpi == pytest.approx(400.0)
+    assert value.root_evpi == pytest.approx(400.0)
+
+    node = value.node
+    assert report.evsi(node, np.eye(2)) == pytest.approx(400.0)
+    assert report.evsi(node, [[0.5, 0.5], [0.5, 0.5]]) == pytest.approx(0.0)
+    # An 80%-accurate forecast: a "selloff" call has posterior EV
+    # (0.6*0.2*2000 - 0.4*0.8*500) / 0.44 < 500, so it switches to Cash
+    forecast = [[0.8, 0.2], [0.2, 0.8]]
+    expected = 0.44 * 500.0 + (0.6 * 0.8 * 2000.0 - 0.4 * 0.2 * 500.0) - 1000.0
+    assert report.evsi(node, forecast) == pytest.approx(expected)
+
+    with pytest.raises(ValueError, match="distribution"):
+        report.evsi(node, [[0.9, 0.2], [0.2, 0.8]])
+    with pytest.raises(ValueError, match="rows"):
+        report.evsi(node, [[1.0]])
+    with pytest.raises(ValueError, match="not a chance node"):
+        report.evsi(0, np.eye(2))
+
+def test_matches_brute_force_on_random_trees():
+    """EVPI equals re-solving with each outcome revealed; EVSI lies between 0 and EVPI."""
+    def brute_force_evpi(root, node):
+        # Re-solves the nearest decision above `node` once per revealed outcome
+        def decision_ev(reveal):
+            copy = root.model_copy(deep=True)
+            compiled = compile_tree(copy)
+            target = compiled.sources[node]
+            target.children = reveal(target.children)
+            d = int(compiled.parent[node])
+            while compiled.sources[d].node_type != "decision":
+                d = int(compiled.parent[d])
+            return reference_ev(compiled.sources[d])
+
+        children = compile_tree(root).sources[node].children
+        total = 0.0
+        for k, child in enumerate(children):
+            total += child.probability * decision_ev(lambda kids, k=k: [kids[k].model_copy(update={"probability": 1.0})])
+        residual = 1.0 - sum(child.probability for child in children)
+        if residual > 0:
+            total += residual * decision_ev(lambda kids: [])
+        return total - decision_ev(lambda kids: kids)
+
+    rng = random.Random(22)
+    np_rng = np.random.default_rng(22)
+    checked = 0
+    for _ in range(60):
+        root = random_tree(rng, 4)
+        if isinstance(root, Outcome):
+            continue
+        report = value_of_information(root)
+        tree = report.tree
+        for i in range(tree.size):
+            below_decision = report.decision_node[i] >= 0
+            if tree.node_type[i] != CHANCE or not tree.n_children[i] or not below_decision:
+                assert np.isnan(report.evpi[i])
+                continue
+            checked += 1
+            evpi = brute_force_evpi(root, i)
+            assert report.evpi[i] == pytest.approx(max(evpi, 0.0), abs=1e-9)
+
+            rows = tree.n_children[i] + (tree.probability[tree.first_child[i]:][:tree.n_children[i]].sum() < 1.0)
+            assert report.evsi(i, np.eye(rows)) == pytest.approx(report.evpi[i], abs=1e-9)
+            noisy = np_rng.random((rows, 3))
+            noisy /= noisy.sum(axis=1, keepdims=True)
+            assert -1e-9 <= report.evsi(i, noisy) <= report.evpi[i] + 1e-9
+    assert checked > 50
+
+def test_ranking_orders_by_root_gain():
+    """values() lists the chance nodes worth learning about most first."""
+    report = value_of_information(StrategyNode(name="Root", node_type="decision", children=[
+        StrategyNode(name="Big", children=[
+            Outcome(name="Up", probability=0.5, value=100.0),
+            Outcome(name="Down", probability=0.5, value=-60.0),
+        ]),
+        StrategyNode(name="Small", children=[
+            Outcome(name="Up", probability=0.5, value=15.0),
+            Outcome(name="Down", probability=0.5, value=5.0),
+        ]),
+    ]))
+    values = report.values()
+    assert [v.path for v in values] == ["Root/Big", "Root/Small"]
+    # Learning Big's outcome avoids its downside by switching to Small (EV 10)
+    assert values[0].evpi == pytest.approx(0.5 * 100.0 + 0.5 * 10.0 - 20.0)
+    # Small never beats Big's 20 whatever it reveals
+    assert values[1].evpi == 0.0
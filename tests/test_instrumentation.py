@@ -0,0 +1,55 @@
+import json
+import pytest
+from src.engine import instrumentation
+from src.engine.calculator import compute_ev
+from src.engine.memo import SubtreeMemo, compute_ev_shared
+from src.engine.models import StrategyNode, Outcome
+from tests.graph_helpers import new_state, send
+
+@pytest.fixture
+def profiling():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+def scenario():
+    return StrategyNode(name="Root", node_type="decision", children=[
+        StrategyNode(name="Long", children=[
+            Outcome(name="Up", probability=0.5, value=10.0), Outcome(name="Down", probability=0.5, value=-4.0),
+        ]),
+        Outcome(name="Cash", probability=1.0, value=1.0),
+    ])
+
+def test_graph_nodes_and_engine_are_recorded(profiling, tmp_path):
+    state = new_state()
+    for text in ["Plan", "2", "A", "50", "10", "B", "50", "20"]:
+        state = send(state, text)
+    compute_ev(scenario())
+
+    data = instrumentation.stats()
+    for name in ("graph.process_input", "graph.update_tree", "graph.prompt_user"):
+        assert data["spans"][name]["count"] == 8
+    assert data["spans"]["refresh_ev"]["count"] == 2
+    assert data["spans"]["compute_ev"]["count"] == 1
+    assert data["counters"]["compute_ev.nodes"] == 5
+    assert data["counters"]["refresh_ev.nodes"] == 2
+
+    path = tmp_path / "trace.json"
+    assert instrumentation.export_chrome_trace(path) == len(json.loads(path.read_text())["traceEvents"]) > 0
+    assert "graph.update_tree" in instrumentation.format_stats()
+
+def test_cache_hit_rates(profiling):
+    memo = SubtreeMemo()
+    compute_ev_shared(scenario(), memo)
+    compute_ev_shared(scenario(), memo)
+    cache = instrumentation.stats()["caches"]["subtree_memo"]
+    assert cache["hits"] >= 1 and 0 < cache["hit_rate"] <= 1
+
+def test_disabled_records_nothing():
+    instrumentation.reset()
+    compute_ev(scenario())
+    send(new_state(), "Plan")
+    data = instrumentation.stats()
+    assert data["spans"] == {} and data["counters"] == {}
@@ -0,0 +1,104 @@
+import time
+import pytest
+from src.engine.calculator import compute_ev
+from src.engine.compiler import compile_tree, backward_induction, best_children
+from src.engine.core import CoreNode, CoreOutcome, to_core
+from src.engine.lattice import LatticeBuilder, binomial_lattice
+
+# A stock at 100 moves up 10% or down 10% each period; options are struck at 100
+STRIKE = 100.0
+
+def price(ups, steps):
+    return 100.0 * 1.1 ** ups * 0.9 ** (steps - ups)
+
+def test_binomial_matches_expanded_tree():
+    """A call on the lattice is worth the same as on the unrolled tree, with O(n^2) states."""
+    # One period: 0.55 * (110 - 100) + 0.45 * 0
+    assert compute_ev(binomial_lattice(1, 0.55, lambda ups: max(price(ups, 1) - STRIKE, 0.0))) == pytest.approx(5.5)
+    for periods in range(0, 7):
+        lattice = binomial_lattice(periods, 0.55, lambda ups: max(price(ups, periods) - STRIKE, 0.0))
+        assert lattice.size == (periods + 1) * (periods + 2) // 2
+        expanded = lattice.expand()
+        assert compute_ev(lattice) == pytest.approx(compute_ev(expanded))
+
+def test_early_exercise_matches_expanded_tree():
+    """An American put: each state decides between exercising and holding."""
+    periods = 6
+    put = lambda ups, step: max(STRIKE - price(ups, step), 0.0)
+    lattice = binomial_lattice(periods, 0.5, lambda ups: put(ups, periods), exercise=lambda step, ups: put(ups, step))
+    european = binomial_lattice(periods, 0.5, lambda ups: put(ups, periods))
+
+    ev = lattice.solve()
+    expanded = lattice.expand()
+    assert ev[0] == pytest.approx(compute_ev(expanded))
+    assert ev[0] >= compute_ev(european)
+
+    # The root's choice agrees with the tree's
+    policy = lattice.policy(ev)
+    compiled = compile_tree(expanded)
+    chosen = best_children(compiled, backward_induction(compiled))[0]
+    assert lattice.names[policy[0]] == compiled.names[chosen]
+    assert lattice.names[policy[0]] == "Step 0, 0 up: Hold"
+    exercised = [lattice.names[s] for s in range(lattice.size) if policy[s] >= 0 and lattice.names[policy[s]].endswith("Exercise")]
+    assert "Step 3, 0 up" in exercised and "Step 1, 0 up" not in exercised
+
+def test_lattice_as_a_child_of_a_decision():
+    """A lattice under a chance node counts as a leaf worth its solved EV."""
+    periods = 5
+    call = lambda ups: max(price(ups, periods) - STRIKE, 0.0)
+    lattice = binomial_lattice(periods, 0.55, call)
+    lattice.probability = 0.8
+    root = CoreNode("Hedge or hold", "decision", [
+        CoreNode("Hold the option", "chance", [lattice, CoreOutcome("Default", 0.2, 0.0)]),
+        CoreOutcome("Sell now", 1.0, 5.0),
+    ])
+    unrolled = CoreNode("Hedge or hold", "decision", [
+        CoreNode("Hold the option", "chance", [to_core(lattice.expand()), CoreOutcome("Default", 0.2, 0.0)]),
+        CoreOutcome("Sell now", 1.0, 5.0),
+    ])
+    expected = compute_ev(unrolled)
+    assert expected > 5.0
+    assert compute_ev(root) == pytest.approx(expected)
+    assert root.children[0].expected_value == pytest.approx(0.8 * lattice.value)
+    assert compile_tree(root).size == 5
+
+def test_large_lattice_is_quadratic():
+    """400 periods would be 2^400 tree paths; the lattice has 80,601 states."""
+    periods = 400
+    start = time.perf_counter()
+    lattice = binomial_lattice(periods, 0.5, lambda ups: float(ups))
+    ev = lattice.solve()
+    assert time.perf_counter() - start < 10.0
+    assert lattice.size == (periods + 1) * (periods + 2) // 2
+    assert ev[0] == pytest.approx(periods / 2)
+
+def test_builder_decisions_and_validation():
+    """States can be added out of level order; shared states are solved once."""
+    builder = LatticeBuilder()
+    root = builder.add_state(0, "Start", "decision")
+    shared = builder.add_state(2, "Shared", "chance")
+    a = builder.add_state(1, "A", "chance")
+    b = builder.add_state(1, "B", "chance")
+    win = builder.add_state(3, "Win", "outcome", 10.0)
+    lose = builder.add_state(3, "Lose", "outcome", -5.0)
+    builder.add_edge(root, a)
+    builder.add_edge(root, b)
+    builder.add_edge(a, shared, 0.5)
+    builder.add_edge(a, lose, 0.5)
+    builder.add_edge(b, shared, 1.0)
+    builder.add_edge(shared, win, 0.6)
+    builder.add_edge(shared, lose, 0.4)
+    lattice = builder.build()
+
+    assert lattice.names == ["Start", "A", "B", "Shared", "Win", "Lose"]
+    # Shared: 0.6 * 10 + 0.4 * -5 = 4; A: 0.5 * 4 + 0.5 * -5 = -0.5; B: 4
+    assert lattice.solve()[0] == pytest.approx(4.0)
+    assert lattice.names[lattice.policy()[0]] == "B"
+    assert compute_ev(lattice.expand()) == pytest.approx(4.0)
+
+    with pytest.raises(ValueError, match="later level"):
+        builder.add_edge(shared, a)
+    with pytest.raises(ValueError, match="cannot have successors"):
+        builder.add_edge(win, lose)
+    with pytest.raises(ValueError, match="Unknown node type"):
+        builder.add_state(4, "X", "lattice")
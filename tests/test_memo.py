@@ -0,0 +1,83 @@
+import random
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.memo import SubtreeMemo, canonicalize, compute_ev_shared
+from src.engine.batch import BatchStats, evaluate_batch
+from tests.helpers import reference_ev, random_tree
+
+def market_reaction(label):
+    return StrategyNode(name=f"{label} reaction", children=[
+        Outcome(name="Rally", probability=0.6, value=120.0),
+        Outcome(name="Selloff", probability=0.4, value=-80.0),
+    ])
+
+def repeated_tree(n):
+    # Each earnings call leads to the same market reaction under a different name
+    return StrategyNode(name="Earnings season", node_type="decision", children=[
+        StrategyNode(name=f"Call {i}", probability=1.0, children=[
+            market_reaction(f"Q{i}"),
+            Outcome(name="Flat", probability=0.0, value=float(i % 3)),
+        ]) for i in range(n)
+    ])
+
+def test_identical_subtrees_are_shared_regardless_of_names():
+    shared = canonicalize(repeated_tree(30))
+    reactions = [i for i, name in enumerate(shared.tree.names) if name.endswith("reaction")]
+    assert len({int(shared.canonical[i]) for i in reactions}) == 1
+    # root, 3 distinct calls, one reaction, Rally, Selloff, 3 Flat payoffs
+    assert shared.n_unique == 1 + 3 + 1 + 2 + 3
+    assert shared.tree.size == 1 + 30 * 5
+
+def test_shared_ev_matches_compute_ev_and_writes_back():
+    rng = random.Random(9)
+    for _ in range(20):
+        root = random_tree(rng, depth=4)
+        expected = reference_ev(root)
+        assert compute_ev_shared(root) == pytest.approx(expected)
+        if getattr(root, "children", None):
+            assert root.expected_value == pytest.approx(expected)
+    tree = repeated_tree(12)
+    assert compute_ev_shared(tree) == pytest.approx(compute_ev(repeated_tree(12)))
+    assert tree.children[3].children[0].expected_value == pytest.approx(40.0)
+
+def test_memo_reuses_subtrees_across_trees():
+    memo = SubtreeMemo()
+    first = compute_ev_shared(repeated_tree(5), memo)
+    misses = memo.misses
+    # A different tree that contains the same market reaction: its EV comes from the memo
+    other = StrategyNode(name="Hedge", node_type="decision", children=[
+        market_reaction("Hedged"), Outcome(name="Cash", probability=1.0, value=30.0),
+    ])
+    assert compute_ev_shared(other, memo) == pytest.approx(40.0)
+    assert memo.hits >= 1 and memo.misses == misses + 1
+    # The same tree again is a single root hit
+    hits = memo.hits
+    assert compute_ev_shared(repeated_tree(5), memo) == pytest.approx(first)
+    assert memo.hits == hits + 1 and memo.hit_rate > 0
+
+def test_memo_hits_still_write_back_every_node():
+    memo = SubtreeMemo()
+    compute_ev_shared(repeated_tree(5), memo)
+    tree = repeated_tree(5)
+    assert compute_ev(tree, memo=memo) == pytest.approx(compute_ev(repeated_tree(5)))
+    assert tree.expected_value == pytest.approx(40.0)
+    assert tree.children[2].children[0].expected_value == pytest.approx(40.0)
+    assert compute_ev(repeated_tree(3), share=True) == pytest.approx(40.0)
+
+def test_lru_eviction():
+    memo = SubtreeMemo(max_entries=2)
+    memo.put(b"a", 1.0)
+    memo.put(b"b", 2.0)
+    assert memo.get(b"a") == 1.0
+    memo.put(b"c", 3.0)
+    assert memo.get(b"b") is None and memo.get(b"a") == 1.0
+    assert memo.stats() == {"entries": 2, "hits": 2, "misses": 1, "evictions": 1, "hit_rate": 2 / 3}
+
+def test_batch_memo_counts_hits(tmp_path):
+    path = tmp_path / "trees.ndjson"
+    path.write_text("\n".join(repeated_tree(n).model_dump_json() for n in range(2, 12)) + "\n")
+    stats = BatchStats()
+    results = list(evaluate_batch(path, workers=1, stats=stats, memo_size=1000))
+    assert [r.expected_value for r in results] == pytest.approx([compute_ev(repeated_tree(n)) for n in range(2, 12)])
+    assert stats.memo_hits > 0 and "subtree memo" in stats.summary()
@@ -0,0 +1,44 @@
+import asyncio
+from src.engine.narrative import NarrativeCache, NarrativeService, StubBackend, narrative_key, set_service
+from src.engine.session import get_ai_narrative
+
+class FailingBackend:
+    async def complete(self, scenario, best_outcome, ev):
+        raise RuntimeError("rate limited")
+
+def test_concurrent_identical_prompts_share_one_call():
+    backend = StubBackend(delay=0.05)
+    service = NarrativeService(backend, NarrativeCache())
+    texts = asyncio.run(service.narrate_many([("Siege", "Flank", 12.004)] * 5 + [("Siege", "Retreat", 3.0)]))
+    assert backend.calls == 2
+    assert len(set(texts[:5])) == 1 and "Retreat" in texts[5]
+    # Rounded EV hits the cache
+    asyncio.run(service.narrate("Siege", "Flank", 12.0))
+    assert backend.calls == 2 and service.cache.hits == 1
+
+def test_timeouts_and_errors_are_reported_and_not_cached():
+    slow = NarrativeService(StubBackend(delay=1.0), NarrativeCache(), timeout=0.01)
+    assert "timed out" in asyncio.run(slow.narrate("Siege", "Flank", 1.0))
+    failing = NarrativeService(FailingBackend(), NarrativeCache())
+    assert asyncio.run(failing.narrate("Siege", "Flank", 1.0)) == "[AI Analysis Unavailable: rate limited]"
+    assert len(slow.cache) == 0 and len(failing.cache) == 0
+
+def test_cache_persists_evicts_and_expires(tmp_path):
+    path = tmp_path / "narratives.json"
+    cache = NarrativeCache(path, max_entries=2)
+    for name in ("a", "b", "c"):
+        cache.put(narrative_key("S", name, 1.0), name)
+    reloaded = NarrativeCache(path, max_entries=2)
+    assert len(reloaded) == 2 and reloaded.get(narrative_key("S", "a", 1.0)) is None
+    assert reloaded.get(narrative_key("S", "c", 1.0)) == "c"
+    assert NarrativeCache(path, ttl=-1).get(narrative_key("S", "c", 1.0)) is None
+
+def test_sync_api_uses_service():
+    backend = StubBackend()
+    set_service(NarrativeService(backend, NarrativeCache()))
+    try:
+        first = get_ai_narrative("Siege", "Flank", 7.5)
+        assert get_ai_narrative("Siege", "Flank", 7.5) == first
+        assert backend.calls == 1
+    finally:
+        set_service(None)
@@ -0,0 +1,114 @@
+import io
+import random
+import numpy as np
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.compiler import compile_tree, backward_induction, best_children
+from src.engine.parametric import compile_parametric, parameter_grid
+from src.engine.serialization import read_json, read_ndjson, write_json, write_ndjson
+from tests.helpers import reference_ev, random_tree
+
+def test_grid_reports_ev_and_decision_per_row():
+    """Rate scenario: bonds pay off on a cut, Cash earns a yield, both swept over a grid."""
+    root = StrategyNode(name="Rates", node_type="decision", children=[
+        StrategyNode(name="Long Bonds", children=[
+            Outcome(name="Cut", probability=0.5, value=3000.0, probability_param="p_cut"),
+            Outcome(name="Hike", probability=0.5, value=-1000.0, probability_param="p_hike"),
+        ]),
+        Outcome(name="Cash", probability=1.0, value=500.0, value_param="cash_yield"),
+    ])
+    parametric = compile_parametric(root)
+    assert parametric.parameters == ["cash_yield", "p_cut", "p_hike"]
+
+    grid = parameter_grid({"p_cut": [0.1, 0.5, 0.9], "cash_yield": [0.0, 400.0, 2000.0], "p_hike": [0.5]})
+    result = parametric.evaluate(grid)
+    assert len(result) == 9
+    for i in range(9):
+        row = result.row(i)
+        bonds = 3000.0 * row["p_cut"] - 1000.0 * row["p_hike"]
+        assert result.ev[i] == pytest.approx(max(bonds, row["cash_yield"]))
+        assert result.choice_names[i] == ("Long Bonds" if bonds >= row["cash_yield"] else "Cash")
+    # Best row: 3000 * 0.9 - 1000 * 0.5 in bonds, or the 2000 Cash yield
+    assert result.ev[result.best_row()] == pytest.approx(2200.0)
+    assert result.row(result.best_row())["p_cut"] == 0.9
+
+    # Scalars broadcast against sampled columns; matrices are taken in parameter order
+    sampled = parametric.evaluate({"p_cut": np.linspace(0, 1, 5), "p_hike": 0.5, "cash_yield": 500.0})
+    matrix = parametric.evaluate(sampled.values)
+    assert np.array_equal(sampled.ev, matrix.ev)
+
+def test_rows_match_substituted_trees():
+    """Each row's EV and choice equal those of the tree with that row's values written in."""
+    rng = random.Random(20)
+    np_rng = np.random.default_rng(20)
+
+    def substituted(node, row):
+        if isinstance(node, Outcome):
+            return Outcome(
+                name=node.name,
+                probability=row[node.probability_param] if node.probability_param else node.probability,
+                value=row[node.value_param] if node.value_param else node.value,
+            )
+        return StrategyNode(name=node.name, node_type=node.node_type, probability=node.probability,
+                            children=[substituted(child, row) for child in node.children])
+
+    for _ in range(60):
+        root = random_tree(rng, 5)
+        if isinstance(root, Outcome):
+            continue
+        # Bind about a third of the outcome fields to one of three shared parameters
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Outcome):
+                if rng.random() < 0.3:
+                    node.probability_param = rng.choice("abc")
+                if rng.random() < 0.3:
+                    node.value_param = rng.choice("abc")
+            else:
+                stack.extend(node.children)
+
+        parametric = compile_parametric(root)
+        rows = {name: np_rng.random(7) for name in parametric.parameters}
+        result = parametric.evaluate(rows)
+        assert len(result) == (7 if parametric.parameters else 1)
+
+        for i in range(len(result)):
+            plain = substituted(root, result.row(i))
+            assert result.ev[i] == pytest.approx(reference_ev(plain))
+            compiled = compile_tree(plain)
+            if parametric.decision >= 0:
+                assert result.choice[i] == best_children(compiled, backward_induction(compiled))[parametric.decision]
+
+def test_invalid_parameter_rows():
+    """Missing, unknown and out-of-range parameters are reported by name."""
+    root = StrategyNode(name="Hedge", children=[
+        Outcome(name="Cut", probability=0.5, value=3000.0, probability_param="p_cut"),
+        Outcome(name="Hike", probability=0.5, value=-1000.0, probability_param="p_hike"),
+    ])
+    parametric = compile_parametric(root)
+    with pytest.raises(ValueError, match="missing"):
+        parametric.evaluate({"p_cut": [0.5]})
+    with pytest.raises(ValueError, match="unknown"):
+        parametric.evaluate({"p_cut": 0.5, "p_hike": 0.5, "typo": 1.0})
+    with pytest.raises(ValueError, match="p_hike"):
+        parametric.evaluate({"p_cut": 0.5, "p_hike": 1.5})
+    with pytest.raises(ValueError, match="columns"):
+        parametric.evaluate(np.zeros((4, 3)))
+
+def test_parameters_survive_serialization():
+    """Parameter names round-trip through JSON and NDJSON and are omitted when unset."""
+    root = StrategyNode(name="Rates", node_type="decision", children=[
+        Outcome(name="Cut", probability=0.5, value=3000.0, probability_param="p_cut"),
+        Outcome(name="Cash", probability=1.0, value=500.0, value_param="cash_yield"),
+    ])
+    out = io.StringIO()
+    write_json(root, out)
+    assert out.getvalue() == root.model_dump_json()
+    assert read_json(io.StringIO(out.getvalue())) == root
+    assert '"value_param"' not in Outcome(name="Plain", probability=1.0, value=1.0).model_dump_json()
+
+    out = io.StringIO()
+    write_ndjson(root, out)
+    assert read_ndjson(io.StringIO(out.getvalue())) == root
+    assert StrategyNode.model_validate_json(root.model_dump_json()) == root
@@ -0,0 +1,147 @@
+import random
+import pytest
+from src.engine.models import Outcome
+from src.engine.calculator import compute_ev
+from src.engine.incremental import check_consistency, refresh_ev
+from src.engine import persistent
+from src.engine.persistent import FrozenNode, FrozenOutcome, History, freeze, thaw
+from src.engine.tree_index import tree_index
+from tests.helpers import bond_tree, reference_ev, random_tree
+from tests.graph_helpers import new_state, send
+
+def test_freeze_and_thaw_round_trip():
+    """Freezing computes the same EVs as the model tree, and thawing gives the tree back."""
+    frozen = freeze(bond_tree())
+    # Long Bonds: 0.6 * 2000 + 0.4 * -500 = 1000, better than 500 in Cash
+    assert frozen.expected_value == pytest.approx(1000.0)
+    assert frozen.children[0].expected_value == pytest.approx(1000.0)
+
+    rng = random.Random(19)
+    for _ in range(100):
+        tree = random_tree(rng, 6)
+        frozen = freeze(tree)
+        if isinstance(tree, Outcome):
+            assert frozen.value == tree.value
+            continue
+        assert (frozen.expected_value or 0.0) == pytest.approx(reference_ev(tree))
+        copy = thaw(frozen)
+        compute_ev(tree)
+        assert copy == tree
+
+def test_path_copying_shares_untouched_subtrees():
+    """An edit copies only the path from the root; every other subtree is reused."""
+    left = FrozenNode("Left", children=[FrozenOutcome("A", 0.5, 10.0), FrozenOutcome("B", 0.5, 20.0)], probability=0.5)
+    right = FrozenNode("Right", children=[FrozenOutcome("C", 1.0, 4.0)], probability=0.5)
+    root = FrozenNode("Root", "decision", [left, right])
+    # Left: 0.5 * 10 + 0.5 * 20 beats Right's 4
+    assert root.expected_value == 15.0
+
+    edited = persistent.append(root, (1,), FrozenOutcome("D", 0.0, 100.0))
+    assert edited is not root and edited.children[0] is left
+    assert edited.children[1].children[0] is right.children[0]
+    assert len(right.children) == 1 and root.expected_value == 15.0
+
+    promoted = persistent.replace(edited, (0, 1), FrozenNode("B", children=[FrozenOutcome("E", 1.0, 40.0)], probability=0.5))
+    # Left becomes 0.5 * 10 + 0.5 * 40
+    assert promoted.expected_value == 25.0
+    assert promoted.children[1] is edited.children[1]
+    assert persistent.get(promoted, (0, 1, 0)).value == 40.0
+
+    assert persistent.diff(root, root) == []
+    assert sorted(persistent.diff(root, promoted)) == [(0, 1), (1, 1)]
+    with pytest.raises(Exception):
+        root.name = "Other"
+
+def test_patch_rebuilds_only_the_changed_subtrees():
+    """Moving a live tree between versions keeps the nodes both versions share."""
+    left = FrozenNode("Left", children=[FrozenOutcome("A", 0.5, 10.0), FrozenOutcome("B", 0.5, 20.0)], probability=0.5)
+    right = FrozenNode("Right", children=[FrozenOutcome("C", 1.0, 4.0)], probability=0.5)
+    v0 = FrozenNode("Root", "decision", [left, right])
+    v1 = persistent.append(v0, (1,), FrozenOutcome("D", 0.0, 100.0))
+    v2 = persistent.replace(v1, (0, 1), FrozenNode("B", children=[FrozenOutcome("E", 1.0, 40.0)], probability=0.5))
+
+    live = thaw(v0)
+    index = tree_index(live)
+    kept = live.children[0].children[0]
+    for before, after in [(v0, v2), (v2, v1), (v1, v0), (v0, v1)]:
+        persistent.patch(index, before, after)
+        refresh_ev(live)
+        check_consistency(live)
+        assert live == thaw(after)
+        assert live.children[0].children[0] is kept
+        assert index.node("Right/C") is live.children[1].children[0]
+    with pytest.raises(ValueError):
+        persistent.patch(index, v1, FrozenNode("Other"))
+
+def test_history_undo_redo_and_tags():
+    """Undo and redo step through versions; committing after an undo drops the redo branch."""
+    v0 = FrozenNode("Root", "decision")
+    history = History(v0, meta={"count": 0})
+    v1 = persistent.append(v0, (), FrozenOutcome("A", 1.0, 5.0))
+    history.commit(v1, (), "add A", {"count": 1})
+    history.tag("base")
+    v2 = persistent.append(v1, (), FrozenOutcome("B", 1.0, 9.0))
+    history.commit(v2, (), "add B")
+
+    assert history.current.root.expected_value == 9.0
+    assert history.undo().root is v1
+    assert history.undo().meta == {"count": 0}
+    assert history.undo() is None
+    assert history.redo().root is v1
+    history.commit(persistent.append(v1, (), FrozenOutcome("C", 1.0, 1.0)))
+    assert not history.can_redo
+    assert history.tagged("base").label == "add A"
+
+    capped = History(v0, max_versions=2)
+    for root in (v1, v2):
+        capped.commit(root)
+    assert capped.undo().root is v1
+    assert capped.undo() is None
+
+def test_navigator_undo_and_redo():
+    """'undo'/'redo' in the interview restore the tree, the active node and the counters."""
+    state = new_state()
+    for text in ["Bond Strategy", "2",
+                 "Long Bonds", "60", "2000",
+                 "Cash", "40", "500",
+                 "Long Bonds", "2",
+                 "Rally", "50", "3000",
+                 "Selloff", "50", "-1000"]:
+        state = send(state, text)
+    assert state["root_node"].expected_value == pytest.approx(1000.0)
+    assert len(state["history"]) == 6
+
+    cash = state["root_node"].children[1]
+    state = send(state, "undo")
+    root = state["root_node"]
+    # The working tree is patched in place; untouched subtrees are kept
+    assert root.children[1] is cash
+    assert [c.name for c in root.children[0].children] == ["Rally"]
+    # Without Selloff, Long Bonds is worth 0.5 * 3000
+    assert root.expected_value == pytest.approx(1500.0)
+    assert state["active_parent_node"] is root.children[0]
+    assert state["current_node_path"] == ["Long Bonds"]
+    assert state["running_prob_total"] == pytest.approx(0.5)
+    assert (state["target_count"], state["current_index"]) == (2, 1)
+    check_consistency(root)
+
+    state = send(state, "undo")
+    state = send(state, "undo")
+    assert isinstance(state["root_node"].children[0], Outcome)
+    assert state["active_parent_node"] is state["root_node"]
+    check_consistency(state["root_node"])
+
+    state = send(state, "redo")
+    state = send(state, "redo")
+    state = send(state, "redo")
+    assert state["root_node"].expected_value == pytest.approx(1000.0)
+    assert state["running_prob_total"] == pytest.approx(1.0)
+    assert send(state, "redo")["root_node"] is state["root_node"]
+
+    # Editing after a restore keeps working tree and history in step
+    state = send(state, "Selloff")
+    for text in ["1", "Hold", "100", "800"]:
+        state = send(state, text)
+    frozen = state["history"].current.root
+    assert frozen.expected_value == pytest.approx(state["root_node"].expected_value)
+    assert persistent.get(frozen, (0, 1, 0)).name == "Hold"
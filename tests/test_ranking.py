@@ -0,0 +1,79 @@
+import random
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.incremental import attach_child, refresh_ev, link_parents, mark_dirty
+from src.engine.ranking import ranking_of, top_children, weighted_ev
+from src.agents.graph import format_recommendations
+from tests.graph_helpers import new_state, send
+
+def full_sort(node, k):
+    children = [c for c in node.children if weighted_ev(c) is not None]
+    return sorted(children, key=weighted_ev, reverse=True)[:k]
+
+def test_updates_match_a_full_sort():
+    rng = random.Random(5)
+    children = [StrategyNode(name=f"Move {i}", probability=rng.random(), expected_value=rng.choice([None, 1.0, rng.uniform(-9, 9)]))
+                for i in range(300)]
+    node = StrategyNode(name="Sweep", node_type="decision", children=children)
+    index = ranking_of(node)
+    for _ in range(2000):
+        child = rng.choice(children)
+        child.expected_value = rng.choice([None, 1.0, rng.uniform(-9, 9)])
+        index.update(child)
+        k = rng.randint(1, 10)
+        assert index.top(k) == full_sort(node, k)
+    assert ranking_of(node) is index
+
+def test_navigator_keeps_the_index_across_steps():
+    state = new_state()
+    for text in ["Plan", "3", "A", "30", "10", "B", "30", "50", "C", "40", "20"]:
+        state = send(state, text)
+    root = state["root_node"]
+    index = root._ranking
+    assert index is not None and [c.name for c in index.top(3)] == ["B", "C", "A"]
+
+    # Drill into A: the new node is unranked until it has outcomes, then keeps A's tie order
+    for text in ["A", "1", "Jackpot", "100", "200"]:
+        state = send(state, text)
+    assert root._ranking is index
+    assert [c.name for c in top_children(root, 3)] == ["A", "B", "C"]
+    assert format_recommendations(root).startswith("The optimal move is [A] with an EV of [60.00]")
+
+def test_compute_ev_invalidates_and_wide_nodes_stay_correct():
+    rng = random.Random(1)
+    root = StrategyNode(name="Sweep", node_type="decision", children=[
+        StrategyNode(name=f"Param {i}", children=[Outcome(name="Payoff", probability=1.0, value=rng.uniform(0, 100))])
+        for i in range(100_000)
+    ])
+    compute_ev(root)
+    link_parents(root)
+    assert top_children(root, 3) == full_sort(root, 3)
+
+    # One parameter improves: only its path is recomputed and re-ranked
+    target = root.children[777]
+    attach_child(target, Outcome(name="Bonus", probability=1.0, value=500.0))
+    refresh_ev(root)
+    assert top_children(root, 1) == [target]
+    assert top_children(root, 5) == full_sort(root, 5)
+
+def test_children_replaced_in_place_are_reranked():
+    root = StrategyNode(name="Plan", node_type="decision", children=[
+        Outcome(name="A", probability=1.0, value=10.0),
+        Outcome(name="B", probability=1.0, value=20.0),
+        Outcome(name="C", probability=1.0, value=5.0),
+    ])
+    link_parents(root)
+    compute_ev(root)
+    assert format_recommendations(root).startswith("The optimal move is [B] with an EV of [20.00]")
+
+    root.children[1] = Outcome(name="B2", probability=1.0, value=1.0)
+    mark_dirty(root)
+    refresh_ev(root)
+    assert [c.name for c in top_children(root, 3)] == ["A", "C", "B2"]
+    assert "[B]" not in format_recommendations(root)
+
+    # A changed Outcome value is picked up the same way
+    root.children[2].value = 50.0
+    mark_dirty(root)
+    refresh_ev(root)
+    assert top_children(root, 1) == [root.children[2]]
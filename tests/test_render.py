@@ -0,0 +1,141 @@
+import io
+import subprocess
+import sys
+from pathlib import Path
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.compiler import backward_induction, compile_tree
+from src.engine.render import render_tree, _WRITE_BUFFER
+from src.engine.serialization import write_json
+from src.engine.session import render_ascii_tree
+from src.cli import main
+from benchmarks.generators import balanced, deep, wide
+
+def bond_scenario():
+    """
+    The bond example with a Selloff below 1% (hidden by min_probability) and
+    a move not analyzed yet (no EV, so it ranks last).
+    """
+    root = StrategyNode(name="Bond Strategy", node_type="decision", children=[
+        StrategyNode(name="Long Bonds", children=[
+            Outcome(name="Rally", probability=0.6, value=2000.0),
+            Outcome(name="Selloff", probability=0.004, value=-500.0),
+            Outcome(name="Flat", probability=0.396, value=0.0),
+        ]),
+        Outcome(name="Cash", probability=1.0, value=500.0),
+        StrategyNode(name="Later"),
+    ])
+    compute_ev(root)
+    return root
+
+def render(root, **options):
+    """The rendered text, after checking render_tree counted its lines."""
+    out = io.StringIO()
+    lines = render_tree(root, out, **options)
+    text = out.getvalue()
+    assert text.count("\n") == lines
+    return text
+
+def test_full_tree():
+    """Every node with its probability, payoff and EV contribution."""
+    # Long Bonds: 0.6 * 2000 + 0.004 * -500 + 0.396 * 0 = 1198, better than Cash
+    assert render(bond_scenario()) == (
+        "Scenario: Bond Strategy | EV: 1198.00\n"
+        "├── (P=1.00, Payoff=1198.00) -> Long Bonds [chance] | EV: 1198.00\n"
+        "│   ├── (P=0.60, Payoff=2000.00) -> Rally | EV: 1200.00\n"
+        "│   ├── (P=0.00, Payoff=-500.00) -> Selloff | EV: -2.00\n"
+        "│   └── (P=0.40, Payoff=0.00) -> Flat | EV: 0.00\n"
+        "├── (P=1.00, Payoff=500.00) -> Cash | EV: 500.00\n"
+        "└── (P=1.00, Payoff=n/a) -> Later [chance] | EV: n/a\n"
+    )
+
+def test_top_k_collapse_and_depth_limit():
+    """Hidden children are summed up on one line; a depth limit counts what it cuts."""
+    text = render(bond_scenario(), top_k=1, min_probability=0.01)
+    assert text.splitlines()[2:] == [
+        "│   ├── (P=0.60, Payoff=2000.00) -> Rally | EV: 1200.00",
+        "│   └── … 1 below P=0.01 and 1 lower-ranked hidden (P=0.40, EV contribution -2.00)",
+        "└── … 2 lower-ranked hidden (best EV 500.00)",
+    ]
+    # Unevaluated children rank last
+    assert "Later" not in render(bond_scenario(), top_k=2)
+
+    text = render(bond_scenario(), max_depth=1)
+    assert "Long Bonds [chance] | EV: 1198.00 [+3 not shown]" in text
+    assert "Rally" not in text
+    assert render(bond_scenario(), max_depth=0) == "Scenario: Bond Strategy | EV: 1198.00\n"
+
+def test_render_ascii_tree_shows_unevaluated_nodes():
+    """The session view renders one level and marks nodes without an EV."""
+    root = StrategyNode(name="Plan", children=[StrategyNode(name="Pending", probability=0.5)])
+    assert "-> Pending [chance] | EV: n/a" in render_ascii_tree(root)
+    assert render_ascii_tree(StrategyNode(name="Empty")) == "No outcomes to display."
+
+def test_streams_large_trees_in_bounded_chunks():
+    """Output is written as it is produced, in chunks of about _WRITE_BUFFER characters."""
+    class RecordingStream(io.StringIO):
+        def __init__(self):
+            super().__init__()
+            self.sizes = []
+
+        def write(self, text):
+            self.sizes.append(len(text))
+            return super().write(text)
+
+    root = balanced(10, 5, seed=1)
+    compute_ev(root)
+    out = RecordingStream()
+    lines = render_tree(root, out)
+    # 10 children per node over 5 levels, plus the root
+    assert lines == sum(10 ** k for k in range(6))
+    assert out.sizes[0] < 100  # the header goes out before anything else is rendered
+    assert len(out.sizes) > 10 and max(out.sizes) < _WRITE_BUFFER + 1000
+
+    # Deep chains render iteratively, and a depth limit keeps output small
+    chain = deep(20_000, seed=2)
+    compute_ev(chain)
+    assert render_tree(chain, io.StringIO(), max_depth=50) == 1 + 2 * 50
+
+def test_cli_render(tmp_path, capsys):
+    """`render` with --top and --depth on a JSON file."""
+    path = tmp_path / "tree.json"
+    with open(path, "w") as handle:
+        write_json(bond_scenario(), handle)
+    assert main(["render", str(path), "--top", "1", "--depth", "1"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "Scenario: Bond Strategy | EV: 1198.00",
+        "├── (P=1.00, Payoff=1198.00) -> Long Bonds [chance] | EV: 1198.00 [+3 not shown]",
+        "└── … 2 lower-ranked hidden (best EV 500.00)",
+    ]
+
+def test_compiled_tree_renders_like_the_node_tree():
+    """A CompiledTree with its solved EVs renders the same text as the nodes it came from."""
+    root = bond_scenario()
+    tree = compile_tree(root)
+    options = [{}, {"top_k": 1, "min_probability": 0.01}, {"max_depth": 1}]
+    for kwargs in options:
+        assert render(tree, expected_values=backward_induction(tree), **kwargs) == render(root, **kwargs)
+    assert "Scenario: Bond Strategy | EV: n/a" in render(tree)
+
+def test_compiled_wide_node_keeps_only_the_top_children():
+    """top_k and min_probability pick the same children from 2,000 compiled siblings."""
+    root = wide(2000, seed=5)
+    compute_ev(root)
+    tree = compile_tree(root)
+    for kwargs in [{"top_k": 3}, {"top_k": 3, "min_probability": 0.0006}, {"min_probability": 0.0006}]:
+        assert render(tree, expected_values=backward_induction(tree), **kwargs) == render(root, **kwargs)
+
+def test_cli_render_exits_quietly_on_a_closed_pipe(tmp_path):
+    """`render | head` stops with status 141 (SIGPIPE) and no traceback."""
+    path = tmp_path / "tree.json"
+    root = balanced(10, 5, seed=1)
+    with open(path, "w") as handle:
+        write_json(root, handle)
+    process = subprocess.Popen(
+        [sys.executable, "-c", f"import sys; from src.cli import main; sys.exit(main(['render', {str(path)!r}]))"],
+        cwd=Path(__file__).resolve().parent.parent, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    assert process.stdout.readline().startswith(b"Scenario:")
+    process.stdout.close()
+    assert process.wait() == 141
+    assert process.stderr.read() == b""
@@ -0,0 +1,122 @@
+import random
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.compiler import compile_tree, backward_induction, best_children
+from src.engine.core import CoreOutcome
+from src.engine.search import LazyNode, branch_and_bound, materialize
+from tests.helpers import reference_ev, random_tree
+
+@pytest.mark.parametrize("slack", [0.0, 5.0, 50.0])
+def test_matches_exhaustive_evaluation(slack):
+    """Pruning never changes the root EV or the chosen move, however loose the bounds."""
+    rng = random.Random(18)
+
+    def lazy_copy(node):
+        # Valid bounds up to `slack` away from the true EV on either side
+        if isinstance(node, Outcome):
+            return node
+        ev = reference_ev(node)
+        return LazyNode(
+            node.name,
+            lambda: [lazy_copy(child) for child in node.children],
+            node_type=node.node_type,
+            probability=node.probability,
+            lower=ev - rng.uniform(0, slack),
+            upper=ev + rng.uniform(0, slack),
+        )
+
+    for _ in range(200):
+        tree = random_tree(rng, 6)
+        if isinstance(tree, Outcome):
+            continue
+        result = branch_and_bound(lazy_copy(tree))
+        assert result.value == pytest.approx(reference_ev(tree))
+
+        if tree.node_type == "decision" and tree.children:
+            compiled = compile_tree(tree)
+            chosen = best_children(compiled, backward_induction(compiled))[0]
+            assert result.choice.name == compiled.names[chosen]
+            assert result.choice.probability == compiled.probability[chosen]
+
+def test_unbounded_nodes_are_all_expanded():
+    """Without declared bounds there is nothing to prune: every StrategyNode is expanded."""
+    root = StrategyNode(name="Root", node_type="decision", children=[
+        StrategyNode(name="Hedge", probability=1.0, children=[
+            Outcome(name="Up", probability=0.6, value=10.0),
+            StrategyNode(name="Down", probability=0.4, children=[
+                Outcome(name="Recover", probability=0.5, value=2.0),
+                Outcome(name="Default", probability=0.5, value=-20.0),
+            ]),
+        ]),
+        Outcome(name="Cash", probability=1.0, value=1.0),
+    ])
+    result = branch_and_bound(root)
+    # Hedge: 0.6 * 10 + 0.4 * (0.5 * 2 + 0.5 * -20) = 2.4, better than Cash
+    assert result.value == pytest.approx(2.4)
+    assert result.choice.name == "Hedge"
+    assert result.expanded == 3
+
+def test_prunes_generated_tree():
+    """A decision over 10 moves per level; each move scores up to 10 and costs 1 to look at."""
+    def options(depth, value=0.0):
+        if depth == 0:
+            return [Outcome(name="End", probability=1.0, value=value)]
+        return [
+            LazyNode(
+                f"Move {move}",
+                lambda move=move: options(depth - 1, value + move),
+                node_type="decision",
+                lower=value + move,
+                upper=value + move + 9.0 * (depth - 1),
+            )
+            for move in range(10)
+        ]
+
+    root = LazyNode("Root", lambda: options(6), node_type="decision", lower=0.0, upper=54.0)
+    result = branch_and_bound(root)
+
+    # The full tree has 10**6 paths; bounds lead straight down the best one
+    assert result.value == 54.0
+    assert result.choice.name == "Move 9"
+    assert result.expanded <= 10
+    assert result.pruned > 0
+    assert "nodes expanded" in result.summary()
+
+def test_chance_nodes_stop_once_they_cannot_win():
+    """Star1: a chance node stops when its remaining upper bounds cannot beat the best sibling."""
+    safe = LazyNode("Safe", lambda: [Outcome(name="Hold", probability=1.0, value=10.0)], lower=10.0, upper=60.0)
+    expansions = []
+
+    def risky():
+        expansions.append(1)
+        return [
+            Outcome(name="Bust", probability=0.5, value=-100.0),
+            LazyNode("Deep", lambda: pytest.fail("should be pruned"), probability=0.5, lower=0.0, upper=100.0),
+        ]
+
+    root = LazyNode("Root", lambda: [safe, LazyNode("Risky", risky, upper=50.0)], node_type="decision")
+    result = branch_and_bound(root)
+    # Risky is at most 0.5 * -100 + 0.5 * 100 = 0 once Bust is known, below Safe's 10
+    assert result.value == 10.0
+    assert result.choice is safe
+    assert expansions == [1]
+    assert result.pruned == 1
+
+def test_compute_ev_and_materialize():
+    """compute_ev dispatches LazyNodes to branch and bound; materialize builds the full tree."""
+    root = LazyNode("Root", lambda: [
+        Outcome(name="A", probability=0.25, value=8.0),
+        LazyNode("B", lambda: [CoreOutcome("C", 1.0, 4.0)], probability=0.75),
+    ])
+    # 0.25 * 8 + 0.75 * 4
+    assert compute_ev(root) == pytest.approx(5.0)
+    assert root.expected_value == pytest.approx(5.0)
+
+    full = materialize(root)
+    assert [child.name for child in full.children] == ["A", "B"]
+    assert full.children[1].children[0].value == 4.0
+    assert compute_ev(full) == pytest.approx(5.0)
+
+    with pytest.raises(ValueError):
+        LazyNode("Bad", list, lower=1.0, upper=0.0)
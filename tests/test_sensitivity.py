@@ -0,0 +1,54 @@
+import random
+import pytest
+from src.engine.compiler import compile_tree, backward_induction
+from src.engine.sensitivity import sensitivity_analysis, format_tornado
+from tests.helpers import bond_tree, random_tree
+
+def test_gradients_and_break_even():
+    report = sensitivity_analysis(bond_tree())
+    assert report.root_ev == pytest.approx(1000.0)
+    params = {(p.path, p.kind): p for p in report.parameters()}
+
+    rally = params[("Bond Strategy/Long Bonds/Rally", "value")]
+    assert rally.gradient == pytest.approx(0.6)
+    assert rally.decision == "Bond Strategy"
+    # Long Bonds stays optimal until its EV drops to Cash's 500
+    assert rally.break_even == pytest.approx(2000.0 - 500.0 / 0.6)
+
+    cash = params[("Bond Strategy/Cash", "value")]
+    assert cash.gradient == 0.0
+    assert cash.break_even == pytest.approx(1000.0)
+
+    rally_prob = params[("Bond Strategy/Long Bonds/Rally", "probability")]
+    assert rally_prob.gradient == pytest.approx(2000.0)
+    assert rally_prob.break_even == pytest.approx(0.6 - 500.0 / 2000.0)
+    # Probabilities of a decision node's children never enter the EV
+    assert ("Bond Strategy/Cash", "probability") not in params
+
+def test_gradients_match_finite_differences():
+    rng = random.Random(11)
+    for _ in range(50):
+        tree = compile_tree(random_tree(rng, 5))
+        report = sensitivity_analysis(tree)
+        for param in report.parameters():
+            array = tree.payoff if param.kind == "value" else tree.probability
+            base = array[param.node]
+            array[param.node] = base + 1e-6
+            up = backward_induction(tree)[0]
+            array[param.node] = base - 1e-6
+            down = backward_induction(tree)[0]
+            array[param.node] = base
+            assert (up - down) / 2e-6 == pytest.approx(param.gradient, abs=1e-4)
+
+def test_tornado_ranking():
+    report = sensitivity_analysis(bond_tree())
+    bars = report.tornado(swing=0.1, probability_swing=0.05, top=3)
+    assert [(b.path, b.kind) for b in bars] == [
+        ("Bond Strategy/Long Bonds/Rally", "value"),
+        ("Bond Strategy/Long Bonds/Rally", "probability"),
+        ("Bond Strategy/Long Bonds/Selloff", "probability"),
+    ]
+    assert bars[0].low == pytest.approx(1000.0 - 0.6 * 200.0)
+    text = format_tornado(bars, report.root_ev)
+    assert text.splitlines()[0] == "Tornado: base EV 1000.00"
+    assert "[880.00, 1120.00]" in text
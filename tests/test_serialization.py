@@ -0,0 +1,101 @@
+import io
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.compiler import backward_induction, compile_tree
+from src.engine.serialization import (
+    load_compiled, read_json, read_ndjson, save_compiled, tree_from_compiled, write_binary, write_json, write_ndjson
+)
+
+def sample_tree():
+    root = StrategyNode(name="Rate \"Shock\" Plan", node_type="decision", children=[
+        StrategyNode(name="Hedge ✓", probability=1.0, children=[
+            Outcome(name="Cut", probability=0.25, value=120.5),
+            Outcome(name="Hold", probability=0.5, value=-3e-4),
+            StrategyNode(name="Hike", probability=0.25, node_type="decision", children=[
+                Outcome(name="Roll", probability=1.0, value=-40.0),
+                Outcome(name="Close", probability=1.0, value=-55.0),
+            ]),
+        ]),
+        StrategyNode(name="Drill Later", probability=1.0),
+        Outcome(name="Do Nothing", probability=1.0, value=0.0),
+    ])
+    compute_ev(root)
+    return root
+
+def test_streaming_json_matches_pydantic():
+    root = sample_tree()
+    out = io.StringIO()
+    write_json(root, out)
+    assert out.getvalue() == root.model_dump_json()
+
+    # A tiny chunk size splits strings, numbers and literals across reads
+    restored = read_json(io.StringIO(out.getvalue()), chunk_size=7)
+    assert restored == root
+    assert restored.model_dump_json() == root.model_dump_json()
+
+def test_ndjson_round_trip():
+    root = sample_tree()
+    out = io.StringIO()
+    assert write_ndjson(root, out) == 9
+    restored = read_ndjson(io.StringIO(out.getvalue()))
+    assert restored == root
+
+def test_binary_round_trip_and_mmap_evaluation(tmp_path):
+    root = sample_tree()
+    path = tmp_path / "tree.gmt"
+    write_binary(root, path)
+
+    tree = load_compiled(path)
+    compiled = compile_tree(root)
+    for column in ("parent", "node_type", "probability", "payoff", "level_offsets", "first_child", "n_children"):
+        assert getattr(tree, column).tolist() == getattr(compiled, column).tolist()
+    assert list(tree.names) == compiled.names
+    assert backward_induction(tree)[0] == pytest.approx(root.expected_value)
+
+    restored = tree_from_compiled(tree, backward_induction(tree))
+    assert restored == root
+
+    save_compiled(tree, tmp_path / "copy.gmt")
+    assert (tmp_path / "copy.gmt").read_bytes() == path.read_bytes()
+    assert load_compiled(path, use_mmap=False).names[-1] == "Close"
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_load_compiled_rejects_files_shorter_than_the_header(tmp_path, use_mmap):
+    path = tmp_path / "short.gmt"
+    path.write_bytes(b"GM")
+    with pytest.raises(ValueError, match="not a GrandMaster binary tree"):
+        load_compiled(path, use_mmap=use_mmap)
+
+def test_read_json_rejects_garbage():
+    with pytest.raises(ValueError):
+        read_json(io.StringIO('{"name": "Broken", ???}'))
+
+@pytest.mark.parametrize("text", [
+    '{"name" "x","probability":0.5,"value":1}',
+    '{"name":"x","children":[1]}',
+    '{"name":"x","children":5}',
+    '{}',
+    '{"name":"x","children":[}',
+    '{"name":"x","children":[{"name":"a","probability":0.5,"value":1}]',
+    '{"name":"x","children":[{"name":"a","probability":0.5,"value":1},]}',
+    '{"name":"x"} {"name":"y"}',
+    '{"name":"x","children":[{"name":"a","probability":[],"value":1}]}',
+    '',
+])
+@pytest.mark.parametrize("core", [False, True])
+def test_read_json_raises_value_error_on_malformed_input(text, core):
+    with pytest.raises(ValueError):
+        read_json(io.StringIO(text), chunk_size=5, core=core)
+
+@pytest.mark.parametrize("text, line", [
+    ('{"id":0,"parent":-1,"kind":"chance","probability":1}\n', 1),
+    ('{"id":0,"parent":-1,"name":"r","kind":"chance","probability":1}\n'
+     '{"id":1,"parent":0,"name":"o","kind":"outcome","probability":1}\n', 2),
+    ('\n[1]\n', 2),
+    ('{"id":0,"parent":-1,"name":"r","kind":"chance","probability":1}\n{oops\n', 2),
+])
+@pytest.mark.parametrize("core", [False, True])
+def test_read_ndjson_reports_the_bad_line(text, line, core):
+    with pytest.raises(ValueError, match=f"NDJSON line {line}:"):
+        read_ndjson(io.StringIO(text), core=core)
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from src.agents.server import (
+    CheckpointStore, NavigatorServer, MemoryCheckpointStore, SQLiteCheckpointStore, decode_state, encode_state,
+    initial_state
+)
+from src.engine.calculator import compute_ev
+from benchmarks.generators import deep
+
+def interview(name, payoff):
+    return [name, "2", "Attack", "60", str(payoff), "Hold", "40", "100"]
+
+async def run_sessions(store):
+    server = NavigatorServer(store=store, max_concurrency=4)
+    ids = [(await server.open_session(f"s{i}"))[0] for i in range(6)]
+
+    async def drive(i):
+        for text in interview(f"Plan {i}", 1000 * i):
+            await server.send(ids[i], text)
+
+    await asyncio.gather(*(drive(i) for i in range(6)))
+    states = [await server.state(i) for i in ids]
+    return server, states
+
+@pytest.mark.parametrize("store", [MemoryCheckpointStore, SQLiteCheckpointStore])
+def test_sessions_are_isolated(store):
+    server, states = asyncio.run(run_sessions(store()))
+    for i, state in enumerate(states):
+        assert state["root_node"].name == f"Plan {i}"
+        assert state["interview_phase"] == "DECIDE_NEXT_STEP"
+        assert state["root_node"].expected_value == pytest.approx(max(1000 * i, 100))
+    metrics = server.metrics()
+    assert metrics["steps"] == 6 * 9 and 0 < metrics["p50_ms"] <= metrics["p99_ms"]
+
+def test_sqlite_store_restores_drill_down(tmp_path):
+    path = str(tmp_path / "sessions.db")
+
+    async def first_half():
+        server = NavigatorServer(store=SQLiteCheckpointStore(path))
+        await server.open_session("a")
+        for text in interview("Bond Strategy", 2000) + ["Attack"]:
+            prompt = await server.send("a", text)
+        return prompt
+
+    async def second_half():
+        # A fresh server on the same database picks the session up where it stopped
+        server = NavigatorServer(store=SQLiteCheckpointStore(path))
+        for text in ["2", "Rally", "50", "3000", "Selloff", "50", "-1000"]:
+            await server.send("a", text)
+        return await server.state("a")
+
+    assert "'Attack'" in asyncio.run(first_half())
+    state = asyncio.run(second_half())
+    assert state["root_node"].children[0].expected_value == pytest.approx(1000.0)
+    assert state["root_node"].expected_value == pytest.approx(1000.0)
+
+def test_unknown_session():
+    with pytest.raises(KeyError):
+        asyncio.run(NavigatorServer().send("missing", "hello"))
+
+def test_checkpoint_store_is_abstract():
+    with pytest.raises(TypeError):
+        CheckpointStore()
+
+def test_deep_trees_survive_encoding():
+    root = deep(5_000, seed=3)
+    compute_ev(root)
+    active = root.children[0].children[0]
+    state = decode_state(encode_state({**initial_state(), "root_node": root, "active_parent_node": active}))
+    assert state["root_node"] == root
+    assert state["active_parent_node"] is state["root_node"].children[0].children[0]
+
+def test_server_built_outside_a_loop_serves_several_loops():
+    server = NavigatorServer(max_concurrency=2)
+    asyncio.run(server.open_session("a"))
+    asyncio.run(server.send("a", "Plan"))
+    assert asyncio.run(server.state("a"))["root_node"].name == "Plan"
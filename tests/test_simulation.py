@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.calculator import compute_ev
+from src.engine.simulation import exact_distribution, simulate, iter_sample_chunks, payoff_distribution
+
+def hedge_tree():
+    """Decision between a risky trade and a hedged one; the risky trade has the higher EV."""
+    risky = StrategyNode(name="Risky", probability=1.0, children=[
+        Outcome(name="Rally", probability=0.5, value=100.0),
+        Outcome(name="Flat", probability=0.3, value=0.0),
+        Outcome(name="Crash", probability=0.2, value=-150.0),
+    ])
+    hedged = StrategyNode(name="Hedged", probability=1.0, children=[
+        Outcome(name="Up", probability=0.5, value=30.0),
+        Outcome(name="Down", probability=0.5, value=-10.0),
+    ])
+    return StrategyNode(name="Trade", node_type="decision", children=[risky, hedged])
+
+def test_exact_distribution_follows_optimal_policy():
+    root = hedge_tree()
+    dist = exact_distribution(root)
+    assert dist.values.tolist() == [-150.0, 0.0, 100.0]
+    assert dist.probabilities.tolist() == pytest.approx([0.2, 0.3, 0.5])
+    assert dist.mean == pytest.approx(compute_ev(root))
+    assert dist.probability_of_loss == pytest.approx(0.2)
+    assert dist.value_at_risk(0.9) == 150.0
+    assert dist.conditional_value_at_risk(0.9) == 150.0
+    # Worst 25%: all of the crash plus 5% of the flat outcome
+    assert dist.conditional_value_at_risk(0.75) == pytest.approx(0.2 * 150.0 / 0.25)
+
+def test_unassigned_probability_is_a_zero_payoff():
+    root = StrategyNode(name="Partial", children=[Outcome(name="Win", probability=0.4, value=10.0)])
+    dist = exact_distribution(root)
+    assert dist.values.tolist() == [0.0, 10.0]
+    assert dist.mean == pytest.approx(compute_ev(root))
+
+def test_simulation_converges_to_exact():
+    root = hedge_tree()
+    exact = exact_distribution(root)
+    sampled = simulate(root, n_paths=200_000, seed=42, chunk_size=30_000)
+    assert sampled.n_samples == 200_000
+    assert sampled.values.tolist() == exact.values.tolist()
+    assert np.allclose(sampled.probabilities, exact.probabilities, atol=0.01)
+    assert simulate(root, n_paths=200_000, seed=42, chunk_size=30_000).probabilities.tolist() == sampled.probabilities.tolist()
+
+def test_streamed_chunks_are_bounded():
+    chunks = list(iter_sample_chunks(hedge_tree(), n_paths=25_000, seed=1, chunk_size=10_000))
+    assert [len(c) for c in chunks] == [10_000, 10_000, 5_000]
+    assert set(np.concatenate(chunks).tolist()) <= {-150.0, 0.0, 100.0}
+
+def test_auto_mode_uses_exact_for_small_trees():
+    assert payoff_distribution(hedge_tree()).n_samples is None
+    assert payoff_distribution(hedge_tree(), n_paths=1_000, exact_node_limit=2).n_samples == 1_000
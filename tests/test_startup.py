@@ -0,0 +1,54 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from src.engine.models import StrategyNode, Outcome
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("openai", "langsmith", "langgraph", "dotenv")
+# Generous for loaded CI machines; pydantic and numpy account for ~0.3s on a laptop
+IMPORT_BUDGET_SECONDS = 1.5
+
+def run_python(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_engine_imports_without_llm_or_graph_dependencies():
+    report = run_python(
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        "import src.engine.models, src.engine.calculator, src.engine.session, src.agents.graph, src.cli\n"
+        "seconds = time.perf_counter() - start\n"
+        f"print(json.dumps({{'seconds': seconds, 'loaded': [m for m in {HEAVY!r} if m in sys.modules]}}))"
+    )
+    assert report["loaded"] == []
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS
+
+def test_calculator_loads_lazy_and_lattice_solvers_on_demand():
+    solvers = ("src.engine.search", "src.engine.lattice")
+    report = run_python(
+        "import sys, json\n"
+        "from src.engine.calculator import compute_ev\n"
+        "from src.engine.models import StrategyNode, Outcome\n"
+        "ev = compute_ev(StrategyNode(name='Root', children=[Outcome(name='Win', probability=1.0, value=2.0)]))\n"
+        f"print(json.dumps({{'ev': ev, 'loaded': [m for m in {solvers!r} if m in sys.modules]}}))"
+    )
+    assert report == {"ev": 2.0, "loaded": []}
+
+def test_eval_entry_point_scores_without_prompting(tmp_path):
+    tree = StrategyNode(name="Root", node_type="decision", children=[
+        Outcome(name="Cash", probability=1.0, value=3.0),
+        StrategyNode(name="Bet", children=[Outcome(name="Win", probability=0.5, value=10.0)]),
+    ])
+    path = tmp_path / "tree.json"
+    path.write_text(tree.model_dump_json())
+    report = run_python(
+        "import sys, io, json, contextlib\n"
+        "from src.cli import main\n"
+        "out = io.StringIO()\n"
+        "with contextlib.redirect_stdout(out):\n"
+        f"    code = main(['eval', {str(path)!r}, '--json'])\n"
+        f"print(json.dumps({{'code': code, 'result': json.loads(out.getvalue()), 'loaded': [m for m in {HEAVY!r} if m in sys.modules]}}))"
+    )
+    assert report["code"] == 0 and report["loaded"] == []
+    assert report["result"] == {"name": "Root", "expected_value": 5.0, "nodes": 4, "best_move": "Bet"}
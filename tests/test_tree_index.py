@@ -0,0 +1,102 @@
+import pytest
+from src.engine.models import StrategyNode, Outcome
+from src.engine.tree_index import TreeIndex, tree_index
+from tests.graph_helpers import new_state, send
+
+def test_path_and_id_lookups():
+    """Every node is reachable by its path of names and by a stable id."""
+    rally = Outcome(name="Rally", probability=0.5, value=3000.0)
+    bonds = StrategyNode(name="Long Bonds", probability=0.6, children=[
+        rally,
+        Outcome(name="Selloff", probability=0.5, value=-1000.0),
+    ])
+    cash = Outcome(name="Cash", probability=0.4, value=500.0)
+    root = StrategyNode(name="Root", children=[bonds, cash])
+    index = TreeIndex(root)
+
+    assert len(index) == 5
+    assert index.node("Long Bonds/Rally") is rally
+    assert index.node(["Long Bonds", "Rally"]) is rally
+    assert index.node("/") is root
+    assert index.parent_of(rally) is bonds
+    assert index.position_of(cash) == 1
+    assert index.path_of(rally) == ["Long Bonds", "Rally"]
+    assert index.by_id(index.id_of(rally)) is rally
+    assert index.child(root, "Missing") is None
+    with pytest.raises(KeyError):
+        index.node("Long Bonds/Missing")
+
+def test_replace_keeps_path_and_id():
+    """Promoting an Outcome to a chance node keeps its path and id."""
+    cash = Outcome(name="Cash", probability=0.4, value=500.0)
+    root = StrategyNode(name="Root", children=[
+        Outcome(name="Long Bonds", probability=0.6, value=2000.0),
+        cash,
+    ])
+    index = tree_index(root)
+    node_id = index.id_of(cash)
+
+    promoted = StrategyNode(name="Cash", probability=0.4, node_type="chance")
+    index.replace(cash, promoted)
+    assert root.children[1] is promoted
+    assert index.node("Cash") is promoted
+    assert index.by_id(node_id) is promoted
+    with pytest.raises(KeyError):
+        index.id_of(cash)
+    # The root has no parent to be replaced in
+    with pytest.raises(ValueError):
+        index.replace(root, StrategyNode(name="Other"))
+
+    index.attach(promoted, Outcome(name="Hold", probability=1.0, value=500.0))
+    assert index.node("Cash/Hold").value == 500.0
+    # tree_index hands out the same index for the same root
+    assert tree_index(root) is index
+
+def test_changes_outside_the_index_are_picked_up():
+    """A parent whose children list was edited directly is re-indexed on lookup."""
+    bonds = StrategyNode(name="Long Bonds", children=[
+        Outcome(name="Rally", probability=0.5, value=3000.0),
+        Outcome(name="Selloff", probability=0.5, value=-1000.0),
+    ])
+    index = TreeIndex(StrategyNode(name="Root", children=[bonds]))
+    bonds.children.insert(0, Outcome(name="Flat", probability=0.0, value=0.0))
+
+    assert index.node("Long Bonds/Flat") is bonds.children[0]
+    assert index.position_of(index.node("Long Bonds/Rally")) == 1
+
+def test_navigator_tracks_path_and_jumps():
+    """The interview keeps the active path and jumps anywhere with 'goto'."""
+    state = new_state()
+    for text in ["Bond Strategy", "2",
+                 "Long Bonds", "60", "2000",
+                 "Cash", "40", "500",
+                 "Long Bonds", "2",
+                 "Rally", "50", "3000",
+                 "Selloff", "50", "-1000"]:
+        state = send(state, text)
+    assert state["current_node_path"] == ["Long Bonds"]
+
+    # Jumping onto an Outcome would drop its value, so it is refused
+    rejected = send(state, "goto Long Bonds/Rally")
+    assert rejected["root_node"].children[0].children[0].value == 3000
+    assert rejected["active_parent_node"] is state["active_parent_node"]
+    assert "'Long Bonds/Rally' is an outcome" in rejected["recommendation_summary"]
+
+    # Drilling into it by name promotes it on purpose
+    state = send(rejected, "Rally")
+    rally = state["root_node"].children[0].children[0]
+    assert isinstance(rally, StrategyNode)
+    assert state["active_parent_node"] is rally
+    assert state["current_node_path"] == ["Long Bonds", "Rally"]
+    assert state["interview_phase"] == "GET_COUNT"
+
+    for text in ["1", "Hold", "100", "3000"]:
+        state = send(state, text)
+    state = send(state, "goto /")
+    assert state["active_parent_node"] is state["root_node"]
+    assert state["current_node_path"] == []
+    # The root decision takes Long Bonds: 0.5 * 3000 + 0.5 * -1000 beats 500 in Cash
+    assert state["root_node"].expected_value == pytest.approx(1000.0)
+
+    unchanged = send(state, "goto Nowhere")
+    assert unchanged["active_parent_node"] is state["root_node"]